@@ -2,9 +2,10 @@
 from flask import Flask
 from flask_cors import CORS
 
+from .commands import register_commands
 from .routes import register_routes
-from ..utils.db import Base, init_db
-from ..utils.security import ensure_default_admin
+from ..utils.bootstrap import bootstrap_database, init_boot_timing
+from ..utils.db import init_db, init_unit_of_work, prewarm_pool
 
 
 def create_app(config_name: str = "default") -> Flask:
@@ -38,6 +39,9 @@ def create_app(config_name: str = "default") -> Flask:
         }
     })
 
+    # Trust X-Forwarded-For from the configured number of proxies
+    _init_proxy_fix(app)
+
     # Initialize security features
     _init_security(app)
 
@@ -53,12 +57,17 @@ def create_app(config_name: str = "default") -> Flask:
     # Initialize API documentation
     _init_swagger(app)
 
+    # Count and time SQL statements per request
+    _init_query_stats(app)
+
     # Initialize database connections
     engine = init_db(app)
-    Base.metadata.create_all(bind=engine)
-
-    with app.app_context():
-        ensure_default_admin()
+    init_unit_of_work(app)
+    bootstrap_database(app, engine)
+    prewarm_pool(engine, app.config.get("DB_POOL_PREWARM", 0))
+    _init_read_replicas(app)
+    _init_sqlite_maintenance(app)
+    init_boot_timing(app)
 
     # Setup logging
     _setup_logging(app)
@@ -66,9 +75,21 @@ def create_app(config_name: str = "default") -> Flask:
     # Register routes
     register_routes(app)
 
+    # Apply stricter limits to brute-force and webhook endpoints
+    _init_route_limits(app)
+
+    # Flush buffered policy decision counters after requests
+    _init_policy_recording(app)
+
+    # Start the retention scheduler lazily in each worker
+    _init_retention(app)
+
     # Register error handlers
     _register_error_handlers(app)
 
+    # Register CLI commands
+    register_commands(app)
+
     return app
 
 
@@ -89,6 +110,16 @@ def _init_sentry(app: Flask) -> None:
         app.logger.info("Sentry error tracking initialized")
 
 
+def _init_proxy_fix(app: Flask) -> None:
+    """Take the client address from X-Forwarded-For set by trusted proxies."""
+    proxies = app.config.get("TRUSTED_PROXY_COUNT", 0)
+    if proxies > 0:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies, x_host=proxies)
+        app.logger.info("Trusting X-Forwarded-* headers from %d proxies", proxies)
+
+
 def _init_security(app: Flask) -> None:
     """Initialize security headers and protections."""
     if app.config.get("TALISMAN_ENABLED", True):
@@ -120,20 +151,10 @@ def _init_security(app: Flask) -> None:
 
 
 def _init_cache(app: Flask) -> None:
-    """Initialize caching with Redis."""
-    from flask_caching import Cache
-
-    cache_config = {
-        'CACHE_TYPE': app.config.get('CACHE_TYPE', 'simple'),
-        'CACHE_DEFAULT_TIMEOUT': app.config.get('CACHE_DEFAULT_TIMEOUT', 300),
-    }
-
-    if app.config.get('CACHE_TYPE') == 'redis':
-        cache_config['CACHE_REDIS_URL'] = app.config.get('CACHE_REDIS_URL')
+    """Configure caching; the backend is created on first use by ``get_cache``."""
+    from ..utils.cache import cache_config
 
-    cache = Cache(app, config=cache_config)
-    app.extensions['cache'] = cache
-    app.logger.info(f"Caching initialized with {cache_config['CACHE_TYPE']}")
+    app.logger.info(f"Caching configured with {cache_config(app)['CACHE_TYPE']}")
 
 
 def _init_rate_limiter(app: Flask) -> None:
@@ -142,17 +163,35 @@ def _init_rate_limiter(app: Flask) -> None:
         from flask_limiter import Limiter
         from flask_limiter.util import get_remote_address
 
+        # Registers the mmap:// storage scheme with the limits library
+        from ..utils import ratelimit_storage  # noqa: F401
+
         limiter = Limiter(
             app=app,
             key_func=get_remote_address,
             default_limits=[app.config.get("RATELIMIT_DEFAULT", "200 per day, 50 per hour")],
             storage_uri=app.config.get("RATELIMIT_STORAGE_URL", "memory://"),
-            strategy="fixed-window"
+            strategy=app.config.get("RATELIMIT_STRATEGY", "fixed-window")
         )
         app.extensions['limiter'] = limiter
         app.logger.info("Rate limiting initialized")
 
 
+def _init_route_limits(app: Flask) -> None:
+    """Wrap sensitive endpoints with their own rate limits."""
+    limiter = app.extensions.get("limiter")
+    if limiter is None:
+        return
+
+    route_limits = {
+        "auth.admin_login": app.config.get("RATELIMIT_LOGIN"),
+        "integrations.github_pipeline": app.config.get("RATELIMIT_WEBHOOK"),
+    }
+    for endpoint, limit in route_limits.items():
+        if limit and endpoint in app.view_functions:
+            app.view_functions[endpoint] = limiter.limit(limit)(app.view_functions[endpoint])
+
+
 def _init_monitoring(app: Flask) -> None:
     """Initialize Prometheus monitoring."""
     if not app.config.get('ENABLE_METRICS', True):
@@ -172,10 +211,59 @@ def _init_monitoring(app: Flask) -> None:
     app.logger.info("Prometheus metrics initialized at /metrics")
 
 
+def _init_query_stats(app: Flask) -> None:
+    """Collect per-request SQL statistics for the Server-Timing header and logs.
+
+    Registered before the unit of work so the final commit is included.
+    """
+    if not app.config.get("QUERY_STATS_ENABLED", True):
+        return
+
+    from flask import g, request
+
+    from ..utils.metrics import DB_QUERIES_PER_REQUEST
+    from ..utils.query_stats import start_collecting, stop_collecting
+
+    @app.before_request
+    def _start_query_stats():
+        g.query_stats, g.query_stats_token = start_collecting()
+
+    @app.after_request
+    def _report_query_stats(response):
+        stats = g.get("query_stats")
+        if stats is None:
+            return response
+        if app.config.get("SERVER_TIMING_ENABLED", True):
+            response.headers.add("Server-Timing", stats.server_timing())
+        repeated = stats.repeated(app.config.get("QUERY_REPEAT_THRESHOLD", 5))
+        fields = {
+            "db_queries": stats.count,
+            "db_time_ms": round(stats.seconds * 1000, 1),
+            "db_repeated": [{"sql": sql, "count": n} for sql, n in repeated],
+            "db_cache_hits": stats.cache["hit"],
+            "db_cache_misses": stats.cache["miss"],
+            "endpoint": request.endpoint,
+        }
+        if repeated:
+            app.logger.warning(
+                "Repeated SQL in %s: %dx %s", request.endpoint, repeated[0][1], repeated[0][0], extra=fields
+            )
+        else:
+            app.logger.debug("SQL for %s: %d queries", request.endpoint, stats.count, extra=fields)
+        DB_QUERIES_PER_REQUEST.observe(stats.count)
+        return response
+
+    @app.teardown_request
+    def _stop_query_stats(exception=None):
+        token = g.pop("query_stats_token", None)
+        if token is not None:
+            stop_collecting(token)
+
+
 def _init_swagger(app: Flask) -> None:
     """Initialize Swagger API documentation."""
     if app.config.get("SWAGGER_ENABLED", True):
-        from flasgger import Swagger
+        from .docs import init_lazy_swagger
 
         swagger_config = {
             "headers": [],
@@ -214,8 +302,77 @@ def _init_swagger(app: Flask) -> None:
             "security": [{"Bearer": []}]
         }
 
-        Swagger(app, config=swagger_config, template=swagger_template)
-        app.logger.info("Swagger API documentation initialized at /api/docs/")
+        init_lazy_swagger(app, swagger_config, swagger_template)
+        app.logger.info("Swagger API documentation registered at /api/docs/")
+
+
+def _init_read_replicas(app: Flask) -> None:
+    """Route reads of safe-method requests to replicas.
+
+    A client that has just written carries a short-lived cookie that keeps its
+    reads on the primary, so it sees its own writes despite replication lag.
+    """
+    import time
+
+    from flask import request
+
+    from ..utils.db import get_session, replicas_enabled
+
+    if not replicas_enabled():
+        return
+
+    cookie_name = "db_primary_until"
+
+    @app.before_request
+    def _route_reads_to_replicas():
+        if request.cookies.get(cookie_name, default=0.0, type=float) > time.time():
+            get_session().info["pin_primary"] = True
+        elif request.method in ("GET", "HEAD", "OPTIONS"):
+            get_session().info["read_only"] = True
+
+    @app.after_request
+    def _stick_to_primary_after_write(response):
+        window = app.config.get("DB_READ_YOUR_WRITES_WINDOW", 5)
+        if window > 0 and get_session().info.get("has_writes"):
+            response.set_cookie(
+                cookie_name, f"{time.time() + window:.3f}", max_age=window, httponly=True, samesite="Lax"
+            )
+        return response
+
+
+def _init_sqlite_maintenance(app: Flask) -> None:
+    """Checkpoint and optimize file-backed SQLite from each worker's first request."""
+    from ..utils.db import is_sqlite_file, start_sqlite_maintenance
+
+    if not (is_sqlite_file(app.config["SQLALCHEMY_DATABASE_URI"]) and app.config.get("SQLITE_PROFILE_ENABLED", True)):
+        return
+
+    @app.before_request
+    def _ensure_sqlite_maintenance():
+        start_sqlite_maintenance(app)
+
+
+def _init_policy_recording(app: Flask) -> None:
+    """Flush aggregated policy decisions once a request has finished."""
+    from .services.policy import flush_decision_rollups
+
+    app.teardown_appcontext(flush_decision_rollups)
+
+
+def _init_retention(app: Flask) -> None:
+    """Start the retention scheduler on a worker's first request.
+
+    Starting it from a request rather than here keeps the thread out of
+    processes that fork workers after the app is created.
+    """
+    if not app.config.get("RETENTION_ENABLED", False):
+        return
+
+    from .services.retention import start_retention_scheduler
+
+    @app.before_request
+    def _ensure_retention_scheduler():
+        start_retention_scheduler(app)
 
 
 def _setup_logging(app: Flask) -> None:
@@ -0,0 +1,95 @@
+"""Flask CLI commands for operating the backend."""
+import statistics
+import time
+
+import click
+from flask import Flask
+from flask.cli import with_appcontext
+from werkzeug.security import generate_password_hash
+
+
+def register_commands(app: Flask) -> None:
+    """Register custom CLI commands on the application.
+
+    Args:
+        app: Flask application instance
+    """
+    app.cli.add_command(calibrate_password_hash)
+    app.cli.add_command(purge_expired)
+    app.cli.add_command(rebuild_session_stats)
+
+
+def _time_hash(method: str, samples: int) -> float:
+    """Return the median time in milliseconds to hash a password with ``method``."""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        generate_password_hash("calibration-password", method=method)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+@click.command("calibrate-password-hash")
+@click.option("--target-ms", default=250, show_default=True, help="Target hashing latency per password.")
+@click.option("--algorithm", type=click.Choice(["scrypt", "pbkdf2"]), default="scrypt", show_default=True)
+@click.option("--samples", default=3, show_default=True, help="Hashes timed per candidate.")
+def calibrate_password_hash(target_ms: int, algorithm: str, samples: int) -> None:
+    """Find KDF cost parameters that hash in about --target-ms on this host."""
+    if algorithm == "scrypt":
+        best = None
+        n = 2**14
+        while n <= 2**20:
+            method = f"scrypt:{n}:8:1"
+            elapsed = _time_hash(method, samples)
+            click.echo(f"{method:<24} {elapsed:8.1f} ms")
+            if best is not None and elapsed > target_ms:
+                break
+            best = (method, elapsed)
+            n *= 2
+    else:
+        probe = 100_000
+        elapsed = _time_hash(f"pbkdf2:sha256:{probe}", samples)
+        iterations = max(probe, int(probe * target_ms / elapsed) // 1000 * 1000)
+        method = f"pbkdf2:sha256:{iterations}"
+        best = (method, _time_hash(method, samples))
+        click.echo(f"{method:<24} {best[1]:8.1f} ms")
+
+    click.echo(f"\nPASSWORD_HASH_METHOD={best[0]}  # {best[1]:.1f} ms per hash")
+    click.echo("Existing hashes are upgraded to the new parameters on the next successful login.")
+
+
+@click.command("purge-expired")
+@click.option("--table", "tables", multiple=True, help="Only purge these tables (repeatable).")
+@click.option("--chunk-size", type=int, default=None, help="Override RETENTION_CHUNK_SIZE.")
+@with_appcontext
+def purge_expired(tables: tuple, chunk_size: int) -> None:
+    """Delete rows older than their RETENTION_POLICIES TTL."""
+    from flask import current_app
+
+    from .services.retention import retention_policies, run_retention
+
+    policies = retention_policies()
+    if tables:
+        policies = {table: days for table, days in policies.items() if table in tables}
+
+    results = run_retention(
+        policies,
+        chunk_size=chunk_size or current_app.config.get("RETENTION_CHUNK_SIZE", 500),
+        chunk_sleep=current_app.config.get("RETENTION_CHUNK_SLEEP", 0.1),
+    )
+    for table, deleted in results.items():
+        click.echo(f"{table:<28} {deleted:>8} rows purged")
+
+
+@click.command("rebuild-session-stats")
+@click.option("--batch-size", type=int, default=1000, show_default=True, help="Sessions read per round trip.")
+@with_appcontext
+def rebuild_session_stats(batch_size: int) -> None:
+    """Recompute the learning session statistics from the sessions table."""
+    from backend.utils.db import get_session
+
+    from .services.learning_session_stats import rebuild_session_stats as rebuild
+
+    counted = rebuild(batch_size=batch_size)
+    get_session().commit()
+    click.echo(f"Rebuilt learning session statistics from {counted} sessions")
@@ -0,0 +1,71 @@
+"""Swagger UI and spec routes that import flasgger on first use.
+
+Flasgger pulls in jsonschema, mistune and YAML parsing, which most workers
+never need. The ``flasgger`` blueprint registered here exposes the same
+endpoints and static files as ``Swagger(app)``, but builds the Swagger object
+and its views the first time one of them is requested.
+"""
+from functools import partial
+from importlib.util import find_spec
+import os
+import threading
+
+from flask import Blueprint, Flask, current_app
+
+
+def _flasgger_path(*parts: str) -> str:
+    # find_spec locates the package without importing it.
+    return os.path.join(find_spec("flasgger").submodule_search_locations[0], *parts)
+
+
+def _load_views(app: Flask) -> dict:
+    state = app.extensions["lazy_swagger"]
+    with state["lock"]:
+        if state["views"] is None:
+            from flasgger import Swagger
+            from flasgger.base import APIDocsView, APISpecsView, OAuthRedirect
+
+            swagger = Swagger(config=state["config"], template=state["template"])
+            swagger.app = app
+            swagger.load_config(app)
+            swagger._configured = True
+            app.swag = swagger
+            spec = swagger.config["specs"][0]["endpoint"]
+            state["views"] = {
+                "apidocs": APIDocsView.as_view("apidocs", view_args=dict(config=swagger.config)),
+                "apispec": APISpecsView.as_view(spec, loader=partial(swagger.get_apispecs, endpoint=spec)),
+                "oauth_redirect": OAuthRedirect.as_view("oauth_redirect"),
+            }
+            app.logger.info("Swagger API documentation loaded on first request")
+    return state["views"]
+
+
+def _lazy_view(name: str):
+    def view(**kwargs):
+        return _load_views(current_app._get_current_object())[name](**kwargs)
+
+    view.__name__ = name
+    return view
+
+
+def init_lazy_swagger(app: Flask, config: dict, template: dict) -> None:
+    """Register Swagger routes whose views are created on the first request."""
+    uiversion = config.get("uiversion", 3)
+    app.extensions["lazy_swagger"] = {
+        "config": config,
+        "template": template,
+        "views": None,
+        "lock": threading.Lock(),
+    }
+    blueprint = Blueprint(
+        "flasgger",
+        __name__,
+        template_folder=_flasgger_path(f"ui{uiversion}", "templates"),
+        static_folder=_flasgger_path(f"ui{uiversion}", "static"),
+        static_url_path=config.get("static_url_path"),
+    )
+    blueprint.add_url_rule(config["specs_route"], "apidocs", _lazy_view("apidocs"))
+    blueprint.add_url_rule("/oauth2-redirect.html", "oauth_redirect", _lazy_view("oauth_redirect"))
+    for spec in config["specs"]:
+        blueprint.add_url_rule(spec["route"], spec["endpoint"], _lazy_view("apispec"))
+    app.register_blueprint(blueprint)
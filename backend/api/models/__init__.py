@@ -7,3 +7,5 @@ from .approval_key import ApprovalKey  # noqa: F401
 from .audit_event import AuditEvent  # noqa: F401
 from .auth_challenge import AuthChallenge  # noqa: F401
 from .policy_decision import PolicyDecision  # noqa: F401
+from .policy_decision_rollup import PolicyDecisionRollup  # noqa: F401
+from .learning_session_aggregate import LearningSessionAggregate  # noqa: F401
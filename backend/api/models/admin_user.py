@@ -17,6 +17,7 @@ class AdminUser(Base):
     role = Column(String(32), nullable=False, default="admin")
     is_active = Column(Boolean, default=True, nullable=False)
     totp_secret = Column(String(64), nullable=True)
+    token_version = Column(Integer, default=1, nullable=False)  # bumped to revoke stateless tokens
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
     def set_password(self, raw_password: str) -> None:
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone, tzinfo
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from backend.utils.db import Base
 
 
@@ -16,6 +16,10 @@ def _serialize(value):
 
 class LearningSession(Base):
     __tablename__ = "learning_sessions"
+    __table_args__ = (
+        Index("ix_learning_sessions_status_created_at", "status", "created_at"),
+        Index("ix_learning_sessions_difficulty_created_at", "difficulty", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(200), nullable=False)
@@ -0,0 +1,33 @@
+"""Incrementally maintained counters behind the learning session statistics."""
+from sqlalchemy import Column, Float, Integer, String, UniqueConstraint
+
+from backend.utils.db import Base
+
+
+class LearningSessionAggregate(Base):
+    """One counter of learning session statistics.
+
+    ``metric`` selects what the row counts:
+
+    - ``status``: sessions per ``status`` and ``difficulty``;
+    - ``duration``: completed sessions per ``difficulty`` whose time from
+      start to completion falls in histogram ``bucket``, with the summed
+      ``total_seconds``;
+    - ``week``: sessions per ``difficulty`` completed in the week starting on
+      the date whose ordinal is ``bucket``.
+
+    A missing difficulty is stored as ``""`` so the unique key stays non-null.
+    """
+
+    __tablename__ = "learning_session_aggregates"
+    __table_args__ = (
+        UniqueConstraint("metric", "status", "difficulty", "bucket", name="uq_learning_session_aggregates_key"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    metric = Column(String(16), nullable=False)
+    status = Column(String(50), nullable=False, default="")
+    difficulty = Column(String(50), nullable=False, default="")
+    bucket = Column(Integer, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Float, nullable=False, default=0.0)
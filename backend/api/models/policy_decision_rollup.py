@@ -0,0 +1,23 @@
+"""Per-minute counters for policy decisions that are not stored individually."""
+from sqlalchemy import Column, DateTime, Integer, String, Text, UniqueConstraint
+
+from backend.utils.db import Base
+
+
+class PolicyDecisionRollup(Base):
+    """Number of decisions per minute, rule set version, action, decision and triggered rules."""
+
+    __tablename__ = "policy_decision_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "bucket_start", "rules_version", "action", "decision", "rules", name="uq_policy_decision_rollups_bucket"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    rules_version = Column(String(16), nullable=False, default="")  # PolicyEngine.version that decided
+    action = Column(String(80), nullable=False)
+    decision = Column(String(32), nullable=False)
+    rules = Column(Text, nullable=False, default="")  # comma-separated rule ids, same as PolicyDecision.rules
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,172 @@
+"""Read models: list endpoints served straight from row tuples.
+
+A read model names the columns a list endpoint returns and the JSON key of
+each. Rows are selected with Core as plain tuples, so no ORM entities are
+built and nothing enters the identity map. JSON is then written column by
+column:
+
+- every column gets one encoder chosen from its SQL type;
+- a datetime column is converted to ISO strings in one pass over the column;
+- each row is formatted through a template compiled once per read model.
+
+The output matches what the models' ``to_dict`` helpers and ``jsonify``
+produce, apart from key order.
+"""
+from datetime import timezone
+from functools import partial
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, List, Sequence
+
+from flask import Response, current_app
+from sqlalchemy import Boolean, DateTime, Float, Integer, inspect, select
+from sqlalchemy.sql import Select
+
+from backend.api.models import AuditEvent, DeploymentLog, LearningSession, Pipeline, RegistrationRequest
+
+ColumnEncoder = Callable[[Sequence[Any]], List[str]]
+
+
+def _encode_strings(values: Sequence[Any]) -> List[str]:
+    return ["null" if value is None else encode_basestring_ascii(value) for value in values]
+
+
+def _encode_numbers(values: Sequence[Any]) -> List[str]:
+    return ["null" if value is None else repr(value) for value in values]
+
+
+def _encode_booleans(values: Sequence[Any]) -> List[str]:
+    return ["null" if value is None else "true" if value else "false" for value in values]
+
+
+def _encode_datetimes(values: Sequence[Any], assume_utc: bool) -> List[str]:
+    if assume_utc:
+        values = [
+            value.replace(tzinfo=timezone.utc) if value is not None and value.tzinfo is None else value
+            for value in values
+        ]
+    # isoformat() output never needs JSON escaping.
+    return ["null" if value is None else f'"{value.isoformat()}"' for value in values]
+
+
+def _column_encoder(column_type: Any, assume_utc: bool) -> ColumnEncoder:
+    if isinstance(column_type, DateTime):
+        return partial(_encode_datetimes, assume_utc=assume_utc)
+    if isinstance(column_type, Boolean):
+        return _encode_booleans
+    if isinstance(column_type, (Integer, Float)):
+        return _encode_numbers
+    return _encode_strings
+
+
+class ReadModel:
+    """Columns of one model as served by a list endpoint."""
+
+    def __init__(self, model: Any, fields: Dict[str, str], assume_utc: bool = False):
+        """Initialize read model.
+
+        Args:
+            model: SQLAlchemy model class
+            fields: JSON key to model attribute name, in output order
+            assume_utc: Serialize naive datetimes as UTC (SQLite drops the offset)
+        """
+        self.model = model
+        self.keys = tuple(fields)
+        self.columns = tuple(fields.values())
+        table_columns = inspect(model).columns
+        self._encoders = tuple(_column_encoder(table_columns[name].type, assume_utc) for name in self.columns)
+        self._template = "{" + ",".join(f"{encode_basestring_ascii(key)}:%s" for key in self.keys) + "}"
+
+    def select(self) -> Select:
+        """Select this read model's columns, in order, as plain rows."""
+        return select(*(getattr(self.model, name) for name in self.columns))
+
+    def dumps(self, rows: Sequence[Sequence[Any]]) -> str:
+        """Serialize rows selected with ``select()`` as a JSON array of objects."""
+        if not rows:
+            return "[]"
+        encoded = [encode(column) for encode, column in zip(self._encoders, zip(*rows))]
+        template = self._template
+        return "[" + ",".join([template % fragments for fragments in zip(*encoded)]) + "]"
+
+    def response(self, key: str, rows: Sequence[Sequence[Any]], status: int = 200, **extra: Any) -> Response:
+        """Return ``{key: [...rows], **extra}`` as a JSON response."""
+        body = "{" + encode_basestring_ascii(key) + ":" + self.dumps(rows)
+        if extra:
+            body += "," + json.dumps(extra, separators=(",", ":"))[1:-1]
+        return current_app.response_class(body + "}", status=status, mimetype="application/json")
+
+
+SESSION_LIST = ReadModel(
+    LearningSession,
+    {
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "status": "status",
+        "difficulty": "difficulty",
+        "started_at": "started_at",
+        "completed_at": "completed_at",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    },
+    assume_utc=True,
+)
+
+PIPELINE_LIST = ReadModel(
+    Pipeline,
+    {
+        "id": "id",
+        "name": "name",
+        "description": "description",
+        "status": "status",
+        "owner": "owner",
+        "startedAt": "started_at",
+        "completedAt": "completed_at",
+        "durationMinutes": "duration_minutes",
+        "branch": "branch",
+        "commitSha": "commit_sha",
+        "commitMessage": "commit_message",
+        "workflowName": "workflow_name",
+        "runId": "run_id",
+        "runNumber": "run_number",
+        "createdAt": "created_at",
+        "updatedAt": "updated_at",
+    },
+)
+
+DEPLOYMENT_LOG_LIST = ReadModel(
+    DeploymentLog,
+    {
+        "id": "id",
+        "pipelineId": "pipeline_id",
+        "level": "level",
+        "message": "message",
+        "timestamp": "timestamp",
+    },
+)
+
+AUDIT_EVENT_LIST = ReadModel(
+    AuditEvent,
+    {
+        "id": "id",
+        "event_type": "event_type",
+        "payload": "payload",
+        "signature_hash": "signature_hash",
+        "created_at": "created_at",
+    },
+)
+
+REGISTRATION_REQUEST_LIST = ReadModel(
+    RegistrationRequest,
+    {
+        "id": "id",
+        "username": "username",
+        "reason": "reason",
+        "status": "status",
+        "reviewed_by": "reviewed_by",
+        "review_note": "review_note",
+        "created_at": "created_at",
+        "reviewed_at": "reviewed_at",
+    },
+)
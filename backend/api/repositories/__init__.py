@@ -1,6 +1,7 @@
 """Repository pattern for database access."""
-from .base import BaseRepository
+from .base import BaseRepository, Page
 from .admin_repository import AdminRepository
 from .pipeline_repository import PipelineRepository
+from .learning_session_repository import LearningSessionRepository
 
-__all__ = ['BaseRepository', 'AdminRepository', 'PipelineRepository']
+__all__ = ['BaseRepository', 'Page', 'AdminRepository', 'PipelineRepository', 'LearningSessionRepository']
@@ -1,10 +1,135 @@
-"""Base repository pattern for database operations."""
-from typing import Generic, TypeVar, Type, Optional, List, Dict, Any
+"""Base repository pattern for database operations.
+
+Filters are ``field=value`` keyword arguments; a ``__lookup`` suffix picks
+another comparison, e.g. ``created_at__gte=since``, ``status__in=[...]``,
+``title__startswith="Intro"``, ``title__icontains="sql"`` or
+``completed_at__is_null=True``. Orderings
+are field names, prefixed with ``-`` for descending.
+
+``find`` and ``paginate`` build one statement per query shape (model,
+filter fields and lookups, ordering) with bound parameters for the values,
+and keep it in a small cache. Repeated shapes reuse the statement object and
+hit SQLAlchemy's compiled-statement cache, so only the parameters change.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+import operator
+from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, Iterator, Sequence, Tuple
+from sqlalchemy import and_, bindparam, delete, insert, inspect, or_, select, update
 from sqlalchemy.orm import Session
 from backend.utils.db import get_session
 
 T = TypeVar('T')
 
+_LOOKUPS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "in": lambda column, value: column.in_(value),
+    "not_in": lambda column, value: column.not_in(value),
+    "like": lambda column, value: column.like(value),
+    "ilike": lambda column, value: column.ilike(value),
+    "startswith": lambda column, value: column.like(value, escape="\\"),
+    "icontains": lambda column, value: column.ilike(value, escape="\\"),
+}
+
+
+def _parse_filter(model, key: str) -> Tuple[str, str]:
+    """Split ``field__lookup`` and check both parts exist."""
+    field, _, lookup = key.partition("__")
+    lookup = lookup or "eq"
+    if field not in inspect(model).columns:
+        raise ValueError(f"{model.__name__} has no column {field!r}")
+    if lookup not in _LOOKUPS and lookup != "is_null":
+        raise ValueError(f"Unknown filter lookup {lookup!r} in {key!r}")
+    return field, lookup
+
+
+def _filter_value(lookup: str, value: Any) -> Any:
+    if lookup in ("startswith", "icontains"):
+        escaped = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return escaped + "%" if lookup == "startswith" else f"%{escaped}%"
+    if lookup in ("in", "not_in"):
+        return list(value)
+    return value
+
+
+def _condition(column, lookup: str, value: Any):
+    if lookup == "is_null":
+        return column.is_(None) if value else column.is_not(None)
+    return _LOOKUPS[lookup](column, value)
+
+
+def _parse_ordering(model, order_by: Sequence[str]) -> Tuple[Tuple[str, bool], ...]:
+    """Turn ``["-created_at", "id"]`` into ``(field, descending)`` pairs ending with the primary key."""
+    ordering = []
+    for name in order_by:
+        field = name.lstrip("-")
+        if field not in inspect(model).columns:
+            raise ValueError(f"{model.__name__} has no column {field!r} to order by")
+        ordering.append((field, name.startswith("-")))
+    # The primary key makes the order total, which keyset pagination relies on.
+    # It follows the last column's direction so one index scan serves both.
+    fields = {field for field, _ in ordering}
+    descending = ordering[-1][1] if ordering else False
+    ordering.extend((column.key, descending) for column in inspect(model).primary_key if column.key not in fields)
+    return tuple(ordering)
+
+
+@lru_cache(maxsize=256)
+def _cached_statement(model, shape: Tuple, ordering: Tuple, keyset: bool, limited: bool, selected: Tuple = ()):
+    """Build the select for a query shape; values are bound at execution.
+
+    Filter values bind as ``f0, f1, ...``, keyset values as ``k0, k1, ...``
+    and the row limit as ``limit``. With ``selected`` only those attributes
+    are selected, as plain rows.
+    """
+    criteria = []
+    for index, (field, lookup, is_null) in enumerate(shape):
+        column = getattr(model, field)
+        if lookup == "is_null":
+            criteria.append(_condition(column, lookup, is_null))
+        else:
+            param = bindparam(f"f{index}", expanding=lookup in ("in", "not_in"))
+            criteria.append(_condition(column, lookup, param))
+
+    columns = [(getattr(model, field), descending) for field, descending in ordering]
+    if keyset:
+        # (a, b) after (x, y): a beyond x, or a equal to x and b beyond y.
+        branches = []
+        for index, (column, descending) in enumerate(columns):
+            equal = [earlier == bindparam(f"k{i}") for i, (earlier, _) in enumerate(columns[:index])]
+            beyond = column < bindparam(f"k{index}") if descending else column > bindparam(f"k{index}")
+            branches.append(and_(*equal, beyond))
+        criteria.append(or_(*branches))
+
+    stmt = select(*(getattr(model, name) for name in selected)) if selected else select(model)
+    stmt = stmt.where(*criteria)
+    stmt = stmt.order_by(*(column.desc() if descending else column.asc() for column, descending in columns))
+    if limited:
+        stmt = stmt.limit(bindparam("limit"))
+    return stmt
+
+
+def statement_cache_info():
+    """Hits and misses of the repository statement cache (``functools`` cache info)."""
+    return _cached_statement.cache_info()
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a keyset-paginated query.
+
+    ``after`` holds the ordering values of the last item; pass it back to
+    ``paginate`` for the next page. It is None on the last page.
+    """
+
+    items: List[T]
+    after: Optional[Tuple[Any, ...]]
+
 
 class BaseRepository(Generic[T]):
     """Base repository providing common database operations."""
@@ -37,6 +162,58 @@ class BaseRepository(Generic[T]):
         """
         return self.session.query(self.model).filter(self.model.id == id).first()
 
+    def _criteria(self, filters: Dict[str, Any]) -> List[Any]:
+        """Build criteria for ``field`` / ``field__lookup`` filters.
+
+        Raises:
+            ValueError: A filter names an unknown column or lookup
+        """
+        criteria = []
+        for key, value in filters.items():
+            field, lookup = _parse_filter(self.model, key)
+            criteria.append(_condition(getattr(self.model, field), lookup, _filter_value(lookup, value)))
+        return criteria
+
+    def _execute_shape(
+        self,
+        filters: Dict[str, Any],
+        order_by: Sequence[str],
+        after: Optional[Sequence[Any]] = None,
+        limit: Optional[int] = None,
+        columns: Sequence[str] = (),
+    ) -> Tuple[List[Any], Tuple[Tuple[str, bool], ...]]:
+        shape, params = [], {}
+        for index, (key, value) in enumerate(sorted(filters.items())):
+            field, lookup = _parse_filter(self.model, key)
+            if value is None and lookup in ("eq", "ne"):
+                # A bound NULL never compares equal; match _criteria's IS [NOT] NULL.
+                lookup, value = "is_null", lookup == "eq"
+            shape.append((field, lookup, bool(value) if lookup == "is_null" else None))
+            if lookup != "is_null":
+                params[f"f{index}"] = _filter_value(lookup, value)
+        ordering = _parse_ordering(self.model, order_by)
+        if after is not None:
+            if len(after) != len(ordering):
+                raise ValueError(f"Cursor has {len(after)} values, ordering has {len(ordering)}")
+            params.update((f"k{index}", value) for index, value in enumerate(after))
+        if limit is not None:
+            params["limit"] = limit
+        columns = tuple(columns)
+        stmt = _cached_statement(self.model, tuple(shape), ordering, after is not None, limit is not None, columns)
+        if columns:
+            return self.session.execute(stmt, params).all(), ordering
+        return list(self.session.scalars(stmt, params)), ordering
+
+    def _query(self, **filters):
+        return self.session.query(self.model).filter(*self._criteria(filters))
+
+    def _finish(self, commit: bool) -> None:
+        """Commit when asked, otherwise flush into the caller's transaction."""
+        if commit:
+            self.session.commit()
+        else:
+            self.session.flush()
+
     def get_all(self, **filters) -> List[T]:
         """Get all entities matching filters.
 
@@ -46,11 +223,120 @@ class BaseRepository(Generic[T]):
         Returns:
             List of entities
         """
-        query = self.session.query(self.model)
-        for key, value in filters.items():
-            if hasattr(self.model, key):
-                query = query.filter(getattr(self.model, key) == value)
-        return query.all()
+        return self.find(**filters)
+
+    def find(
+        self,
+        order_by: Sequence[str] = (),
+        limit: Optional[int] = None,
+        columns: Sequence[str] = (),
+        **filters,
+    ) -> List[Any]:
+        """Get entities matching filters in a given order.
+
+        Args:
+            order_by: Field names, ``-`` prefixed for descending; the primary
+                key is appended as a tie-breaker
+            limit: Maximum number of entities
+            columns: Select only these fields as plain rows instead of entities
+            **filters: Field=value or field__lookup=value filters
+
+        Returns:
+            List of entities, or rows with ``columns``
+        """
+        items, _ = self._execute_shape(filters, order_by, limit=limit, columns=columns)
+        return items
+
+    def paginate(
+        self,
+        limit: int,
+        order_by: Sequence[str] = (),
+        after: Optional[Sequence[Any]] = None,
+        columns: Sequence[str] = (),
+        **filters,
+    ) -> Page[Any]:
+        """Get one page of entities with keyset (seek) pagination.
+
+        Each page continues strictly after the ordering values of the previous
+        page's last entity, so the database seeks through an index instead of
+        counting past an OFFSET, and rows inserted meanwhile do not shift
+        pages. Ordering columns should not be nullable.
+
+        Args:
+            limit: Page size
+            order_by: Field names, ``-`` prefixed for descending; the primary
+                key is appended as a tie-breaker
+            after: ``Page.after`` of the previous page; None for the first page
+            columns: Select only these fields as plain rows instead of entities;
+                they must include the ordering fields
+            **filters: Field=value or field__lookup=value filters
+
+        Returns:
+            The page, with ``after`` set when more entities follow
+        """
+        if columns:
+            missing = [field for field, _ in _parse_ordering(self.model, order_by) if field not in columns]
+            if missing:
+                raise ValueError(f"Paginated columns must include the ordering fields {missing}")
+        items, ordering = self._execute_shape(filters, order_by, after=after, limit=limit + 1, columns=columns)
+        if len(items) <= limit:
+            return Page(items=items, after=None)
+        items = items[:limit]
+        return Page(items=items, after=tuple(getattr(items[-1], field) for field, _ in ordering))
+
+    def keyset_types(self, order_by: Sequence[str] = ()) -> Tuple[type, ...]:
+        """Python types of the values in ``Page.after`` for this ordering."""
+        columns = inspect(self.model).columns
+        return tuple(columns[field].type.python_type for field, _ in _parse_ordering(self.model, order_by))
+
+    def iter_all(self, batch_size: int = 1000, **filters) -> Iterator[T]:
+        """Stream entities matching filters without loading them all at once.
+
+        Rows are fetched ``batch_size`` at a time through ``yield_per``, which
+        also requests a server-side cursor where the driver supports one, so
+        memory stays flat however large the table is. Do not modify the
+        session (commit, rollback) while iterating.
+
+        Args:
+            batch_size: Rows fetched and turned into entities per round
+            **filters: Field=value filters
+
+        Yields:
+            Entities in primary key order
+        """
+        primary_key = inspect(self.model).primary_key
+        yield from self._query(**filters).order_by(*primary_key).yield_per(batch_size)
+
+    def aggregate(
+        self,
+        metrics: Dict[str, Any],
+        group_by: Sequence[Any] = (),
+        **filters,
+    ) -> List[Dict[str, Any]]:
+        """Compute metrics per group in a single ``GROUP BY`` query.
+
+        Args:
+            metrics: Output name to SQL aggregate, e.g.
+                ``{"n": func.count(), "avg_duration": func.avg(Pipeline.duration_minutes)}``
+            group_by: Column names or SQL expressions to group by; empty gives one
+                row over every matching entity
+            **filters: Field=value filters
+
+        Returns:
+            One dict per group holding the group columns and the metrics
+        """
+        groups = [
+            getattr(self.model, column).label(column) if isinstance(column, str) else column
+            for column in group_by
+        ]
+        stmt = (
+            select(*groups, *(expression.label(name) for name, expression in metrics.items()))
+            .select_from(self.model)
+            .where(*self._criteria(filters))
+        )
+        if groups:
+            stmt = stmt.group_by(*groups)
+        return [dict(row) for row in self.session.execute(stmt).mappings()]
 
     def get_one(self, **filters) -> Optional[T]:
         """Get single entity matching filters.
@@ -61,16 +347,14 @@ class BaseRepository(Generic[T]):
         Returns:
             Entity or None
         """
-        query = self.session.query(self.model)
-        for key, value in filters.items():
-            if hasattr(self.model, key):
-                query = query.filter(getattr(self.model, key) == value)
-        return query.first()
+        items = self.find(limit=1, **filters)
+        return items[0] if items else None
 
-    def create(self, **kwargs) -> T:
+    def create(self, commit: bool = False, **kwargs) -> T:
         """Create new entity.
 
         Args:
+            commit: Commit immediately instead of flushing into the open transaction
             **kwargs: Entity fields
 
         Returns:
@@ -78,15 +362,15 @@ class BaseRepository(Generic[T]):
         """
         instance = self.model(**kwargs)
         self.session.add(instance)
-        self.session.commit()
-        self.session.refresh(instance)
+        self._finish(commit)
         return instance
 
-    def update(self, entity: T, **kwargs) -> T:
+    def update(self, entity: T, commit: bool = False, **kwargs) -> T:
         """Update entity fields.
 
         Args:
             entity: Entity to update
+            commit: Commit immediately instead of flushing into the open transaction
             **kwargs: Fields to update
 
         Returns:
@@ -96,18 +380,141 @@ class BaseRepository(Generic[T]):
             if hasattr(entity, key):
                 setattr(entity, key, value)
         self.session.add(entity)
-        self.session.commit()
-        self.session.refresh(entity)
+        self._finish(commit)
         return entity
 
-    def delete(self, entity: T) -> None:
+    def delete(self, entity: T, commit: bool = False) -> None:
         """Delete entity.
 
         Args:
             entity: Entity to delete
+            commit: Commit immediately instead of flushing into the open transaction
         """
         self.session.delete(entity)
-        self.session.commit()
+        self._finish(commit)
+
+    def bulk_create(self, rows: Sequence[Dict[str, Any]], commit: bool = False, returning: bool = False):
+        """Insert many rows with one batched INSERT.
+
+        Rows are sent as a single executemany, which SQLAlchemy batches into
+        multi-row ``INSERT ... VALUES`` statements ("insertmanyvalues").
+        Python-side column defaults are applied; no per-row objects are built.
+
+        Args:
+            rows: One dict of column values per row
+            commit: Commit immediately instead of joining the open transaction
+            returning: Return the inserted entities, in the order of rows (uses RETURNING)
+
+        Returns:
+            Number of rows inserted, or the inserted entities with ``returning``
+        """
+        if not rows:
+            return [] if returning else 0
+        stmt = insert(self.model)
+        if returning:
+            result = self._insert_returning(stmt, rows)
+        else:
+            self.session.execute(stmt, list(rows))
+            result = len(rows)
+        if commit:
+            self.session.commit()
+        return result
+
+    def _insert_returning(self, stmt, rows: Sequence[Dict[str, Any]]) -> List[T]:
+        """Insert rows and return their entities in the order of rows."""
+        primary_key = inspect(self.model).primary_key
+        dialect = self.session.get_bind(mapper=inspect(self.model)).dialect.name
+        if dialect == "sqlite" and len(primary_key) == 1 and not any(primary_key[0].key in row for row in rows):
+            # SQLite has no sentinel to order RETURNING rows by, so sort_by_parameter_order
+            # would insert row by row. Generated integer keys grow in VALUES order, so one
+            # multi-row INSERT sorted by key gives the same order.
+            key = primary_key[0].key
+            return sorted(self.session.scalars(stmt.returning(self.model), list(rows)), key=lambda e: getattr(e, key))
+        return list(self.session.scalars(stmt.returning(self.model, sort_by_parameter_order=True), list(rows)))
+
+    def bulk_update(self, rows: Sequence[Dict[str, Any]], commit: bool = False) -> int:
+        """Update many rows by primary key with one executemany UPDATE.
+
+        Args:
+            rows: Dicts holding the primary key plus the columns to change;
+                rows in one call should change the same columns
+            commit: Commit immediately instead of joining the open transaction
+
+        Returns:
+            Number of rows sent
+        """
+        if not rows:
+            return 0
+        self.session.execute(update(self.model), list(rows))
+        if commit:
+            self.session.commit()
+        return len(rows)
+
+    def upsert(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        conflict_keys: Sequence[str],
+        update_fields: Optional[Sequence[str]] = None,
+        commit: bool = False,
+    ) -> int:
+        """Insert rows, updating the existing row when ``conflict_keys`` collide.
+
+        Compiles to ``INSERT ... ON CONFLICT (...) DO UPDATE`` on PostgreSQL and
+        SQLite, batched like ``bulk_create``.
+
+        Args:
+            rows: One dict of column values per row
+            conflict_keys: Columns of the unique constraint that detects a conflict
+            update_fields: Columns overwritten on conflict; defaults to every
+                supplied column that is neither a conflict key nor the primary key
+            commit: Commit immediately instead of joining the open transaction
+
+        Returns:
+            Number of rows sent
+
+        Raises:
+            ValueError: The database is neither PostgreSQL nor SQLite
+        """
+        if not rows:
+            return 0
+        dialect = self.session.get_bind(mapper=inspect(self.model)).dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise ValueError(f"upsert is not supported on {dialect}")
+
+        primary_keys = {column.key for column in inspect(self.model).primary_key}
+        if update_fields is None:
+            update_fields = [key for key in rows[0] if key not in conflict_keys and key not in primary_keys]
+        stmt = dialect_insert(self.model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_keys),
+            set_={field: stmt.excluded[field] for field in update_fields},
+        )
+        self.session.execute(stmt, list(rows))
+        if commit:
+            self.session.commit()
+        return len(rows)
+
+    def delete_where(self, commit: bool = False, **filters) -> int:
+        """Delete every row matching filters with a single DELETE.
+
+        Args:
+            commit: Commit immediately instead of joining the open transaction
+            **filters: Field=value filters; at least one is required
+
+        Returns:
+            Number of rows deleted
+        """
+        criteria = self._criteria(filters)
+        if not criteria:
+            raise ValueError("delete_where() needs at least one filter")
+        result = self.session.execute(delete(self.model).where(*criteria))
+        if commit:
+            self.session.commit()
+        return result.rowcount
 
     def count(self, **filters) -> int:
         """Count entities matching filters.
@@ -118,19 +525,18 @@ class BaseRepository(Generic[T]):
         Returns:
             Count of entities
         """
-        query = self.session.query(self.model)
-        for key, value in filters.items():
-            if hasattr(self.model, key):
-                query = query.filter(getattr(self.model, key) == value)
-        return query.count()
+        return self._query(**filters).count()
 
     def exists(self, **filters) -> bool:
         """Check if entity exists.
 
+        Runs ``SELECT EXISTS (SELECT ... LIMIT 1)`` so the database stops at the
+        first match instead of counting them all.
+
         Args:
             **filters: Field=value filters
 
         Returns:
             True if exists
         """
-        return self.count(**filters) > 0
+        return self.session.query(self._query(**filters).limit(1).exists()).scalar()
@@ -0,0 +1,48 @@
+"""Learning session repository."""
+from typing import Any, Optional, Sequence
+from backend.api.models import LearningSession
+from backend.api.repositories.base import BaseRepository, Page
+
+
+class LearningSessionRepository(BaseRepository[LearningSession]):
+    """Repository for LearningSession model."""
+
+    def __init__(self):
+        super().__init__(LearningSession)
+
+    def search(
+        self,
+        limit: int,
+        order_by: Sequence[str] = ("-created_at",),
+        after: Optional[Sequence[Any]] = None,
+        status: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        q: Optional[str] = None,
+        columns: Sequence[str] = (),
+    ) -> Page[Any]:
+        """Get one page of sessions, optionally filtered.
+
+        Filtering on status or difficulty while ordering by creation time is
+        served by the ``(status, created_at)`` and ``(difficulty, created_at)``
+        indexes.
+
+        Args:
+            limit: Page size
+            order_by: Field names, ``-`` prefixed for descending
+            after: ``Page.after`` of the previous page
+            status: Only sessions with this status
+            difficulty: Only sessions with this difficulty
+            q: Case-insensitive substring of the title
+            columns: Select only these fields as plain rows instead of entities
+
+        Returns:
+            Page of sessions, or of rows with ``columns``
+        """
+        filters = {}
+        if status is not None:
+            filters["status"] = status
+        if difficulty is not None:
+            filters["difficulty"] = difficulty
+        if q:
+            filters["title__icontains"] = q
+        return self.paginate(limit=limit, order_by=order_by, after=after, columns=columns, **filters)
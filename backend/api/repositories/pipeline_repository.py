@@ -1,8 +1,10 @@
 """Pipeline repository."""
 from typing import List, Optional
 from datetime import datetime, timedelta
+from sqlalchemy import func
 from backend.api.models import Pipeline
 from backend.api.repositories.base import BaseRepository
+from backend.utils.db import read_only
 
 
 class PipelineRepository(BaseRepository[Pipeline]):
@@ -49,21 +51,41 @@ class PipelineRepository(BaseRepository[Pipeline]):
         """
         return self.get_all(owner=owner)
 
+    @read_only
     def get_statistics(self) -> dict:
         """Get pipeline statistics.
 
+        Counts and build durations for every status come from one GROUP BY
+        query.
+
         Returns:
             Dictionary with statistics
         """
-        total = self.count()
-        successful = self.count(status='success')
-        failed = self.count(status='failed')
-        running = self.count(status='running')
+        by_status = {
+            row["status"]: row
+            for row in self.aggregate(
+                group_by=["status"],
+                metrics={
+                    "n": func.count(),
+                    "duration_total": func.sum(Pipeline.duration_minutes),
+                    "durations": func.count(Pipeline.duration_minutes),
+                },
+            )
+        }
+        total = sum(row["n"] for row in by_status.values())
+        successful = by_status.get("success", {}).get("n", 0)
+        failed = by_status.get("failed", {}).get("n", 0)
+        running = by_status.get("running", {}).get("n", 0)
+
+        completed = [by_status[status] for status in ("success", "failed") if status in by_status]
+        durations = sum(row["durations"] for row in completed)
+        duration_total = sum(row["duration_total"] or 0 for row in completed)
 
         return {
             'total': total,
             'successful': successful,
             'failed': failed,
             'running': running,
-            'success_rate': (successful / total * 100) if total > 0 else 0
+            'success_rate': (successful / total * 100) if total > 0 else 0,
+            'avg_build_time': round(duration_total / durations, 1) if durations else 0,
         }
@@ -4,6 +4,7 @@ import time
 from flask import Blueprint, Response, request, stream_with_context
 
 from backend.api.models import AuditEvent
+from backend.api.read_models import AUDIT_EVENT_LIST
 from backend.api.routes.decorators import require_admin
 from backend.utils.db import get_session
 
@@ -51,23 +52,5 @@ def stream_events():
 def list_events():
     """List recent audit events (non-stream)."""
     limit = min(int(request.args.get("limit", 100)), 500)
-    session = get_session()
-    events = (
-        session.query(AuditEvent)
-        .order_by(AuditEvent.created_at.desc())
-        .limit(limit)
-        .all()
-    )
-    session.close()
-    return {
-        "events": [
-            {
-                "id": evt.id,
-                "event_type": evt.event_type,
-                "payload": evt.payload,
-                "signature_hash": evt.signature_hash,
-                "created_at": evt.created_at.isoformat() if evt.created_at else None,
-            }
-            for evt in events
-        ]
-    }
+    events = get_session().execute(AUDIT_EVENT_LIST.select().order_by(AuditEvent.created_at.desc()).limit(limit))
+    return AUDIT_EVENT_LIST.response("events", events.all())
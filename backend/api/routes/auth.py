@@ -1,7 +1,8 @@
 from flask import Blueprint, jsonify, request, g, current_app
 import pyotp
 
-from backend.api.models import RegistrationRequest
+from backend.api.models import AdminUser, RegistrationRequest
+from backend.api.read_models import REGISTRATION_REQUEST_LIST
 from backend.api.routes.decorators import require_admin
 from backend.api.services.auth import (
     authenticate_admin,
@@ -11,6 +12,9 @@ from backend.api.services.auth import (
     list_registration_requests,
     approve_registration_request,
     reject_registration_request,
+    apply_registration_decisions,
+    verify_signatures_batch,
+    BatchDecisionError,
     register_public_key,
     _verify_signature,
     log_audit_event,
@@ -18,7 +22,9 @@ from backend.api.services.auth import (
     require_policy_for_action,
     handle_risk_challenge,
 )
+from backend.api.services.login_failures import get_failure_tracker, login_blocked
 from backend.api.services.risk import calculate_risk
+from backend.utils.passwords import PasswordHasherBusy
 from backend.utils.security import generate_admin_token
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
@@ -35,18 +41,26 @@ def admin_login():
     if not username or not password:
         return jsonify({"error": "Username and password are required."}), 400
 
+    # Checked before any password hashing so floods are rejected cheaply.
+    tracker = get_failure_tracker()
+    user_failures, ip_failures = tracker.counts(username, request.remote_addr)
+    if login_blocked(user_failures, ip_failures):
+        return jsonify({"error": "Too many failed login attempts. Try again later."}), 429
+
     admin = authenticate_admin(username, password)
     if not admin:
+        tracker.record_failure(username, request.remote_addr)
         return jsonify({"error": "Incorrect username or password."}), 401
 
-    risk_score = evaluate_login_risk(username, request.remote_addr, 0)
-    decision, rules, evidence = require_policy_for_action(admin, "auth.login", risk_score)
+    risk_score = evaluate_login_risk(username, request.remote_addr, max(user_failures, ip_failures))
+    decision, rules, evidence = require_policy_for_action(admin, "auth.login", risk_score, request.remote_addr)
     if decision == "deny":
         return jsonify({"error": "Login denied by policy.", "rules": rules, "evidence": evidence}), 403
 
     try:
         challenge = handle_risk_challenge(admin, risk_score, totp_code)
     except ValueError as e:
+        tracker.record_failure(username, request.remote_addr)
         return jsonify({"error": str(e), "rules": rules, "evidence": evidence}), 409
 
     if challenge:
@@ -61,6 +75,7 @@ def admin_login():
             }
         ), 409
 
+    tracker.reset(username)
     token = generate_admin_token(admin)
     log_audit_event(
         "auth.login.success",
@@ -94,6 +109,8 @@ def admin_register():
         return jsonify({"token": token, "admin": serialize_admin(admin)}), 201
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
+    except PasswordHasherBusy:
+        raise
     except Exception as e:
         return jsonify({"error": "Registration failed. Please try again."}), 500
 
@@ -128,6 +145,8 @@ def admin_register_request():
         )
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
+    except PasswordHasherBusy:
+        raise
     except Exception:
         return jsonify({"error": "Could not create registration request."}), 500
 
@@ -137,8 +156,7 @@ def admin_register_request():
 def list_register_requests():
     """List registration requests (admin only)."""
     status = request.args.get("status")
-    requests = list_registration_requests(status)
-    return jsonify({"requests": [serialize_registration_request(r) for r in requests]})
+    return REGISTRATION_REQUEST_LIST.response("requests", list_registration_requests(status))
 
 
 @auth_bp.route("/register/requests/<int:request_id>/approve", methods=["POST"])
@@ -158,7 +176,9 @@ def approve_request(request_id: int):
         sig_hash = _verify_signature(g.current_admin, message, signature)
 
         risk_score = calculate_risk(request.remote_addr, failures=0)
-        decision, rules, evidence = require_policy_for_action(g.current_admin, "register.approve", risk_score)
+        decision, rules, evidence = require_policy_for_action(
+            g.current_admin, "register.approve", risk_score, request.remote_addr
+        )
         if decision == "deny":
             return jsonify({"error": "Approval denied by policy.", "rules": rules, "evidence": evidence}), 403
         if decision == "challenge":
@@ -199,7 +219,9 @@ def reject_request(request_id: int):
         sig_hash = _verify_signature(g.current_admin, message, signature)
 
         risk_score = calculate_risk(request.remote_addr, failures=0)
-        decision, rules, evidence = require_policy_for_action(g.current_admin, "register.reject", risk_score)
+        decision, rules, evidence = require_policy_for_action(
+            g.current_admin, "register.reject", risk_score, request.remote_addr
+        )
         if decision == "deny":
             return jsonify({"error": "Rejection denied by policy.", "rules": rules, "evidence": evidence}), 403
         if decision == "challenge":
@@ -223,6 +245,92 @@ def reject_request(request_id: int):
         return jsonify({"error": "Failed to reject request."}), 500
 
 
+def _text(value) -> str:
+    # Batch items are arbitrary JSON, so a number or object must not reach .strip().
+    return value.strip() if isinstance(value, str) else ""
+
+
+@auth_bp.route("/register/requests/batch", methods=["POST"])
+@require_admin
+def review_requests_batch():
+    """Approve or reject several registration requests with one signed call."""
+    payload = request.get_json(silent=True) or {}
+    decisions = payload.get("decisions")
+    max_batch = current_app.config.get("REGISTRATION_BATCH_MAX", 100)
+    if not isinstance(decisions, list) or not decisions:
+        return jsonify({"error": "decisions must be a non-empty list."}), 400
+    if len(decisions) > max_batch:
+        return jsonify({"error": f"At most {max_batch} decisions per batch."}), 400
+
+    items = []
+    for raw in decisions:
+        item = raw if isinstance(raw, dict) else {}
+        request_id = item.get("request_id")
+        action = item.get("action")
+        signature = _text(item.get("signature"))
+        signed_at = _text(item.get("signed_at"))
+        # bool is an int subclass, so True would address request 1.
+        valid_id = isinstance(request_id, int) and not isinstance(request_id, bool)
+        if not valid_id or action not in ("approve", "reject") or not signature or not signed_at:
+            return jsonify(
+                {"error": "Each decision needs request_id, action (approve/reject), signature and signed_at."}
+            ), 400
+        items.append(
+            {
+                "request_id": request_id,
+                "action": action,
+                "note": _text(item.get("note")) or None,
+                "signature": signature,
+                "signed_at": signed_at,
+            }
+        )
+    if len({item["request_id"] for item in items}) != len(items):
+        return jsonify({"error": "Each request may appear only once per batch."}), 400
+
+    try:
+        verified = verify_signatures_batch(
+            g.current_admin,
+            [(f"{item['request_id']}:{item['action']}:{item['signed_at']}", item["signature"]) for item in items],
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    failures = [
+        {"request_id": item["request_id"], "error": error}
+        for item, (_, error) in zip(items, verified)
+        if error
+    ]
+    if failures:
+        return jsonify({"error": "Signature verification failed.", "results": failures}), 400
+    for item, (sig_hash, _) in zip(items, verified):
+        item["signature_hash"] = sig_hash
+
+    risk_score = calculate_risk(request.remote_addr, failures=0)
+    for action in sorted({item["action"] for item in items}):
+        decision, rules, evidence = require_policy_for_action(
+            g.current_admin, f"register.{action}", risk_score, request.remote_addr
+        )
+        if decision == "deny":
+            return jsonify({"error": "Batch denied by policy.", "rules": rules, "evidence": evidence}), 403
+        if decision == "challenge":
+            return jsonify({"error": "Batch requires secondary validation.", "rules": rules, "evidence": evidence}), 409
+
+    try:
+        reviewed = apply_registration_decisions(g.current_admin, items)
+    except BatchDecisionError as e:
+        results = [{"request_id": request_id, "error": error} for request_id, error in e.errors.items()]
+        return jsonify({"error": str(e), "results": results}), 400
+    except Exception:
+        return jsonify({"error": "Failed to apply batch."}), 500
+
+    return jsonify(
+        {
+            "message": f"{len(reviewed)} requests reviewed.",
+            "requests": [serialize_registration_request(r) for r in reviewed],
+        }
+    )
+
+
 def serialize_registration_request(req: RegistrationRequest) -> dict:
     """Serialize a registration request for API responses."""
     return {
@@ -261,17 +369,16 @@ def register_key():
 @require_admin
 def enroll_totp():
     """Enroll TOTP for current admin."""
-    if g.current_admin.totp_secret:
+    from backend.utils.db import get_session
+
+    session = get_session()
+    admin = session.get(AdminUser, g.current_admin.id)
+    if admin.totp_secret:
         return jsonify({"error": "TOTP already enrolled."}), 400
 
     secret = pyotp.random_base32()
-    g.current_admin.totp_secret = secret
     # Persist
-    from backend.utils.db import get_session
-
-    session = get_session()
-    session.add(g.current_admin)
-    session.commit()
+    admin.totp_secret = secret
 
     log_audit_event("auth.totp.enroll", {"admin": g.current_admin.username})
 
@@ -43,58 +43,52 @@ def _upsert_pipeline(payload: Dict[str, object]):
     run_id = payload.get("runId") or payload.get("run_id")
 
     session = get_session()
-    try:
-        if run_id:
-            existing = session.query(Pipeline).filter(Pipeline.run_id == str(run_id)).first()
-            if existing:
-                existing.status = status
-                existing.owner = owner
-                existing.updated_at = datetime.now(timezone.utc)
-                if status in ["success", "failed"]:
-                    existing.completed_at = datetime.now(timezone.utc)
-                    if existing.started_at:
-                        duration = (existing.completed_at - existing.started_at).total_seconds() / 60
-                        existing.duration_minutes = round(duration, 2)
-                session.commit()
-                session.refresh(existing)
-                return existing
-
-        pipeline = Pipeline(
-            name=name,
-            description=payload.get("description"),
-            status=status,
-            owner=owner,
-            branch=payload.get("branch"),
-            commit_sha=payload.get("commitSha"),
-            commit_message=payload.get("commitMessage"),
-            workflow_name=payload.get("workflowName"),
-            run_id=str(run_id) if run_id else None,
-            run_number=payload.get("runNumber"),
-            started_at=datetime.now(timezone.utc),
-        )
-
-        if status in ["success", "failed"]:
-            pipeline.completed_at = datetime.now(timezone.utc)
-            pipeline.duration_minutes = payload.get("durationMinutes") or 0
-
-        session.add(pipeline)
-        session.commit()
-        session.refresh(pipeline)
-
-        log_level = (
-            "success" if status == "success" else "error" if status == "failed" else "info"
-        )
-        log = DeploymentLog(
-            pipeline_id=pipeline.id,
-            level=log_level,
-            message=f"Pipeline '{name}' {status}",
-            timestamp=datetime.now(timezone.utc),
-        )
-        session.add(log)
-        session.commit()
-        return pipeline
-    finally:
-        session.close()
+    if run_id:
+        existing = session.query(Pipeline).filter(Pipeline.run_id == str(run_id)).first()
+        if existing:
+            existing.status = status
+            existing.owner = owner
+            existing.updated_at = datetime.now(timezone.utc)
+            if status in ["success", "failed"]:
+                existing.completed_at = datetime.now(timezone.utc)
+                if existing.started_at:
+                    duration = (existing.completed_at - existing.started_at).total_seconds() / 60
+                    existing.duration_minutes = round(duration, 2)
+            session.flush()
+            return existing
+
+    pipeline = Pipeline(
+        name=name,
+        description=payload.get("description"),
+        status=status,
+        owner=owner,
+        branch=payload.get("branch"),
+        commit_sha=payload.get("commitSha"),
+        commit_message=payload.get("commitMessage"),
+        workflow_name=payload.get("workflowName"),
+        run_id=str(run_id) if run_id else None,
+        run_number=payload.get("runNumber"),
+        started_at=datetime.now(timezone.utc),
+    )
+
+    if status in ["success", "failed"]:
+        pipeline.completed_at = datetime.now(timezone.utc)
+        pipeline.duration_minutes = payload.get("durationMinutes") or 0
+
+    session.add(pipeline)
+    session.flush()
+
+    log_level = (
+        "success" if status == "success" else "error" if status == "failed" else "info"
+    )
+    log = DeploymentLog(
+        pipeline_id=pipeline.id,
+        level=log_level,
+        message=f"Pipeline '{name}' {status}",
+        timestamp=datetime.now(timezone.utc),
+    )
+    session.add(log)
+    return pipeline
 
 
 @integrations_bp.route("/github", methods=["POST"])
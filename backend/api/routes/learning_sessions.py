@@ -1,12 +1,19 @@
 from flask import Blueprint, jsonify, request
 
 from backend.api.services.learning_sessions import (
+    DEFAULT_PAGE_SIZE,
+    BatchRejected,
     create_session,
+    create_sessions,
     delete_session,
+    delete_sessions,
     get_session_by_id,
     list_sessions,
-    update_session
+    update_session,
+    update_sessions
 )
+from backend.api.read_models import SESSION_LIST
+from backend.api.services.learning_session_stats import get_session_stats
 from .decorators import require_admin
 
 learning_sessions_bp = Blueprint("learning_sessions", __name__)
@@ -14,10 +21,46 @@ learning_sessions_bp = Blueprint("learning_sessions", __name__)
 @learning_sessions_bp.route("/", methods=["GET"])
 @require_admin
 def list_learning_sessions():
-    """Return all learning sessions ordered by creation time."""
-    sessions = list_sessions()
+    """Return one page of learning sessions, newest first by default.
+
+    Query parameters: ``status``, ``difficulty``, ``q`` (title search),
+    ``sort`` (``-created_at``, ``created_at``, ``-updated_at``, ``updated_at``,
+    ``title``, ``-title``), ``limit`` and ``cursor`` (``next_cursor`` of the
+    previous page).
+    """
+    try:
+        sessions, next_cursor = list_sessions(
+            status=request.args.get("status"),
+            difficulty=request.args.get("difficulty"),
+            q=request.args.get("q"),
+            sort=request.args.get("sort", "-created_at"),
+            limit=int(request.args.get("limit", DEFAULT_PAGE_SIZE)),
+            cursor=request.args.get("cursor"),
+        )
+    except ValueError as exc:
+        return jsonify({
+            "error": str(exc)
+        }), 400
+    return SESSION_LIST.response("data", sessions, next_cursor=next_cursor)
+
+@learning_sessions_bp.route("/stats", methods=["GET"])
+@require_admin
+def learning_session_stats():
+    """Return session counts, completion times and weekly throughput.
+
+    Served from incrementally maintained aggregates; ``weeks`` (default 12,
+    max 104) sets how many weeks of throughput are returned.
+    """
+    try:
+        weeks = int(request.args.get("weeks", 12))
+    except ValueError:
+        weeks = 0
+    if not 1 <= weeks <= 104:
+        return jsonify({
+            "error": "Parameter 'weeks' must be between 1 and 104."
+        }), 400
     return jsonify({
-        "data": sessions
+        "data": get_session_stats(weeks)
     }), 200
 
 @learning_sessions_bp.route("/", methods=["POST"])
@@ -79,3 +122,57 @@ def delete_learning_session(session_id: int):
             "error": "Session not found"
         }), 404
     return "", 204
+
+def _run_batch(operation, field: str, success_status: int):
+    """Run a batch operation on ``payload[field]`` and shape the response.
+
+    ``atomic`` (default true) rejects the whole batch with 400 if any item
+    fails; otherwise valid items are applied and the response is 207 when
+    some items failed.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({
+            "error": f"Request body must be a JSON object with '{field}'."
+        }), 400
+    atomic = payload.get("atomic", True)
+    if not isinstance(atomic, bool):
+        return jsonify({
+            "error": "Field 'atomic' must be a boolean."
+        }), 400
+    try:
+        results = operation(payload.get(field), atomic=atomic)
+    except BatchRejected as exc:
+        return jsonify({
+            "error": str(exc),
+            "results": exc.results
+        }), 400
+    except ValueError as exc:
+        return jsonify({
+            "error": str(exc)
+        }), 400
+
+    failed = sum(1 for result in results if "error" in result)
+    return jsonify({
+        "results": results,
+        "succeeded": len(results) - failed,
+        "failed": failed
+    }), 207 if failed else success_status
+
+@learning_sessions_bp.route("/batch", methods=["POST"])
+@require_admin
+def create_learning_sessions():
+    """Create many learning sessions from ``{"items": [...], "atomic": true}``."""
+    return _run_batch(create_sessions, "items", 201)
+
+@learning_sessions_bp.route("/batch", methods=["PATCH"])
+@require_admin
+def update_learning_sessions():
+    """Update many learning sessions from ``{"items": [{"id": ..., ...}], "atomic": true}``."""
+    return _run_batch(update_sessions, "items", 200)
+
+@learning_sessions_bp.route("/batch", methods=["DELETE"])
+@require_admin
+def delete_learning_sessions():
+    """Delete many learning sessions from ``{"ids": [...], "atomic": true}``."""
+    return _run_batch(delete_sessions, "ids", 200)
@@ -4,6 +4,8 @@ from flask import Blueprint, jsonify, request
 from sqlalchemy import desc
 
 from backend.api.models import Pipeline, DeploymentLog
+from backend.api.read_models import DEPLOYMENT_LOG_LIST, PIPELINE_LIST
+from backend.api.repositories import PipelineRepository
 from backend.utils.db import get_session
 from .decorators import require_admin
 
@@ -21,16 +23,13 @@ def list_pipelines():
     status = request.args.get("status")  # Filter by status
 
     query = session.query(Pipeline).order_by(desc(Pipeline.created_at))
+    rows = PIPELINE_LIST.select().order_by(desc(Pipeline.created_at)).limit(limit)
 
     if status:
         query = query.filter(Pipeline.status == status)
+        rows = rows.where(Pipeline.status == status)
 
-    pipelines = query.limit(limit).all()
-
-    return jsonify({
-        "pipelines": [p.to_dict() for p in pipelines],
-        "total": query.count()
-    })
+    return PIPELINE_LIST.response("pipelines", session.execute(rows).all(), total=query.count())
 
 
 @pipelines_bp.route("", methods=["POST"])
@@ -63,8 +62,7 @@ def create_pipeline():
                     duration = (existing.completed_at - existing.started_at).total_seconds() / 60
                     existing.duration_minutes = round(duration, 2)
 
-            session.commit()
-            session.refresh(existing)
+            session.flush()
 
             return jsonify({
                 "message": "Pipeline updated",
@@ -92,8 +90,7 @@ def create_pipeline():
         pipeline.duration_minutes = payload.get("durationMinutes", 0)
 
     session.add(pipeline)
-    session.commit()
-    session.refresh(pipeline)
+    session.flush()
 
     # Create log entry
     log_level = "success" if status == "success" else "error" if status == "failed" else "info"
@@ -104,7 +101,6 @@ def create_pipeline():
         timestamp=datetime.now(timezone.utc)
     )
     session.add(log)
-    session.commit()
 
     return jsonify({
         "message": "Pipeline created successfully",
@@ -129,30 +125,14 @@ def get_pipeline(pipeline_id):
 @require_admin
 def get_stats():
     """Get pipeline statistics."""
-    session = get_session()
-
-    total = session.query(Pipeline).count()
-    successful = session.query(Pipeline).filter(Pipeline.status == "success").count()
-    failed = session.query(Pipeline).filter(Pipeline.status == "failed").count()
-    running = session.query(Pipeline).filter(Pipeline.status == "running").count()
-
-    # Calculate average build time
-    completed_pipelines = session.query(Pipeline).filter(
-        Pipeline.status.in_(["success", "failed"]),
-        Pipeline.duration_minutes.isnot(None)
-    ).all()
-
-    avg_build_time = 0
-    if completed_pipelines:
-        total_duration = sum(p.duration_minutes for p in completed_pipelines)
-        avg_build_time = round(total_duration / len(completed_pipelines), 1)
+    stats = PipelineRepository().get_statistics()
 
     return jsonify({
-        "total": total,
-        "successful": successful,
-        "failed": failed,
-        "active": running,
-        "avgBuildTime": avg_build_time
+        "total": stats["total"],
+        "successful": stats["successful"],
+        "failed": stats["failed"],
+        "active": stats["running"],
+        "avgBuildTime": stats["avg_build_time"]
     })
 
 
@@ -163,11 +143,9 @@ def get_logs():
     session = get_session()
 
     limit = request.args.get("limit", default=50, type=int)
-    logs = session.query(DeploymentLog).order_by(desc(DeploymentLog.timestamp)).limit(limit).all()
+    logs = session.execute(DEPLOYMENT_LOG_LIST.select().order_by(desc(DeploymentLog.timestamp)).limit(limit)).all()
 
-    return jsonify({
-        "logs": [log.to_dict() for log in logs]
-    })
+    return DEPLOYMENT_LOG_LIST.response("logs", logs)
 
 
 @pipelines_bp.route("/history", methods=["GET"])
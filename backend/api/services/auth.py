@@ -1,13 +1,18 @@
 """Authentication helpers and admin utilities."""
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional, Tuple
 import base64
 import hashlib
 import json
+import os
 
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives.serialization import load_pem_public_key
+from flask import current_app
+from sqlalchemy import Row, select, update
+from sqlalchemy.orm.attributes import set_committed_value
 
 from backend.api.models import (
     AdminUser,
@@ -16,10 +21,12 @@ from backend.api.models import (
     AuthChallenge,
     RegistrationRequest,
 )
+from backend.api.read_models import REGISTRATION_REQUEST_LIST
 from backend.api.services.policy import evaluate_action, persist_decision
 from backend.api.services.risk import calculate_risk, issue_totp_challenge, verify_totp
 from backend.utils.db import get_session
-from backend.utils.passwords import hash_password, verify_password
+from backend.utils.passwords import hash_password, needs_rehash, verify_password
+from backend.utils.security import AdminIdentity
 
 
 def get_admin_by_username(username: str) -> Optional[AdminUser]:
@@ -44,8 +51,7 @@ def create_admin(username: str, password: str, role: str = "admin", password_has
         admin.password_hash = hash_password(password)
 
     session.add(admin)
-    session.commit()
-    session.refresh(admin)
+    session.flush()
 
     return admin
 
@@ -58,17 +64,35 @@ def authenticate_admin(username: str, password: str) -> Optional[AdminUser]:
     if not verify_password(password, admin.password_hash):
         return None
 
+    if needs_rehash(admin.password_hash):
+        _upgrade_password_hash(admin, password)
+
     return admin
 
 
+def _upgrade_password_hash(admin: AdminUser, password: str) -> None:
+    """Re-hash a verified password with the configured KDF parameters.
+
+    Written with a Core UPDATE so the unchanged password does not bump the
+    admin's token version or evict cached identities.
+    """
+    new_hash = hash_password(password)
+    session = get_session()
+    session.execute(update(AdminUser).where(AdminUser.id == admin.id).values(password_hash=new_hash))
+    set_committed_value(admin, "password_hash", new_hash)
+
+
 def evaluate_login_risk(username: str, remote_addr: Optional[str], failures: int = 0) -> int:
     """Wrap risk calculation for login attempts."""
     return calculate_risk(remote_addr, failures)
 
 
-def require_policy_for_action(admin: AdminUser, action: str, risk_score: int) -> tuple[str, list, dict]:
+def require_policy_for_action(
+    admin: AdminUser, action: str, risk_score: int, remote_addr: Optional[str] = None
+) -> tuple[str, list, dict]:
     """Evaluate and persist policy decision."""
-    decision, rules, evidence = evaluate_action(admin.username, action, {"risk_score": risk_score})
+    context = {"risk_score": risk_score, "role": admin.role, "remote_addr": remote_addr}
+    decision, rules, evidence = evaluate_action(admin.username, action, context)
     persist_decision(admin.username, action, decision, rules, evidence)
     return decision, rules, evidence
 
@@ -82,38 +106,57 @@ def serialize_admin(admin: AdminUser) -> dict:
     }
 
 
-def register_public_key(admin: AdminUser, public_key_pem: str) -> ApprovalKey:
+def register_public_key(admin: AdminIdentity, public_key_pem: str) -> ApprovalKey:
     """Register or replace an admin's approval public key."""
     session = get_session()
+    _get_key_cache().pop(admin.id, None)
     existing = session.query(ApprovalKey).filter(ApprovalKey.admin_id == admin.id).first()
     if existing:
         existing.public_key_pem = public_key_pem
         existing.created_at = datetime.now(timezone.utc)
-        session.add(existing)
-        session.commit()
-        session.refresh(existing)
+        session.flush()
         return existing
 
     key = ApprovalKey(admin_id=admin.id, public_key_pem=public_key_pem)
     session.add(key)
-    session.commit()
-    session.refresh(key)
+    session.flush()
     return key
 
 
-def _verify_signature(admin: AdminUser, message: str, signature_b64: str) -> str:
-    """Verify signature with stored public key. Returns signature hash."""
+def _get_key_cache() -> dict:
+    """Parsed approval keys of this worker: admin_id -> (key created_at, public key)."""
+    return current_app.extensions.setdefault("approval_key_cache", {})
+
+
+def _get_public_key(admin_id: int):
+    """Return the admin's parsed public key, re-parsing only when the key was replaced."""
     session = get_session()
-    key = session.query(ApprovalKey).filter(ApprovalKey.admin_id == admin.id).first()
-    if not key:
+    created_at = session.execute(
+        select(ApprovalKey.created_at).where(ApprovalKey.admin_id == admin_id)
+    ).scalar_one_or_none()
+    if created_at is None:
         raise ValueError("No approval public key registered for this admin.")
 
+    cache = _get_key_cache()
+    cached = cache.get(admin_id)
+    if cached is not None and cached[0] == created_at:
+        return cached[1]
+
+    pem = session.execute(
+        select(ApprovalKey.public_key_pem).where(ApprovalKey.admin_id == admin_id)
+    ).scalar_one()
+    public_key = load_pem_public_key(pem.encode())
+    cache[admin_id] = (created_at, public_key)
+    return public_key
+
+
+def _verify_with_key(public_key, message: str, signature_b64: str) -> str:
+    """Verify a base64 signature over ``message``. Returns signature hash."""
     try:
         signature_bytes = base64.b64decode(signature_b64)
     except Exception:
         raise ValueError("Signature is not valid base64.")
 
-    public_key = load_pem_public_key(key.public_key_pem.encode())
     try:
         public_key.verify(
             signature_bytes,
@@ -127,8 +170,45 @@ def _verify_signature(admin: AdminUser, message: str, signature_b64: str) -> str
     return hashlib.sha256(signature_bytes).hexdigest()
 
 
+def _verify_signature(admin: AdminIdentity, message: str, signature_b64: str) -> str:
+    """Verify signature with stored public key. Returns signature hash."""
+    return _verify_with_key(_get_public_key(admin.id), message, signature_b64)
+
+
+def _get_verify_pool() -> ThreadPoolExecutor:
+    # cryptography releases the GIL while verifying, so threads verify in parallel.
+    pid, pool = current_app.extensions.get("signature_verify_pool", (None, None))
+    if pid != os.getpid():
+        pool = ThreadPoolExecutor(
+            max_workers=current_app.config.get("SIGNATURE_VERIFY_THREADS", 4),
+            thread_name_prefix="signature-verify",
+        )
+        current_app.extensions["signature_verify_pool"] = (os.getpid(), pool)
+    return pool
+
+
+def verify_signatures_batch(
+    admin: AdminIdentity, items: List[Tuple[str, str]]
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Verify (message, signature) pairs concurrently.
+
+    Returns one (signature hash, error) pair per item, in input order.
+    """
+    public_key = _get_public_key(admin.id)
+
+    def verify(item: Tuple[str, str]) -> Tuple[Optional[str], Optional[str]]:
+        try:
+            return _verify_with_key(public_key, *item), None
+        except ValueError as exc:
+            return None, str(exc)
+
+    if len(items) == 1:
+        return [verify(items[0])]
+    return list(_get_verify_pool().map(verify, items))
+
+
 def log_audit_event(event_type: str, payload: dict, signature_hash: Optional[str] = None) -> AuditEvent:
-    """Persist an append-only audit record."""
+    """Add an append-only audit record; it is written with the request's commit."""
     session = get_session()
     record = AuditEvent(
         event_type=event_type,
@@ -136,8 +216,6 @@ def log_audit_event(event_type: str, payload: dict, signature_hash: Optional[str
         signature_hash=signature_hash,
     )
     session.add(record)
-    session.commit()
-    session.refresh(record)
     return record
 
 
@@ -164,21 +242,21 @@ def create_registration_request(username: str, password: str, reason: Optional[s
     )
 
     session.add(request)
-    session.commit()
-    session.refresh(request)
+    session.flush()
     return request
 
 
-def list_registration_requests(status: Optional[str] = None) -> list[RegistrationRequest]:
-    """List registration requests filtered by status."""
-    session = get_session()
-    query = session.query(RegistrationRequest)
+def list_registration_requests(status: Optional[str] = None) -> list[Row]:
+    """List registration requests filtered by status, as ``REGISTRATION_REQUEST_LIST`` rows."""
+    stmt = REGISTRATION_REQUEST_LIST.select().order_by(RegistrationRequest.created_at.desc())
     if status:
-        query = query.filter(RegistrationRequest.status == status)
-    return query.order_by(RegistrationRequest.created_at.desc()).all()
+        stmt = stmt.where(RegistrationRequest.status == status)
+    return get_session().execute(stmt).all()
 
 
-def approve_registration_request(request_id: int, reviewer: AdminUser, note: Optional[str] = None) -> RegistrationRequest:
+def approve_registration_request(
+    request_id: int, reviewer: AdminIdentity, note: Optional[str] = None
+) -> RegistrationRequest:
     """Approve a registration request and create the admin user."""
     session = get_session()
     request = session.query(RegistrationRequest).filter(RegistrationRequest.id == request_id).first()
@@ -191,13 +269,13 @@ def approve_registration_request(request_id: int, reviewer: AdminUser, note: Opt
     request.reviewed_by = reviewer.username
     request.review_note = note
     request.reviewed_at = datetime.now(timezone.utc)
-    session.add(request)
-    session.commit()
-    session.refresh(request)
+    session.flush()
     return request
 
 
-def reject_registration_request(request_id: int, reviewer: AdminUser, note: Optional[str] = None) -> RegistrationRequest:
+def reject_registration_request(
+    request_id: int, reviewer: AdminIdentity, note: Optional[str] = None
+) -> RegistrationRequest:
     """Reject a registration request."""
     session = get_session()
     request = session.query(RegistrationRequest).filter(RegistrationRequest.id == request_id).first()
@@ -208,12 +286,71 @@ def reject_registration_request(request_id: int, reviewer: AdminUser, note: Opti
     request.reviewed_by = reviewer.username
     request.review_note = note
     request.reviewed_at = datetime.now(timezone.utc)
-    session.add(request)
-    session.commit()
-    session.refresh(request)
+    session.flush()
     return request
 
 
+class BatchDecisionError(ValueError):
+    """Raised when a batch of registration decisions cannot be applied."""
+
+    def __init__(self, errors: dict):
+        super().__init__("One or more decisions could not be applied.")
+        self.errors = errors
+
+
+def apply_registration_decisions(reviewer: AdminIdentity, decisions: List[dict]) -> List[RegistrationRequest]:
+    """Approve or reject several registration requests in one transaction.
+
+    Each decision holds ``request_id``, ``action`` (approve/reject), ``note``,
+    ``signed_at`` and the verified ``signature_hash``. Nothing is written if any
+    request is missing, already processed or clashes with an existing username.
+    """
+    session = get_session()
+    ids = [d["request_id"] for d in decisions]
+    requests = {
+        r.id: r
+        for r in session.query(RegistrationRequest).filter(RegistrationRequest.id.in_(ids)).all()
+    }
+    errors = {
+        request_id: "Request not found or already processed"
+        for request_id in ids
+        if request_id not in requests or requests[request_id].status != "pending"
+    }
+    approvals = [d for d in decisions if d["action"] == "approve" and d["request_id"] not in errors]
+    if approvals:
+        names = [requests[d["request_id"]].username for d in approvals]
+        taken = set(session.scalars(select(AdminUser.username).where(AdminUser.username.in_(names))))
+        for d in approvals:
+            if requests[d["request_id"]].username in taken:
+                errors[d["request_id"]] = "Username already exists"
+    if errors:
+        raise BatchDecisionError(errors)
+
+    now = datetime.now(timezone.utc)
+    for d in decisions:
+        request = requests[d["request_id"]]
+        if d["action"] == "approve":
+            session.add(AdminUser(username=request.username, role="admin", password_hash=request.password_hash))
+        request.status = "approved" if d["action"] == "approve" else "rejected"
+        request.reviewed_by = reviewer.username
+        request.review_note = d.get("note")
+        request.reviewed_at = now
+        log_audit_event(
+            f"registration.{d['action']}",
+            {
+                "request_id": request.id,
+                "reviewer": reviewer.username,
+                "note": d.get("note"),
+                "signed_at": d["signed_at"],
+                "batch": True,
+            },
+            signature_hash=d["signature_hash"],
+        )
+    session.flush()
+
+    return [requests[request_id] for request_id in ids]
+
+
 def handle_risk_challenge(admin: AdminUser, risk_score: int, totp_code: Optional[str]) -> Optional[AuthChallenge]:
     """Require TOTP when risk is elevated."""
     if risk_score < 40:
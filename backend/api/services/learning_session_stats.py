@@ -0,0 +1,242 @@
+"""Learning session statistics kept as incremental aggregates.
+
+Every create, update and delete of a learning session hands the session's
+state before and after the change to ``record_transitions``. That turns them
+into counter deltas and applies them with one upsert in the same
+transaction. Reading the statistics then touches only the aggregate rows,
+however many sessions exist.
+
+Time to complete (``started_at`` to ``completed_at``) is kept as a histogram
+with eight buckets per doubling. The mean is exact; the median is
+interpolated within its bucket and is accurate to about 5%.
+"""
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+import math
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend.api.models import LearningSession, LearningSessionAggregate
+from backend.utils.db import get_session, read_only
+
+BUCKETS_PER_DOUBLING = 8
+SHORTEST_BUCKET_SECONDS = 60.0  # completions faster than this share bucket 0
+UNSPECIFIED = "unspecified"
+
+_KEY = ("metric", "status", "difficulty", "bucket")
+
+
+class SessionState(NamedTuple):
+    """The fields of a session that the statistics depend on."""
+
+    status: str
+    difficulty: Optional[str]
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+
+
+def snapshot(record: LearningSession) -> SessionState:
+    return SessionState(record.status, record.difficulty, record.started_at, record.completed_at)
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _week_start(moment: datetime) -> date:
+    day = _utc(moment).date()
+    return day - timedelta(days=day.weekday())
+
+
+def duration_bucket(seconds: float) -> int:
+    """Histogram bucket of a time to complete."""
+    if seconds < SHORTEST_BUCKET_SECONDS:
+        return 0
+    return 1 + math.floor(BUCKETS_PER_DOUBLING * math.log2(seconds / SHORTEST_BUCKET_SECONDS))
+
+
+def _bucket_bounds(bucket: int) -> Tuple[float, float]:
+    if bucket == 0:
+        return 0.0, SHORTEST_BUCKET_SECONDS
+    return (
+        SHORTEST_BUCKET_SECONDS * 2 ** ((bucket - 1) / BUCKETS_PER_DOUBLING),
+        SHORTEST_BUCKET_SECONDS * 2 ** (bucket / BUCKETS_PER_DOUBLING),
+    )
+
+
+def _contributions(state: SessionState) -> Dict[Tuple, Tuple[int, float]]:
+    """Counter keys one session adds to, with its count and seconds."""
+    difficulty = state.difficulty or ""
+    items = {("status", state.status, difficulty, 0): (1, 0.0)}
+    if state.status == "completed" and state.completed_at is not None:
+        items[("week", "", difficulty, _week_start(state.completed_at).toordinal())] = (1, 0.0)
+        if state.started_at is not None:
+            seconds = (_utc(state.completed_at) - _utc(state.started_at)).total_seconds()
+            if seconds >= 0:
+                items[("duration", "", difficulty, duration_bucket(seconds))] = (1, seconds)
+    return items
+
+
+class _Deltas:
+    """Counter changes collected before being written in one statement."""
+
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+        self.seconds: Counter = Counter()
+
+    def add(self, state: Optional[SessionState], sign: int) -> None:
+        if state is None:
+            return
+        for key, (count, seconds) in _contributions(state).items():
+            self.counts[key] += sign * count
+            self.seconds[key] += sign * seconds
+
+    def apply(self) -> int:
+        """Upsert the non-zero deltas; return the number of counters touched."""
+        rows = [
+            {**dict(zip(_KEY, key)), "count": self.counts[key], "total_seconds": self.seconds[key]}
+            for key in self.counts
+            if self.counts[key] or self.seconds[key]
+        ]
+        if not rows:
+            return 0
+        session = get_session()
+        table = LearningSessionAggregate.__table__
+        dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(session.get_bind().dialect.name)
+        if dialect is not None:
+            stmt = dialect.insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(_KEY),
+                set_={
+                    "count": table.c.count + stmt.excluded["count"],
+                    "total_seconds": table.c.total_seconds + stmt.excluded["total_seconds"],
+                },
+            )
+            session.execute(stmt, rows)
+        else:
+            for row in rows:
+                result = session.execute(
+                    update(table)
+                    .where(*(table.c[field] == row[field] for field in _KEY))
+                    .values(count=table.c.count + row["count"],
+                            total_seconds=table.c.total_seconds + row["total_seconds"])
+                )
+                if result.rowcount == 0:
+                    session.execute(table.insert(), row)
+        return len(rows)
+
+
+def record_transitions(transitions: Iterable[Tuple[Optional[SessionState], Optional[SessionState]]]) -> None:
+    """Apply ``(before, after)`` session states to the aggregates.
+
+    ``before`` is None for a created session and ``after`` None for a deleted
+    one. Unchanged states write nothing.
+    """
+    deltas = _Deltas()
+    for before, after in transitions:
+        if before != after:
+            deltas.add(before, -1)
+            deltas.add(after, 1)
+    deltas.apply()
+
+
+def rebuild_session_stats(batch_size: int = 1000) -> int:
+    """Recompute every aggregate from the sessions table; return sessions counted."""
+    session = get_session()
+    session.execute(delete(LearningSessionAggregate))
+    stmt = select(
+        LearningSession.status, LearningSession.difficulty, LearningSession.started_at, LearningSession.completed_at
+    ).execution_options(yield_per=batch_size)
+    deltas, total = _Deltas(), 0
+    for row in session.execute(stmt):
+        deltas.add(SessionState(*row), 1)
+        total += 1
+    deltas.apply()
+    return total
+
+
+def _median(histogram: Dict[int, int]) -> Optional[float]:
+    total = sum(histogram.values())
+    if total <= 0:
+        return None
+    rank, seen = total / 2, 0
+    for bucket in sorted(histogram):
+        count = histogram[bucket]
+        if count > 0 and seen + count >= rank:
+            low, high = _bucket_bounds(bucket)
+            return round(low + (high - low) * (rank - seen) / count, 1)
+        seen += count
+    return None
+
+
+def _time_to_complete(histogram: Dict[int, int], seconds: float) -> Dict[str, Any]:
+    count = sum(histogram.values())
+    return {
+        "count": count,
+        "mean_seconds": round(seconds / count, 1) if count else None,
+        "median_seconds": _median(histogram),
+    }
+
+
+def _group(status_counts: Dict[str, int], histogram: Dict[int, int], seconds: float) -> Dict[str, Any]:
+    total = sum(status_counts.values())
+    return {
+        "total": total,
+        "by_status": {status: count for status, count in sorted(status_counts.items()) if count},
+        "completion_rate": round(status_counts.get("completed", 0) / total, 4) if total else None,
+        "time_to_complete": _time_to_complete(histogram, seconds),
+    }
+
+
+@read_only
+def get_session_stats(weeks: int = 12) -> Dict[str, Any]:
+    """Return counts, completion times and weekly throughput from the aggregates.
+
+    Args:
+        weeks: Number of weeks of throughput, ending with the current week
+
+    Returns:
+        Overall figures plus the same figures per difficulty
+    """
+    statuses: Dict[str, Counter] = {}
+    histograms: Dict[str, Counter] = {}
+    seconds: Counter = Counter()
+    completed_weeks: Counter = Counter()
+
+    for metric, status, difficulty, bucket, count, total_seconds in get_session().execute(select(
+        LearningSessionAggregate.metric,
+        LearningSessionAggregate.status,
+        LearningSessionAggregate.difficulty,
+        LearningSessionAggregate.bucket,
+        LearningSessionAggregate.count,
+        LearningSessionAggregate.total_seconds,
+    )):
+        label = difficulty or UNSPECIFIED
+        if metric == "status":
+            statuses.setdefault(label, Counter())[status] += count
+        elif metric == "duration":
+            histograms.setdefault(label, Counter())[bucket] += count
+            seconds[label] += total_seconds
+        elif metric == "week":
+            completed_weeks[bucket] += count
+
+    this_week = _week_start(datetime.now(timezone.utc))
+    week_starts: List[date] = [this_week - timedelta(weeks=offset) for offset in range(weeks - 1, -1, -1)]
+
+    labels = sorted(label for label in set(statuses) | set(histograms) if sum(statuses.get(label, {}).values()))
+    overall = _group(
+        sum(statuses.values(), Counter()), sum(histograms.values(), Counter()), sum(seconds.values())
+    )
+    return {
+        **overall,
+        "by_difficulty": {
+            label: _group(statuses.get(label, Counter()), histograms.get(label, Counter()), seconds[label])
+            for label in labels
+        },
+        "weekly_throughput": [
+            {"week_start": start.isoformat(), "completed": completed_weeks[start.toordinal()]}
+            for start in week_starts
+        ],
+    }
@@ -1,14 +1,22 @@
 """Service layer for LearningSession operations."""
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import Row
 
 from backend.api.models.learning_session import LearningSession
-from backend.utils.db import get_session
+from backend.api.read_models import SESSION_LIST
+from backend.api.repositories.learning_session_repository import LearningSessionRepository
+from backend.api.services.learning_session_stats import SessionState, record_transitions, snapshot
+from backend.utils.db import get_session, read_only
+from backend.utils.pagination import decode_cursor, encode_cursor
 
 
 VALID_STATUSES = {"planned", "in_progress", "completed"}
+SORT_OPTIONS = ("-created_at", "created_at", "-updated_at", "updated_at", "title", "-title")
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BATCH_SIZE = 500
 
 
 def _validate_payload(payload: Dict[str, Any], partial: bool = False) -> Optional[str]:
@@ -33,48 +41,63 @@ def create_session(data: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError(error)
 
     db_session = get_session()
-    try:
-        new_session = LearningSession(
-            title=data["title"],
-            description=data.get("description"),
-            status=data.get("status", "planned"),
-            difficulty=data.get("difficulty"),
-            started_at=_parse_datetime(data.get("started_at")),
-            completed_at=_parse_datetime(data.get("completed_at")),
-        )
-        db_session.add(new_session)
-        db_session.commit()
-        db_session.refresh(new_session)
-        return new_session.to_dict()
-    except SQLAlchemyError:
-        db_session.rollback()
-        raise
-    finally:
-        db_session.close()
-
-
-def list_sessions() -> List[Dict[str, Any]]:
-    """Return all sessions ordered by creation time."""
-    db_session = get_session()
-    try:
-        records = (
-            db_session.query(LearningSession)
-            .order_by(LearningSession.created_at.desc())
-            .all()
-        )
-        return [record.to_dict() for record in records]
-    finally:
-        db_session.close()
+    new_session = LearningSession(**_new_session_values(data))
+    db_session.add(new_session)
+    db_session.flush()
+    record_transitions([(None, snapshot(new_session))])
+    return new_session.to_dict()
+
+
+def _new_session_values(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values for a new session from a validated payload."""
+    return {
+        "title": data["title"],
+        "description": data.get("description"),
+        "status": data.get("status", "planned"),
+        "difficulty": data.get("difficulty"),
+        "started_at": _parse_datetime(data.get("started_at")),
+        "completed_at": _parse_datetime(data.get("completed_at")),
+    }
+
+
+@read_only
+def list_sessions(
+    status: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    q: Optional[str] = None,
+    sort: str = "-created_at",
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Row], Optional[str]]:
+    """Return one page of sessions and the cursor of the next page (None on the last).
+
+    Sessions come back as ``SESSION_LIST`` rows, ready for ``SESSION_LIST.response``.
+    """
+    if status is not None and status not in VALID_STATUSES:
+        raise ValueError(f"Parameter 'status' must be one of {', '.join(VALID_STATUSES)}.")
+    if sort not in SORT_OPTIONS:
+        raise ValueError(f"Parameter 'sort' must be one of {', '.join(SORT_OPTIONS)}.")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"Parameter 'limit' must be between 1 and {MAX_PAGE_SIZE}.")
+
+    repository = LearningSessionRepository()
+    page = repository.search(
+        limit=limit,
+        order_by=[sort],
+        after=decode_cursor(cursor, sort, repository.keyset_types([sort])),
+        status=status,
+        difficulty=difficulty,
+        q=q,
+        columns=SESSION_LIST.columns,
+    )
+    return page.items, encode_cursor(page.after, sort)
 
 
+@read_only
 def get_session_by_id(session_id: int) -> Optional[Dict[str, Any]]:
     """Return a single session by id."""
-    db_session = get_session()
-    try:
-        record = db_session.get(LearningSession, session_id)
-        return record.to_dict() if record else None
-    finally:
-        db_session.close()
+    record = get_session().get(LearningSession, session_id)
+    return record.to_dict() if record else None
 
 
 def update_session(session_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -87,57 +110,211 @@ def update_session(session_id: int, data: Dict[str, Any]) -> Optional[Dict[str,
         raise ValueError(error)
 
     db_session = get_session()
-    try:
-        record = db_session.get(LearningSession, session_id)
-        if not record:
-            return None
+    record = db_session.get(LearningSession, session_id)
+    if not record:
+        return None
 
-        for field in ["title", "description", "status", "difficulty"]:
-            if field in data:
-                setattr(record, field, data[field])
+    before = snapshot(record)
+    _apply_changes(record, _changed_values(data))
+    db_session.flush()
+    record_transitions([(before, snapshot(record))])
+    return record.to_dict()
 
-        if "started_at" in data:
-            record.started_at = _parse_datetime(data["started_at"])
-        if "completed_at" in data:
-            record.completed_at = _parse_datetime(data["completed_at"])
 
-        record.updated_at = datetime.now(timezone.utc)
+def _changed_values(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values to change from a validated partial payload."""
+    values = {field: data[field] for field in ("title", "description", "status", "difficulty") if field in data}
+    for field in ("started_at", "completed_at"):
+        if field in data:
+            values[field] = _parse_datetime(data[field])
+    return values
 
-        db_session.commit()
-        db_session.refresh(record)
-        return record.to_dict()
-    except (SQLAlchemyError, ValueError):
-        db_session.rollback()
-        raise
-    finally:
-        db_session.close()
+
+def _apply_changes(record: LearningSession, values: Dict[str, Any]) -> None:
+    for field, value in values.items():
+        setattr(record, field, value)
+    record.updated_at = datetime.now(timezone.utc)
 
 
 def delete_session(session_id: int) -> bool:
     """Delete a session by id."""
     db_session = get_session()
-    try:
-        record = db_session.get(LearningSession, session_id)
-        if not record:
-            return False
+    record = db_session.get(LearningSession, session_id)
+    if not record:
+        return False
+
+    before = snapshot(record)
+    db_session.delete(record)
+    db_session.flush()
+    record_transitions([(before, None)])
+    return True
+
+
+class BatchRejected(ValueError):
+    """An atomic batch had invalid items, so none of it was applied."""
+
+    def __init__(self, results: List[Dict[str, Any]]):
+        super().__init__("Batch rejected; no items were applied.")
+        self.results = results
+
+
+def _is_id(value: Any) -> bool:
+    # bool is an int subclass and True == 1, so it would address session 1.
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_batch(items: Any, field: str = "items") -> None:
+    if not isinstance(items, list) or not items:
+        raise ValueError(f"Field '{field}' must be a non-empty list.")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"A batch holds at most {MAX_BATCH_SIZE} items.")
+
 
-        db_session.delete(record)
-        db_session.commit()
-        return True
-    except SQLAlchemyError:
-        db_session.rollback()
-        raise
-    finally:
-        db_session.close()
+def _failure(index: int, status: int, error: str) -> Dict[str, Any]:
+    return {"index": index, "status": status, "error": error}
+
+
+def _finish_batch(results: List[Dict[str, Any]], atomic: bool) -> None:
+    failures = [result for result in results if "error" in result]
+    if atomic and failures:
+        raise BatchRejected(failures)
+
+
+def create_sessions(items: List[Dict[str, Any]], atomic: bool = True) -> List[Dict[str, Any]]:
+    """Create many sessions with one multi-row INSERT.
+
+    Every item is validated before anything is written. Results come back in
+    input order as ``{"index", "status", "data"}`` or ``{"index", "status",
+    "error"}``; with ``atomic=False`` valid items are created even if others
+    fail.
+
+    Raises:
+        ValueError: The batch itself is malformed
+        BatchRejected: ``atomic`` is set and some items are invalid
+    """
+    _check_batch(items)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    rows, indexes = [], []
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError("Each item must be an object.")
+            error = _validate_payload(item)
+            if error:
+                raise ValueError(error)
+            rows.append(_new_session_values(item))
+            indexes.append(index)
+        except ValueError as exc:
+            results[index] = _failure(index, 400, str(exc))
+    _finish_batch([result for result in results if result], atomic)
+
+    created = LearningSessionRepository().bulk_create(rows, returning=True)
+    record_transitions((None, snapshot(record)) for record in created)
+    for index, record in zip(indexes, created):
+        results[index] = {"index": index, "status": 201, "data": record.to_dict()}
+    return results
+
+
+def update_sessions(items: List[Dict[str, Any]], atomic: bool = True) -> List[Dict[str, Any]]:
+    """Apply partial updates to many sessions, each item naming its ``id``.
+
+    The targets are loaded with one query and the changes flushed together,
+    which batches rows changing the same columns into one executemany UPDATE.
+    Unknown ids fail with status 404.
+
+    Raises:
+        ValueError: The batch itself is malformed
+        BatchRejected: ``atomic`` is set and some items are invalid or missing
+    """
+    _check_batch(items)
+    repo = LearningSessionRepository()
+    ids = [item.get("id") for item in items if isinstance(item, dict)]
+    records = {record.id: record for record in repo.find(id__in=[i for i in ids if _is_id(i)])}
+
+    results: List[Dict[str, Any]] = []
+    changes, seen = [], set()
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict) or not _is_id(item.get("id")):
+                raise ValueError("Each item must be an object with an integer 'id'.")
+            if item["id"] in seen:
+                raise ValueError(f"Session {item['id']} appears more than once.")
+            data = {key: value for key, value in item.items() if key != "id"}
+            if not data:
+                raise ValueError("Update payload cannot be empty.")
+            error = _validate_payload(data, partial=True)
+            if error:
+                raise ValueError(error)
+            values = _changed_values(data)
+        except ValueError as exc:
+            results.append(_failure(index, 400, str(exc)))
+            continue
+        seen.add(item["id"])
+        record = records.get(item["id"])
+        if record is None:
+            results.append(_failure(index, 404, "Session not found"))
+            continue
+        changes.append((index, record, values))
+        results.append({"index": index, "status": 200})
+    _finish_batch(results, atomic)
+
+    transitions = []
+    for _, record, values in changes:
+        before = snapshot(record)
+        _apply_changes(record, values)
+        transitions.append((before, snapshot(record)))
+    repo.session.flush()
+    record_transitions(transitions)
+    for index, record, _ in changes:
+        results[index]["data"] = record.to_dict()
+    return results
+
+
+def delete_sessions(ids: List[Any], atomic: bool = True) -> List[Dict[str, Any]]:
+    """Delete many sessions with one DELETE; unknown ids fail with status 404.
+
+    The deleted sessions' states are read in the same query that checks the
+    ids exist, so the statistics can be updated without reloading them.
+
+    Raises:
+        ValueError: The batch itself is malformed
+        BatchRejected: ``atomic`` is set and some ids are invalid or missing
+    """
+    _check_batch(ids, "ids")
+    repo = LearningSessionRepository()
+    wanted = [session_id for session_id in ids if _is_id(session_id)]
+    found = {
+        row.id: SessionState(row.status, row.difficulty, row.started_at, row.completed_at)
+        for row in repo.find(id__in=wanted, columns=("id", "status", "difficulty", "started_at", "completed_at"))
+    }
+
+    results = []
+    for index, session_id in enumerate(ids):
+        if not _is_id(session_id):
+            results.append(_failure(index, 400, "Ids must be integers."))
+        elif session_id not in found:
+            results.append(_failure(index, 404, "Session not found"))
+        else:
+            results.append({"index": index, "status": 204, "id": session_id})
+    _finish_batch(results, atomic)
+
+    if found:
+        repo.delete_where(id__in=list(found))
+        record_transitions((state, None) for state in found.values())
+    return results
 
 
 def _parse_datetime(value: Any) -> Optional[datetime]:
-    """Convert ISO strings to datetime objects."""
+    """Convert ISO strings to datetime objects, with offsets normalised to UTC.
+
+    SQLite drops the offset on write, so a value kept in another zone would
+    read back as a different instant than the statistics counted.
+    """
     if value in (None, ""):
         return None
-    if isinstance(value, datetime):
-        return value
-    try:
-        return datetime.fromisoformat(value)
-    except (ValueError, TypeError):
-        raise ValueError("Datetime fields must be ISO formatted strings.")
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(value)
+        except (ValueError, TypeError):
+            raise ValueError("Datetime fields must be ISO formatted strings.")
+    return value.astimezone(timezone.utc) if value.tzinfo is not None else value
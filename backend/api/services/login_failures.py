@@ -0,0 +1,135 @@
+"""Sliding-window login failure tracking keyed by username and client IP."""
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app
+
+from backend.utils.metrics import LOGIN_FAILURE_REJECTIONS
+
+
+class MemoryFailureStore:
+    """Per-worker sliding-window counters.
+
+    Each key keeps only the current and previous fixed window, so recording and
+    reading a count are O(1) regardless of how many failures occurred.
+    """
+
+    def __init__(self, window: int, max_keys: int = 100_000):
+        self.window = window
+        self.max_keys = max_keys
+        self._buckets: Dict[str, List[int]] = {}
+
+    def _bucket(self, key: str, index: int) -> List[int]:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                # Evict the oldest key so sprayed usernames/IPs cannot grow memory unbounded.
+                self._buckets.pop(next(iter(self._buckets)))
+            bucket = self._buckets[key] = [index, 0, 0]
+        elif bucket[0] != index:
+            bucket[1] = bucket[2] if bucket[0] == index - 1 else 0
+            bucket[2] = 0
+            bucket[0] = index
+        return bucket
+
+    def incr(self, key: str, now: float) -> None:
+        self._bucket(key, int(now // self.window))[2] += 1
+
+    def get(self, key: str, now: float) -> Tuple[int, int]:
+        """Return (previous window count, current window count)."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return 0, 0
+        index = int(now // self.window)
+        if bucket[0] == index:
+            return bucket[1], bucket[2]
+        if bucket[0] == index - 1:
+            return bucket[2], 0
+        return 0, 0
+
+    def reset(self, key: str) -> None:
+        self._buckets.pop(key, None)
+
+
+class RedisFailureStore:
+    """Sliding-window counters shared by all workers through Redis."""
+
+    def __init__(self, url: str, window: int):
+        import redis
+
+        self.window = window
+        self._client = redis.Redis.from_url(url)
+
+    def _key(self, key: str, index: int) -> str:
+        return f"login-failures:{key}:{index}"
+
+    def incr(self, key: str, now: float) -> None:
+        redis_key = self._key(key, int(now // self.window))
+        pipe = self._client.pipeline()
+        pipe.incr(redis_key)
+        pipe.expire(redis_key, self.window * 2)
+        pipe.execute()
+
+    def get(self, key: str, now: float) -> Tuple[int, int]:
+        index = int(now // self.window)
+        previous, current = self._client.mget(self._key(key, index - 1), self._key(key, index))
+        return int(previous or 0), int(current or 0)
+
+    def reset(self, key: str) -> None:
+        index = int(time.time() // self.window)
+        self._client.delete(self._key(key, index - 1), self._key(key, index))
+
+
+class LoginFailureTracker:
+    """Counts failed logins per username and per IP over a sliding window."""
+
+    def __init__(self, store, window: int):
+        self.store = store
+        self.window = window
+
+    def _count(self, key: str, now: float) -> int:
+        previous, current = self.store.get(key, now)
+        # Weight the previous window by how much of it still overlaps the sliding window.
+        overlap = 1 - (now % self.window) / self.window
+        return math.floor(previous * overlap + current)
+
+    def counts(self, username: str, remote_addr: Optional[str]) -> Tuple[int, int]:
+        """Return (username failures, IP failures) within the window."""
+        now = time.time()
+        return self._count(f"user:{username.lower()}", now), self._count(f"ip:{remote_addr}", now)
+
+    def record_failure(self, username: str, remote_addr: Optional[str]) -> None:
+        now = time.time()
+        self.store.incr(f"user:{username.lower()}", now)
+        self.store.incr(f"ip:{remote_addr}", now)
+
+    def reset(self, username: str) -> None:
+        """Clear a username's failures after a successful login."""
+        self.store.reset(f"user:{username.lower()}")
+
+
+def get_failure_tracker() -> LoginFailureTracker:
+    """Return the login failure tracker bound to the current app."""
+    tracker = current_app.extensions.get("login_failures")
+    if tracker is None:
+        window = current_app.config.get("LOGIN_FAILURE_WINDOW", 900)
+        storage_url = current_app.config.get("LOGIN_FAILURE_STORAGE_URL", "memory://")
+        if storage_url.startswith("redis"):
+            store = RedisFailureStore(storage_url, window)
+        else:
+            store = MemoryFailureStore(window)
+        tracker = LoginFailureTracker(store, window)
+        current_app.extensions["login_failures"] = tracker
+    return tracker
+
+
+def login_blocked(user_failures: int, ip_failures: int) -> bool:
+    """Return True when either counter has reached its blocking threshold."""
+    blocked = (
+        user_failures >= current_app.config.get("LOGIN_FAILURE_BLOCK_USER", 10)
+        or ip_failures >= current_app.config.get("LOGIN_FAILURE_BLOCK_IP", 50)
+    )
+    if blocked:
+        LOGIN_FAILURE_REJECTIONS.inc()
+    return blocked
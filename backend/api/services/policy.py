@@ -1,37 +1,392 @@
-"""Simple rule-based policy evaluation."""
-from datetime import datetime
-from typing import Dict, List, Tuple
+"""Declarative rule-based policy evaluation.
 
-from backend.api.models import PolicyDecision
-from backend.utils.db import get_session
+Rules are loaded from ``POLICY_RULES_FILE`` (JSON) or fall back to
+``DEFAULT_RULES``. Each rule names a decision and the conditions under which it
+fires, for example::
+
+    {"id": "after_hours", "decision": "challenge", "when": {"hours": [0, 1, 23]}, "evidence": ["hour"]}
+
+Supported conditions: ``actions`` (exact names or ``prefix.*``), ``actors``,
+``roles``, ``hours``, ``risk_min``, ``risk_max`` and ``ip_ranges`` (CIDRs).
+Rules are compiled once into per-action closure chains and decisions are
+memoised per (action, role, hour, risk bucket), so evaluation cost does not
+grow with the size of the rule set.
+"""
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime, timezone
+import atexit
+import hashlib
+import ipaddress
+import json
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend.api.models import PolicyDecision, PolicyDecisionRollup
+from backend.utils.db import get_engine, get_session
+from backend.utils.metrics import POLICY_DECISIONS_RECORDED
+
+DECISION_PRECEDENCE = {"allow": 0, "challenge": 1, "deny": 2}
+
+CONDITION_KEYS = {"actions", "actors", "roles", "hours", "risk_min", "risk_max", "ip_ranges"}
+
+DEFAULT_RULES: List[dict] = [
+    {
+        "id": "after_hours",
+        "decision": "challenge",
+        "when": {"hours": [0, 1, 2, 3, 4, 5, 23]},
+        "evidence": ["hour"],
+    },
+    {"id": "high_risk_score", "decision": "deny", "when": {"risk_min": 70}},
+    {"id": "medium_risk_score", "decision": "challenge", "when": {"risk_min": 40, "risk_max": 69}},
+]
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_types(rule: dict) -> None:
+    """Reject conditions whose values would fail at evaluation time."""
+    rule_id = rule.get("id")
+    when = rule.get("when", {})
+    if not isinstance(when, dict):
+        raise ValueError(f"Rule '{rule_id}' has a 'when' that is not an object")
+    for key in ("actions", "actors", "roles", "ip_ranges"):
+        values = when.get(key, [])
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"Rule '{rule_id}' condition '{key}' must be a list of strings")
+    hours = when.get("hours", [])
+    if not isinstance(hours, list) or not all(
+        isinstance(hour, int) and not isinstance(hour, bool) and 0 <= hour <= 23 for hour in hours
+    ):
+        raise ValueError(f"Rule '{rule_id}' condition 'hours' must be a list of integers from 0 to 23")
+    for key in ("risk_min", "risk_max"):
+        if key in when and not _is_number(when[key]):
+            raise ValueError(f"Rule '{rule_id}' condition '{key}' must be a number")
+    evidence = rule.get("evidence", [])
+    if not isinstance(evidence, list) or not all(isinstance(field, str) for field in evidence):
+        raise ValueError(f"Rule '{rule_id}' evidence must be a list of field names")
+
+
+def _compile_rule(rule: dict) -> Callable[[dict], bool]:
+    """Build a closure that tests only the conditions the rule declares.
+
+    Raises:
+        ValueError: The rule is malformed
+    """
+    if not isinstance(rule, dict) or not isinstance(rule.get("id"), str):
+        raise ValueError(f"Policy rules must be objects with a string 'id', got {rule!r}")
+    _check_types(rule)
+    when = rule.get("when", {})
+    unknown = set(when) - CONDITION_KEYS
+    if unknown:
+        raise ValueError(f"Rule '{rule.get('id')}' has unknown conditions: {', '.join(sorted(unknown))}")
+    if rule.get("decision") not in DECISION_PRECEDENCE:
+        raise ValueError(f"Rule '{rule.get('id')}' has invalid decision '{rule.get('decision')}'")
+
+    checks: List[Callable[[dict], bool]] = []
+    if "actors" in when:
+        actors = frozenset(when["actors"])
+        checks.append(lambda ctx: ctx["actor"] in actors)
+    if "roles" in when:
+        roles = frozenset(when["roles"])
+        checks.append(lambda ctx: ctx["role"] in roles)
+    if "hours" in when:
+        hours = frozenset(when["hours"])
+        checks.append(lambda ctx: ctx["hour"] in hours)
+    if "risk_min" in when:
+        risk_min = when["risk_min"]
+        checks.append(lambda ctx: ctx["risk_score"] >= risk_min)
+    if "risk_max" in when:
+        risk_max = when["risk_max"]
+        checks.append(lambda ctx: ctx["risk_score"] <= risk_max)
+    if "ip_ranges" in when:
+        networks = [ipaddress.ip_network(cidr, strict=False) for cidr in when["ip_ranges"]]
+
+        def in_ranges(ctx: dict) -> bool:
+            try:
+                address = ipaddress.ip_address(ctx.get("remote_addr") or "")
+            except ValueError:
+                return False
+            return any(address in network for network in networks)
+
+        checks.append(in_ranges)
+
+    if not checks:
+        return lambda ctx: True
+    if len(checks) == 1:
+        return checks[0]
+    return lambda ctx: all(check(ctx) for check in checks)
+
+
+class PolicyEngine:
+    """Rules compiled into per-action closure chains with memoised decisions."""
+
+    def __init__(self, rules: List[dict], memo_size: int = 4096):
+        self.rules = rules
+        self.version = hashlib.sha256(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:12]
+        self.memo_size = memo_size
+        self._memo: Dict[tuple, Tuple[str, Tuple[str, ...], Tuple[str, ...]]] = {}
+
+        # Rules without an action condition apply everywhere; the rest are indexed by action.
+        self._global: List[tuple] = []
+        self._exact: Dict[str, List[tuple]] = {}
+        self._prefixes: List[Tuple[str, tuple]] = []
+        for index, rule in enumerate(rules):
+            check = _compile_rule(rule)
+            entry = (index, rule["id"], rule["decision"], tuple(rule.get("evidence", ())), check)
+            actions = rule.get("when", {}).get("actions")
+            if actions is None:
+                self._global.append(entry)
+            for pattern in actions or ():
+                if pattern.endswith("*"):
+                    self._prefixes.append((pattern[:-1], entry))
+                else:
+                    self._exact.setdefault(pattern, []).append(entry)
+        self._chains: Dict[str, List[tuple]] = {}
+
+        # Risk thresholds split scores into buckets that no rule can tell apart.
+        thresholds = set()
+        for rule in rules:
+            when = rule.get("when", {})
+            if "risk_min" in when:
+                thresholds.add(when["risk_min"])
+            if "risk_max" in when:
+                thresholds.add(when["risk_max"] + 1)
+        self._risk_thresholds = sorted(thresholds)
+        self._keys_actor = any("actors" in rule.get("when", {}) for rule in rules)
+        self._keys_ip = any("ip_ranges" in rule.get("when", {}) for rule in rules)
+
+    def _chain(self, action: str) -> list:
+        """Return the rules that can apply to ``action``, in declaration order."""
+        chain = self._chains.get(action)
+        if chain is None:
+            entries = self._global + self._exact.get(action, [])
+            entries += [entry for prefix, entry in self._prefixes if action.startswith(prefix)]
+            chain = [entry[1:] for entry in sorted(entries, key=lambda entry: entry[0])]
+            self._chains[action] = chain
+        return chain
+
+    def evaluate(self, actor: str, action: str, context: Dict) -> Tuple[str, List[str], Dict]:
+        """Return (decision, rules, evidence). Decisions: allow, deny, challenge."""
+        hour = context["hour"] if "hour" in context else datetime.utcnow().hour
+        risk_score = context.get("risk_score", 0)
+        role = context.get("role")
+        key = (
+            action,
+            role,
+            hour,
+            bisect_right(self._risk_thresholds, risk_score),
+            actor if self._keys_actor else None,
+            context.get("remote_addr") if self._keys_ip else None,
+        )
+
+        cached = self._memo.get(key)
+        if cached is None:
+            ctx = {
+                "actor": actor,
+                "role": role,
+                "hour": hour,
+                "risk_score": risk_score,
+                "remote_addr": context.get("remote_addr"),
+            }
+            decision = "allow"
+            triggered: List[str] = []
+            evidence_fields: List[str] = []
+            for rule_id, rule_decision, fields, matches in self._chain(action):
+                if matches(ctx):
+                    triggered.append(rule_id)
+                    evidence_fields.extend(f for f in fields if f not in evidence_fields)
+                    if DECISION_PRECEDENCE[rule_decision] > DECISION_PRECEDENCE[decision]:
+                        decision = rule_decision
+            cached = (decision, tuple(triggered), tuple(evidence_fields))
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[key] = cached
+
+        decision, triggered, evidence_fields = cached
+        if not evidence_fields:
+            return decision, list(triggered), {"risk_score": risk_score}
+        values = {"hour": hour, "role": role, "actor": actor, "remote_addr": context.get("remote_addr")}
+        evidence: Dict = {field: values[field] for field in evidence_fields if field in values}
+        evidence["risk_score"] = risk_score
+        return decision, list(triggered), evidence
+
+
+def load_rules(path: Optional[str]) -> List[dict]:
+    """Load rules from a JSON file (a list, or an object with a ``rules`` key)."""
+    if not path:
+        return DEFAULT_RULES
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    rules = data["rules"] if isinstance(data, dict) else data
+    if not isinstance(rules, list):
+        raise ValueError(f"Policy rules file {path} must hold a list of rules")
+    return rules
+
+
+def get_policy_engine() -> PolicyEngine:
+    """Return the app's policy engine, reloading the rules file when it changes."""
+    state = current_app.extensions.get("policy_engine")
+    path = current_app.config.get("POLICY_RULES_FILE") or None
+    now = time.monotonic()
+
+    if state is None or (path and now >= state["check_at"]):
+        try:
+            mtime = os.path.getmtime(path) if path else None
+            engine = None
+            if state is None or mtime != state["mtime"]:
+                engine = PolicyEngine(load_rules(path))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            if state is None:
+                raise
+            current_app.logger.error("Keeping policy rules %s; reload failed: %s", state["engine"].version, exc)
+        else:
+            if engine is not None:
+                if state is not None:
+                    current_app.logger.info("Reloaded policy rules %s from %s", engine.version, path)
+                state = {"engine": engine, "mtime": mtime}
+        state["check_at"] = now + current_app.config.get("POLICY_RELOAD_INTERVAL", 5)
+        current_app.extensions["policy_engine"] = state
+
+    return state["engine"]
 
 
 def evaluate_action(actor: str, action: str, context: Dict) -> Tuple[str, List[str], Dict]:
     """Return (decision, rules, evidence). Decisions: allow, deny, challenge."""
-    rules_triggered: List[str] = []
-    evidence: Dict = {}
-    decision = "allow"
+    return get_policy_engine().evaluate(actor, action, context)
+
+
+class DecisionAggregator:
+    """Buffers decisions as per-minute counters and upserts them in batches.
 
-    hour = datetime.utcnow().hour
-    if hour < 6 or hour > 22:
-        rules_triggered.append("after_hours")
-        decision = "challenge"
-        evidence["hour"] = hour
+    Counters are kept per rule set version, so a minute that spans a rules
+    reload does not mix decisions made under different rules.
+    """
 
-    risk_score = context.get("risk_score", 0)
-    evidence["risk_score"] = risk_score
-    if risk_score >= 70:
-        rules_triggered.append("high_risk_score")
-        decision = "deny"
-    elif risk_score >= 40 and decision != "deny":
-        rules_triggered.append("medium_risk_score")
-        decision = "challenge"
+    def __init__(self, engine, flush_interval: float, max_pending: int):
+        self._engine = engine
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+        self._flush_at = time.monotonic() + flush_interval
+        atexit.register(self.flush)
 
-    return decision, rules_triggered, evidence
+    def record(self, action: str, decision: str, rules: str, rules_version: str = "") -> None:
+        bucket = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        with self._lock:
+            self._pending[(bucket, rules_version, action, decision, rules)] += 1
+
+    def flush_due(self) -> bool:
+        return bool(self._pending) and (
+            len(self._pending) >= self.max_pending or time.monotonic() >= self._flush_at
+        )
+
+    def flush(self) -> int:
+        """Write buffered counters in one multi-row upsert; return decisions written."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._flush_at = time.monotonic() + self.flush_interval
+        if not pending:
+            return 0
+
+        rows = [
+            {
+                "bucket_start": bucket,
+                "rules_version": rules_version,
+                "action": action,
+                "decision": decision,
+                "rules": rules,
+                "count": count,
+            }
+            for (bucket, rules_version, action, decision, rules), count in pending.items()
+        ]
+        table = PolicyDecisionRollup.__table__
+        try:
+            with self._engine.begin() as conn:
+                dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(conn.dialect.name)
+                if dialect is not None:
+                    stmt = dialect.insert(table)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["bucket_start", "rules_version", "action", "decision", "rules"],
+                        set_={"count": table.c.count + stmt.excluded["count"]},
+                    )
+                    conn.execute(stmt, rows)
+                else:
+                    for row in rows:
+                        result = conn.execute(
+                            update(table)
+                            .where(
+                                table.c.bucket_start == row["bucket_start"],
+                                table.c.rules_version == row["rules_version"],
+                                table.c.action == row["action"],
+                                table.c.decision == row["decision"],
+                                table.c.rules == row["rules"],
+                            )
+                            .values(count=table.c.count + row["count"])
+                        )
+                        if result.rowcount == 0:
+                            conn.execute(table.insert(), row)
+        except Exception:
+            # Keep the counts for the next attempt rather than losing them.
+            with self._lock:
+                self._pending.update(pending)
+            raise
+
+        return sum(pending.values())
+
+
+def get_decision_aggregator() -> DecisionAggregator:
+    """Return the policy decision aggregator bound to the current app."""
+    aggregator = current_app.extensions.get("policy_decision_aggregator")
+    if aggregator is None:
+        aggregator = DecisionAggregator(
+            get_engine(),
+            flush_interval=current_app.config.get("POLICY_ROLLUP_FLUSH_INTERVAL", 10),
+            max_pending=current_app.config.get("POLICY_ROLLUP_MAX_PENDING", 500),
+        )
+        current_app.extensions["policy_decision_aggregator"] = aggregator
+    return aggregator
+
+
+def flush_decision_rollups(exception=None) -> None:
+    """Flush buffered decision counters when due; registered as a teardown hook."""
+    aggregator = current_app.extensions.get("policy_decision_aggregator")
+    if aggregator is None or not aggregator.flush_due():
+        return
+    try:
+        aggregator.flush()
+    except Exception as exc:
+        current_app.logger.warning("Failed to flush policy decision rollups: %s", exc)
 
 
 def persist_decision(actor: str, action: str, decision: str, rules: List[str], evidence: Dict) -> None:
-    """Store policy decision for auditability."""
+    """Store policy decision for auditability.
+
+    In ``aggregate`` recording mode, allow decisions only increment per-minute
+    counters; ``POLICY_ALLOW_SAMPLE_RATE`` of them are also stored in full.
+
+    Deny and challenge decisions end in a 4xx response, which the request's
+    unit of work rolls back, so they are committed here.
+    """
+    if decision == "allow" and current_app.config.get("POLICY_DECISION_RECORDING", "full") == "aggregate":
+        get_decision_aggregator().record(
+            action, decision, ",".join(rules) if rules else "", get_policy_engine().version
+        )
+        if random.random() >= current_app.config.get("POLICY_ALLOW_SAMPLE_RATE", 0.0):
+            POLICY_DECISIONS_RECORDED.labels(mode="aggregated").inc()
+            return
+
+    POLICY_DECISIONS_RECORDED.labels(mode="full").inc()
     session = get_session()
     record = PolicyDecision(
         actor=actor,
@@ -41,4 +396,7 @@ def persist_decision(actor: str, action: str, decision: str, rules: List[str], e
         evidence=str(evidence) if evidence else "",
     )
     session.add(record)
-    session.commit()
+    if decision == "allow":
+        session.flush()
+    else:
+        session.commit()
@@ -0,0 +1,206 @@
+"""Table retention: chunked purges of rows older than their configured TTL.
+
+Rows are deleted in small primary-key-ordered chunks, each in its own short
+transaction with a pause in between, so a purge never holds long locks or
+produces one huge WAL burst. The scheduler thread starts in every worker, but
+only the worker holding a cluster-wide lock (a PostgreSQL advisory lock, or a
+file lock on other databases) purges. That worker keeps the lock as a leader
+lease for as long as it lives; the others retry it every interval and take
+over when the leader exits or loses its database connection.
+"""
+from datetime import datetime, timedelta, timezone
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from flask import Flask, current_app
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.exc import DBAPIError
+
+from backend.api.models import AuthChallenge, DeploymentLog, PolicyDecision, PolicyDecisionRollup, RegistrationRequest
+from backend.utils.db import get_engine
+from backend.utils.metrics import RETENTION_LAG_SECONDS, RETENTION_ROWS_PURGED
+
+# Arbitrary constant identifying the retention run in pg_try_advisory_lock.
+ADVISORY_LOCK_KEY = 0x5245544E
+
+# table name -> (model, age column, extra filter or None)
+RETENTION_TARGETS = {
+    "auth_challenges": (AuthChallenge, AuthChallenge.expires_at, None),
+    "policy_decisions": (PolicyDecision, PolicyDecision.created_at, None),
+    "policy_decision_rollups": (PolicyDecisionRollup, PolicyDecisionRollup.bucket_start, None),
+    "deployment_logs": (DeploymentLog, DeploymentLog.timestamp, None),
+    "registration_requests": (
+        RegistrationRequest,
+        RegistrationRequest.reviewed_at,
+        RegistrationRequest.status != "pending",
+    ),
+}
+
+
+def _naive_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def purge_table(
+    table: str,
+    ttl_days: float,
+    chunk_size: int = 500,
+    chunk_sleep: float = 0.1,
+    max_chunks: Optional[int] = None,
+) -> int:
+    """Delete rows of ``table`` older than ``ttl_days`` in chunks; return rows deleted."""
+    model, column, extra = RETENTION_TARGETS[table]
+    cutoff = datetime.now(timezone.utc) - timedelta(days=ttl_days)
+    conditions = [column < cutoff] + ([extra] if extra is not None else [])
+    engine = get_engine()
+
+    deleted = 0
+    chunks = 0
+    while max_chunks is None or chunks < max_chunks:
+        with engine.begin() as conn:
+            ids = conn.execute(
+                select(model.id).where(*conditions).order_by(model.id).limit(chunk_size)
+            ).scalars().all()
+            if not ids:
+                break
+            conn.execute(delete(model).where(model.id.in_(ids)))
+        deleted += len(ids)
+        chunks += 1
+        RETENTION_ROWS_PURGED.labels(table=table).inc(len(ids))
+        if len(ids) < chunk_size:
+            break
+        time.sleep(chunk_sleep)
+
+    with engine.connect() as conn:
+        oldest = conn.execute(select(func.min(column)).where(*conditions)).scalar()
+    lag = (_naive_utc(cutoff) - _naive_utc(oldest)).total_seconds() if oldest else 0
+    RETENTION_LAG_SECONDS.labels(table=table).set(max(lag, 0))
+    return deleted
+
+
+def run_retention(policies: Dict[str, float], **options) -> Dict[str, int]:
+    """Purge every table with a configured TTL; return rows deleted per table."""
+    return {table: purge_table(table, days, **options) for table, days in policies.items()}
+
+
+def retention_policies() -> Dict[str, float]:
+    """Return configured TTLs, ignoring tables without a retention target."""
+    policies = current_app.config.get("RETENTION_POLICIES", {})
+    return {table: days for table, days in policies.items() if table in RETENTION_TARGETS}
+
+
+class RetentionLock:
+    """Non-blocking cluster-wide lock, held for one run or as a leader lease."""
+
+    def __init__(self, lock_file: str):
+        self.lock_file = lock_file
+        self._conn = None
+        self._handle = None
+
+    def acquire(self) -> bool:
+        engine = get_engine()
+        if engine.dialect.name == "postgresql":
+            # Autocommit, so the lease connection never sits idle in a transaction
+            # (which would pin it and trip idle_in_transaction_session_timeout).
+            self._conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            acquired = self._conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+            ).scalar()
+            if not acquired:
+                self._conn.close()
+                self._conn = None
+            return bool(acquired)
+
+        import fcntl
+
+        self._handle = open(self.lock_file, "a")
+        try:
+            fcntl.flock(self._handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._handle.close()
+            self._handle = None
+            return False
+        return True
+
+    def held(self) -> bool:
+        """Whether the lock is still ours; an advisory lock dies with its connection."""
+        if self._handle is not None:
+            return True
+        if self._conn is None:
+            return False
+        try:
+            self._conn.execute(text("SELECT 1"))
+        except DBAPIError:
+            self._conn.invalidate()
+            self._conn.close()
+            self._conn = None
+            return False
+        return True
+
+    def release(self) -> None:
+        if self._conn is not None:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            self._conn.close()
+            self._conn = None
+        if self._handle is not None:
+            self._handle.close()  # closing the file releases the flock
+            self._handle = None
+
+
+def _run_configured(app: Flask) -> Dict[str, int]:
+    return run_retention(
+        retention_policies(),
+        chunk_size=app.config.get("RETENTION_CHUNK_SIZE", 500),
+        chunk_sleep=app.config.get("RETENTION_CHUNK_SLEEP", 0.1),
+        max_chunks=app.config.get("RETENTION_MAX_CHUNKS_PER_RUN", 200),
+    )
+
+
+def run_scheduled_retention(app: Flask) -> Optional[Dict[str, int]]:
+    """Run one retention pass if no other process holds the lock; return results or None."""
+    with app.app_context():
+        lock = RetentionLock(app.config["RETENTION_LOCK_FILE"])
+        if not lock.acquire():
+            return None
+        try:
+            return _run_configured(app)
+        finally:
+            lock.release()
+
+
+def run_retention_as_leader(app: Flask, lock: RetentionLock) -> Optional[Dict[str, int]]:
+    """Run a retention pass if this process holds, or can take, the leader lease.
+
+    The lease is kept after the run, so one process purges per interval no
+    matter how many workers call this.
+    """
+    with app.app_context():
+        if not lock.held() and not lock.acquire():
+            return None
+        return _run_configured(app)
+
+
+def start_retention_scheduler(app: Flask) -> None:
+    """Start this process's retention thread once; safe to call on every request."""
+    pid, _ = app.extensions.get("retention_scheduler", (None, None))
+    if pid == os.getpid():
+        return
+
+    interval = app.config.get("RETENTION_INTERVAL", 3600)
+    lock = RetentionLock(app.config["RETENTION_LOCK_FILE"])
+
+    def loop() -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                results = run_retention_as_leader(app, lock)
+                if results:
+                    app.logger.info("Retention purge finished: %s", results)
+            except Exception as exc:
+                app.logger.error("Retention purge failed: %s", exc, exc_info=True)
+
+    thread = threading.Thread(target=loop, name="retention-scheduler", daemon=True)
+    app.extensions["retention_scheduler"] = (os.getpid(), thread)
+    thread.start()
@@ -8,10 +8,20 @@ import pyotp
 
 from backend.api.models import AdminUser, AuthChallenge
 from backend.utils.db import get_session
+from backend.utils.ipreputation import get_ip_reputation
 
 
 def calculate_risk(remote_addr: Optional[str], failures: int = 0) -> int:
-    """Basic risk: more failures and off-hours raise score."""
+    """Basic risk: more failures and off-hours raise score.
+
+    The client address is classified against the configured IP ranges: blocked
+    ranges score 100, trusted ranges lower the score and scored ranges add
+    their own adjustment.
+    """
+    reputation = get_ip_reputation().classify(remote_addr)
+    if reputation.label == "blocked":
+        return 100
+
     score = 10
     hour = datetime.utcnow().hour
     if hour < 6 or hour > 22:
@@ -21,13 +31,15 @@ def calculate_risk(remote_addr: Optional[str], failures: int = 0) -> int:
         score += 40
     if failures >= 5:
         score += 60
-    if remote_addr and remote_addr.startswith("10."):
-        score -= 10  # internal network slightly safer
+    score += reputation.score
     return max(0, min(score, 100))
 
 
 def issue_totp_challenge(username: str, risk_score: int) -> AuthChallenge:
-    """Create a TOTP challenge record (code is validated via authenticator)."""
+    """Create a TOTP challenge record (code is validated via authenticator).
+
+    Committed immediately: the login answers 409, which rolls the request back.
+    """
     session = get_session()
     # TOTP codes are verified dynamically; store placeholder hash for audit
     dummy_code = secrets.token_hex(8)
@@ -41,7 +53,6 @@ def issue_totp_challenge(username: str, risk_score: int) -> AuthChallenge:
     )
     session.add(challenge)
     session.commit()
-    session.refresh(challenge)
     return challenge
 
 
@@ -0,0 +1,49 @@
+"""Benchmark IP reputation lookups against large range lists.
+
+Usage: python -m backend.benchmarks.ip_reputation [--ranges 300000] [--lookups 200000]
+"""
+import argparse
+import ipaddress
+import random
+import time
+
+from backend.utils.ipreputation import BLOCKED, IPClass, IPReputation
+
+
+def _random_ranges(count: int, rng: random.Random):
+    for i in range(count):
+        if i % 10 == 0:
+            network = ipaddress.IPv6Network((rng.getrandbits(48) << 80, 48))
+        else:
+            network = ipaddress.IPv4Network((rng.getrandbits(24) << 8, rng.choice((16, 20, 24, 24, 28))), strict=False)
+        yield str(network), BLOCKED if i % 3 else IPClass("scored", 30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ranges", type=int, default=300_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ranges = list(_random_ranges(args.ranges, rng))
+
+    start = time.perf_counter()
+    reputation = IPReputation(ranges)
+    build_s = time.perf_counter() - start
+
+    v4 = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(args.lookups)]
+    v6 = [str(ipaddress.IPv6Address(rng.getrandbits(128))) for _ in range(args.lookups // 10)]
+
+    print(f"ranges={reputation.size} build={build_s:.2f}s trie_memory={reputation.nbytes / 1e6:.1f}MB")
+    for name, addresses in (("ipv4", v4), ("ipv6", v6)):
+        start = time.perf_counter()
+        for address in addresses:
+            reputation.classify(address)
+        per_lookup_us = (time.perf_counter() - start) / len(addresses) * 1e6
+        print(f"{name}: {len(addresses)} lookups, {per_lookup_us:.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark list endpoint serialization: ORM entities + to_dict versus read models.
+
+Usage: python -m backend.benchmarks.list_serialization [--rows 10000] [--repeat 5] [--database-url sqlite:///...]
+
+Seeds --rows learning sessions and pipelines, then serializes every row to a
+JSON array of objects, both ways:
+
+- orm: query entities, call to_dict() per row and json.dumps the list (what
+  the list endpoints did);
+- read model: select plain tuples with Core and write JSON from them through
+  backend.api.read_models.
+
+Timings include the SELECT; the best of --repeat runs is reported as rows per
+second. Each ORM run uses a fresh session so entities are hydrated every time.
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+import json
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from backend.api.models import LearningSession, Pipeline
+from backend.api.read_models import PIPELINE_LIST, SESSION_LIST
+from backend.utils.db import Base
+
+
+def _seed(engine, rows: int) -> None:
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with Session(engine) as session:
+        session.execute(insert(LearningSession), [
+            {
+                "title": f"Session {i}",
+                "description": "Practice set " * 4,
+                "status": ("planned", "in_progress", "completed")[i % 3],
+                "difficulty": ("easy", "medium", "hard")[i % 3],
+                "started_at": started + timedelta(minutes=i),
+                "completed_at": started + timedelta(minutes=i + 45) if i % 3 == 2 else None,
+            }
+            for i in range(rows)
+        ])
+        session.execute(insert(Pipeline), [
+            {
+                "name": f"build-{i}",
+                "owner": "bench",
+                "status": "success",
+                "duration_minutes": 3.5,
+                "branch": "main",
+                "commit_sha": f"{i:040x}",
+                "commit_message": "Bump dependencies",
+                "run_id": str(i),
+                "run_number": i,
+            }
+            for i in range(rows)
+        ])
+        session.commit()
+
+
+def _best(repeat: int, run) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine, tables=[LearningSession.__table__, Pipeline.__table__])
+        _seed(engine, args.rows)
+        print(f"{args.rows} rows on {engine.dialect.name}")
+
+        for label, model, read_model in (("sessions", LearningSession, SESSION_LIST),
+                                         ("pipelines", Pipeline, PIPELINE_LIST)):
+            def orm():
+                with Session(engine) as session:
+                    json.dumps([record.to_dict() for record in session.query(model).order_by(model.id)])
+
+            def columnar():
+                with Session(engine) as session:
+                    read_model.dumps(session.execute(read_model.select().order_by(model.id)).all())
+
+            orm_seconds = _best(args.repeat, orm)
+            columnar_seconds = _best(args.repeat, columnar)
+            print(f"  {label:10} orm {args.rows / orm_seconds:10,.0f} rows/s   "
+                  f"read model {args.rows / columnar_seconds:10,.0f} rows/s   "
+                  f"x{orm_seconds / columnar_seconds:.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark rate limit storage overhead per hit: memory://, mmap:// and Redis.
+
+Usage: python -m backend.benchmarks.ratelimit_storage [--hits 50000] [--redis-url redis://localhost:6379/15]
+
+Redis is skipped when it cannot be reached.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+import backend.utils.ratelimit_storage  # noqa: F401  (registers mmap://)
+
+
+def _bench(uri: str, hits: int, keys: int) -> dict:
+    storage = storage_from_string(uri)
+    storage.check()
+    item = parse("1000000/hour")
+    results = {}
+    for strategy in (FixedWindowRateLimiter, SlidingWindowCounterRateLimiter):
+        limiter = strategy(storage)
+        start = time.perf_counter()
+        for i in range(hits):
+            limiter.hit(item, "bench", str(i % keys))
+        results[strategy.__name__] = (time.perf_counter() - start) / hits * 1e6
+    storage.reset()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hits", type=int, default=50_000)
+    parser.add_argument("--keys", type=int, default=1_000, help="Distinct client keys")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379/15"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [("memory://", "memory://"), ("mmap://", f"mmap://{tmp}/ratelimit.bin"), ("redis", args.redis_url)]
+        for name, uri in backends:
+            try:
+                results = _bench(uri, args.hits, args.keys)
+            except Exception as exc:  # noqa: BLE001 - report and continue with other backends
+                print(f"{name:<10} skipped: {exc}")
+                continue
+            print(f"{name:<10} " + "  ".join(f"{k}: {v:6.2f} us/hit" for k, v in results.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark BaseRepository bulk operations against per-entity loops.
+
+Usage: python -m backend.benchmarks.repository_bulk [--rows 10000] [--database-url sqlite:///...]
+
+Each operation runs on --rows pipelines in one transaction, on an emptied table:
+create() per row versus bulk_create(), update() per row versus bulk_update(),
+delete() per row versus delete_where(), and an upsert of every row. The
+statement count is cursor executions (round trips) from
+backend.utils.query_stats; an executemany counts once. Defaults to a temporary
+SQLite file; pass a PostgreSQL URL to measure network round trips. The
+benchmark deletes every pipeline between operations, so it refuses a database
+whose pipelines table already holds rows, and drops the table afterwards only
+if it created it.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, delete, func, inspect, select
+from sqlalchemy.orm import Session
+
+from backend.api.models import Pipeline
+from backend.api.repositories import BaseRepository
+from backend.utils.db import Base
+from backend.utils.query_stats import collect_queries
+
+
+def _rows(count: int, tag: str):
+    return [{"name": f"{tag}-{i}", "owner": "bench", "run_id": f"{tag}-{i}"} for i in range(count)]
+
+
+def _prepare(engine) -> bool:
+    """Make sure the pipelines table exists and is empty; return whether it was created."""
+    if not inspect(engine).has_table(Pipeline.__tablename__):
+        Base.metadata.create_all(bind=engine, tables=[Pipeline.__table__])
+        return True
+    with Session(engine) as session:
+        if session.scalar(select(func.count()).select_from(Pipeline)):
+            raise SystemExit(f"{engine.url!r} already has pipelines; point --database-url at a scratch database.")
+    return False
+
+
+def _measure(engine, label: str, setup, operation) -> None:
+    # Seeded entities stay loaded across the setup commit so loops do not re-select them.
+    with Session(engine, expire_on_commit=False) as session:
+        session.execute(delete(Pipeline))
+        repo = BaseRepository(Pipeline, session)
+        state = setup(repo)
+        session.commit()
+        with collect_queries() as stats:
+            started = time.perf_counter()
+            operation(repo, state)
+            session.commit()
+            elapsed = time.perf_counter() - started
+    print(f"  {label:28} {elapsed * 1000:9.1f} ms  {stats.count:6d} statements")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+    rows = args.rows
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        created = _prepare(engine)
+
+        def seeded(repo):
+            return repo.bulk_create(_rows(rows, "seed"), returning=True)
+
+        print(f"{rows} rows on {engine.dialect.name}")
+        _measure(engine, "create() loop", lambda repo: None,
+                 lambda repo, _: [repo.create(**row) for row in _rows(rows, "loop")])
+        _measure(engine, "bulk_create()", lambda repo: None,
+                 lambda repo, _: repo.bulk_create(_rows(rows, "bulk")))
+        _measure(engine, "update() loop", seeded,
+                 lambda repo, pipelines: [repo.update(p, status="success") for p in pipelines])
+        _measure(engine, "bulk_update()", seeded,
+                 lambda repo, pipelines: repo.bulk_update([{"id": p.id, "status": "success"} for p in pipelines]))
+        _measure(engine, "upsert() all conflicting", seeded,
+                 lambda repo, _: repo.upsert(_rows(rows, "seed"), conflict_keys=["run_id"], update_fields=["owner"]))
+        _measure(engine, "delete() loop", seeded,
+                 lambda repo, pipelines: [repo.delete(p) for p in pipelines])
+        _measure(engine, "delete_where()", seeded,
+                 lambda repo, _: repo.delete_where(owner="bench"))
+        _measure(engine, "count() > 0 x1000", seeded,
+                 lambda repo, _: [repo.count(owner="bench") > 0 for _ in range(1000)])
+        _measure(engine, "exists() x1000", seeded,
+                 lambda repo, _: [repo.exists(owner="bench") for _ in range(1000)])
+        with Session(engine) as session:
+            session.execute(delete(Pipeline))
+            session.commit()
+        if created:
+            Base.metadata.drop_all(bind=engine, tables=[Pipeline.__table__])
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark SQLite write contention across worker processes, with and without the profile.
+
+Usage: python -m backend.benchmarks.sqlite_contention [--workers 4] [--transactions 300]
+
+Each worker process mimics a request that reads and then writes in one
+transaction. Reported are committed transactions per second and how many
+failed with "database is locked".
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from flask import Flask
+from sqlalchemy import exc, text
+
+from backend.utils.db import _create_engine
+
+
+def _worker(db_path: str, profile: bool, transactions: int, results) -> None:
+    app = Flask(__name__)
+    # Without the profile, keep the driver's 5s default timeout like a stock install.
+    app.config.update(SQLITE_PROFILE_ENABLED=profile, DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0)
+    engine = _create_engine(app, f"sqlite:///{db_path}", "primary")
+    committed = locked = 0
+    for _ in range(transactions):
+        try:
+            with engine.begin() as connection:
+                connection.execute(text("SELECT count(*) FROM events WHERE worker = :w"), {"w": os.getpid()})
+                connection.execute(
+                    text("INSERT INTO events (worker, payload) VALUES (:w, :p)"), {"w": os.getpid(), "p": "x" * 200}
+                )
+            committed += 1
+        except exc.OperationalError as error:
+            if "locked" not in str(error):
+                raise
+            locked += 1
+    engine.dispose()
+    results.put((committed, locked))
+
+
+def _run(profile: bool, workers: int, transactions: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        app = Flask(__name__)
+        app.config.update(SQLITE_PROFILE_ENABLED=profile)
+        engine = _create_engine(app, f"sqlite:///{db_path}", "primary")
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE events (id INTEGER PRIMARY KEY, worker INTEGER, payload TEXT)"))
+        engine.dispose()
+
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        processes = [
+            context.Process(target=_worker, args=(db_path, profile, transactions, results)) for _ in range(workers)
+        ]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+    committed = sum(c for c, _ in totals)
+    locked = sum(l for _, l in totals)  # noqa: E741
+    name = "profile" if profile else "default"
+    print(f"{name:<8} committed={committed:<6} locked_errors={locked:<5} {committed / elapsed:8.0f} tx/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--transactions", type=int, default=300, help="Per worker")
+    args = parser.parse_args()
+
+    for profile in (False, True):
+        _run(profile, args.workers, args.transactions)
+
+
+if __name__ == "__main__":
+    main()
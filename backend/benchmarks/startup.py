@@ -0,0 +1,116 @@
+"""Profile worker startup: module import times, create_app time and peak RSS.
+
+Usage: python -m backend.benchmarks.startup [--config production] [--top 25]
+
+A fresh interpreter runs ``create_app`` under ``-X importtime``; its stderr is
+parsed into per-module self and cumulative import times. Reported are the
+slowest top-level imports, the optional subsystems that were loaded, the
+create_app wall time and the process's peak RSS.
+"""
+import argparse
+from dataclasses import dataclass, field
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+OPTIONAL_SUBSYSTEMS = (
+    "flasgger",
+    "flask_caching",
+    "flask_limiter",
+    "flask_talisman",
+    "prometheus_flask_exporter",
+    "pythonjsonlogger",
+    "sentry_sdk",
+)
+
+_CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+from backend.api import create_app
+create_app(sys.argv[1])
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    seconds: float
+    max_rss_kb: int
+    modules: List[str]
+    imports: List[ImportRecord] = field(default_factory=list)
+
+    def loaded(self, names=OPTIONAL_SUBSYSTEMS) -> List[str]:
+        return [name for name in names if name in self.modules]
+
+    def slowest(self, top: int) -> List[ImportRecord]:
+        roots = [record for record in self.imports if record.depth == 0]
+        return sorted(roots, key=lambda record: record.cumulative_us, reverse=True)[:top]
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse ``-X importtime`` lines: ``import time: self | cumulative | <indent>module``."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        records.append(ImportRecord(module.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def profile_startup(config_name: str = "testing", env: Dict[str, str] = None) -> StartupProfile:
+    """Run create_app in a fresh interpreter and return its startup profile."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD, config_name],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **(env or {})},
+    )
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("create_app failed:\n" + "\n".join(errors[-20:]))
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return StartupProfile(
+        seconds=report["seconds"],
+        max_rss_kb=report["max_rss_kb"],
+        modules=report["modules"],
+        imports=parse_importtime(result.stderr),
+    )
+
+
+def _format(records: List[ImportRecord]) -> List[Tuple[str, str]]:
+    return [(f"{record.cumulative_us / 1000:8.1f} ms", record.module) for record in records]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="testing")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    profile = profile_startup(args.config)
+    print(f"create_app ({args.config}): {profile.seconds * 1000:.0f} ms, peak RSS {profile.max_rss_kb / 1024:.1f} MiB")
+    print(f"optional subsystems loaded: {', '.join(profile.loaded()) or 'none'}")
+    print("slowest top-level imports (cumulative):")
+    for duration, module in _format(profile.slowest(args.top)):
+        print(f"  {duration}  {module}")
+
+
+if __name__ == "__main__":
+    main()
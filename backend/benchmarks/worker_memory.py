@@ -0,0 +1,109 @@
+"""Measure proportional set size (PSS) of gunicorn workers with and without preloading.
+
+Usage: python -m backend.benchmarks.worker_memory [--workers 4] [--requests 200]
+
+Starts gunicorn with gunicorn.conf.py against a temporary SQLite database,
+once with GUNICORN_PRELOAD=false and once with true. Once every worker has
+served requests, it reads PSS from /proc/<pid>/smaps_rollup. PSS charges a
+shared page to each process sharing it in proportion, so the total is what
+the pod really uses. Linux only.
+"""
+import argparse
+import http.client
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid: int) -> List[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as handle:
+        return [int(child) for child in handle.read().split()]
+
+
+def pss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/smaps_rollup") as handle:
+        for line in handle:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+    raise RuntimeError(f"no Pss line for pid {pid}")
+
+
+def _run(preload: bool, workers: int, requests: int) -> Dict[str, object]:
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "FLASK_ENV": "development",
+            "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+            "BOOTSTRAP_LOCK_FILE": f"{tmp}/bootstrap.lock",
+            "GUNICORN_PRELOAD": "true" if preload else "false",
+            "GUNICORN_WORKERS": str(workers),
+            "GUNICORN_BIND": f"127.0.0.1:{port}",
+            "GUNICORN_LOG_LEVEL": "warning",
+            "GUNICORN_ACCESS_LOG": "",
+            "CACHE_TYPE": "SimpleCache",
+            "RATELIMIT_ENABLED": "false",
+        }
+        master = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "backend.app:app"],
+            cwd=PROJECT_ROOT,
+            env=env,
+        )
+        try:
+            deadline = time.monotonic() + 60
+            while len(_children(master.pid)) < workers or not _healthy(port):
+                if time.monotonic() > deadline or master.poll() is not None:
+                    raise RuntimeError("gunicorn did not start")
+                time.sleep(0.2)
+            for _ in range(requests):
+                _healthy(port)
+            time.sleep(0.5)
+            worker_pss = [pss_kb(pid) for pid in _children(master.pid)]
+            return {"master": pss_kb(master.pid), "workers": worker_pss}
+        finally:
+            master.send_signal(signal.SIGTERM)
+            master.wait(timeout=30)
+
+
+def _healthy(port: int) -> bool:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+    try:
+        connection.request("GET", "/health")
+        return connection.getresponse().status == 200
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    for preload in (False, True):
+        result = _run(preload, args.workers, args.requests)
+        workers = result["workers"]
+        total = result["master"] + sum(workers)
+        print(
+            f"preload={str(preload).lower():5}  master {result['master'] / 1024:6.1f} MiB  "
+            f"worker avg {sum(workers) / len(workers) / 1024:6.1f} MiB  total {total / 1024:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
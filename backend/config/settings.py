@@ -6,6 +6,25 @@ from typing import Dict, Any
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 
+def _parse_retention_policies(raw: str) -> Dict[str, float]:
+    """Parse ``table=days`` pairs, failing with the offending entry named."""
+    policies = {}
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        table, separator, days = item.partition("=")
+        try:
+            ttl = float(days)
+        except ValueError:
+            ttl = -1.0
+        if not separator or not table.strip() or ttl < 0:
+            raise ValueError(
+                f"Invalid RETENTION_POLICIES entry {item.strip()!r}: expected table=days with days >= 0"
+            )
+        policies[table.strip()] = ttl
+    return policies
+
+
 class Config:
     """Base configuration."""
 
@@ -13,6 +32,9 @@ class Config:
     APP_NAME = "Flask CI/CD Demo"
     VERSION = "1.0.0"
 
+    # Writable per-deployment files (lock files); created at startup
+    INSTANCE_PATH = os.getenv("INSTANCE_PATH") or os.path.join(PROJECT_ROOT, "instance")
+
     # Server
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", "8000"))
@@ -23,8 +45,52 @@ class Config:
     DEFAULT_ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")
     DEFAULT_ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "change-me-now")
     AUTH_TOKEN_MAX_AGE = int(os.getenv("AUTH_TOKEN_MAX_AGE", 60 * 60 * 12))  # 12 hours
+    ADMIN_IDENTITY_CACHE_TTL = int(os.getenv("ADMIN_IDENTITY_CACHE_TTL", "30"))  # seconds, 0 disables
+    AUTH_TOKEN_MODE = os.getenv("AUTH_TOKEN_MODE", "session")  # session, stateless
+    AUTH_REVOCATION_SYNC_INTERVAL = int(os.getenv("AUTH_REVOCATION_SYNC_INTERVAL", "15"))  # seconds
     ENABLE_SELF_REGISTRATION = os.getenv("ENABLE_SELF_REGISTRATION", "false").lower() == "true"
+    REGISTRATION_BATCH_MAX = int(os.getenv("REGISTRATION_BATCH_MAX", "100"))  # decisions per batch call
+    SIGNATURE_VERIFY_THREADS = int(os.getenv("SIGNATURE_VERIFY_THREADS", "4"))
     PASSWORD_PEPPER = os.getenv("PASSWORD_PEPPER", "")
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_POOL_SIZE = int(os.getenv("PASSWORD_HASH_POOL_SIZE", "0"))  # 0 hashes inline
+    PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "8"))
+    PASSWORD_HASH_TIMEOUT = int(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))  # seconds
+    LOGIN_FAILURE_WINDOW = int(os.getenv("LOGIN_FAILURE_WINDOW", "900"))  # seconds
+    LOGIN_FAILURE_BLOCK_USER = int(os.getenv("LOGIN_FAILURE_BLOCK_USER", "10"))
+    LOGIN_FAILURE_BLOCK_IP = int(os.getenv("LOGIN_FAILURE_BLOCK_IP", "50"))
+    LOGIN_FAILURE_STORAGE_URL = os.getenv("LOGIN_FAILURE_STORAGE_URL", "memory://")  # or a redis:// URL
+    POLICY_RULES_FILE = os.getenv("POLICY_RULES_FILE", "")  # JSON rules; built-in defaults when empty
+    POLICY_RELOAD_INTERVAL = int(os.getenv("POLICY_RELOAD_INTERVAL", "5"))  # seconds between mtime checks
+    POLICY_DECISION_RECORDING = os.getenv("POLICY_DECISION_RECORDING", "full")  # full, aggregate
+    POLICY_ALLOW_SAMPLE_RATE = float(os.getenv("POLICY_ALLOW_SAMPLE_RATE", "0.0"))  # raw allow rows kept
+    POLICY_ROLLUP_FLUSH_INTERVAL = int(os.getenv("POLICY_ROLLUP_FLUSH_INTERVAL", "10"))  # seconds
+    POLICY_ROLLUP_MAX_PENDING = int(os.getenv("POLICY_ROLLUP_MAX_PENDING", "500"))  # buffered counters
+    IP_TRUSTED_CIDRS = [c.strip() for c in os.getenv(
+        "IP_TRUSTED_CIDRS", "10.0.0.0/8,172.16.0.0/12,192.168.0.0/16,127.0.0.0/8,::1/128,fc00::/7"
+    ).split(",") if c.strip()]
+    IP_BLOCKED_CIDRS = [c.strip() for c in os.getenv("IP_BLOCKED_CIDRS", "").split(",") if c.strip()]
+    IP_REPUTATION_FILES = [p.strip() for p in os.getenv("IP_REPUTATION_FILES", "").split(",") if p.strip()]
+    IP_REPUTATION_RELOAD_INTERVAL = int(os.getenv("IP_REPUTATION_RELOAD_INTERVAL", "30"))  # seconds
+    TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "0"))  # proxies setting X-Forwarded-For
+
+    # Retention: "table=days" pairs; auth_challenges counts days past expires_at
+    RETENTION_ENABLED = os.getenv("RETENTION_ENABLED", "false").lower() == "true"
+    RETENTION_POLICIES = _parse_retention_policies(os.getenv(
+        "RETENTION_POLICIES",
+        "auth_challenges=1,policy_decisions=90,policy_decision_rollups=365,"
+        "deployment_logs=30,registration_requests=180",
+    ))
+    RETENTION_INTERVAL = int(os.getenv("RETENTION_INTERVAL", "3600"))  # seconds between purge runs
+    RETENTION_CHUNK_SIZE = int(os.getenv("RETENTION_CHUNK_SIZE", "500"))  # rows deleted per transaction
+    RETENTION_CHUNK_SLEEP = float(os.getenv("RETENTION_CHUNK_SLEEP", "0.1"))  # seconds between chunks
+    RETENTION_MAX_CHUNKS_PER_RUN = int(os.getenv("RETENTION_MAX_CHUNKS_PER_RUN", "200"))  # per table
+    RETENTION_LOCK_FILE = os.getenv("RETENTION_LOCK_FILE") or os.path.join(INSTANCE_PATH, "retention.lock")
+
+    # Worker boot: create_all is skipped when the database is at the migration head
+    ALEMBIC_SCRIPT_LOCATION = os.getenv("ALEMBIC_SCRIPT_LOCATION") or os.path.join(PROJECT_ROOT, "migrations")
+    # Serialises first-boot work on non-Postgres databases
+    BOOTSTRAP_LOCK_FILE = os.getenv("BOOTSTRAP_LOCK_FILE") or os.path.join(INSTANCE_PATH, "bootstrap.lock")
 
     # Default admin bootstrap is disabled in production unless explicitly allowed
     FLASK_ENV = os.getenv("FLASK_ENV", "development")
@@ -40,6 +106,10 @@ class Config:
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     USE_STRUCTURED_LOGGING = os.getenv("USE_STRUCTURED_LOGGING", "false").lower() == "true"
+    # Per-request SQL statistics (Server-Timing header, log fields, db_queries_per_request)
+    QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
+    SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))  # same statement this often = N+1 warning
 
     # JSON
     JSON_SORT_KEYS = False
@@ -53,8 +123,15 @@ class Config:
 
     # Rate Limiting
     RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "true").lower() == "true"
-    RATELIMIT_STORAGE_URL = os.getenv("REDIS_URL", "redis://localhost:6379/1")
+    # Explicit URL, then Redis, then a memory-mapped file shared by the workers on this host
+    RATELIMIT_STORAGE_URL = (
+        os.getenv("RATELIMIT_STORAGE_URL") or os.getenv("REDIS_URL")
+        or f"mmap://{os.path.join(INSTANCE_PATH, 'ratelimit.bin')}"
+    )
+    RATELIMIT_STRATEGY = os.getenv("RATELIMIT_STRATEGY", "fixed-window")  # or sliding-window-counter
     RATELIMIT_DEFAULT = os.getenv("RATELIMIT_DEFAULT", "200 per day, 50 per hour")
+    RATELIMIT_LOGIN = os.getenv("RATELIMIT_LOGIN", "10 per minute")
+    RATELIMIT_WEBHOOK = os.getenv("RATELIMIT_WEBHOOK", "120 per minute")
 
     # Security Headers
     TALISMAN_ENABLED = os.getenv("TALISMAN_ENABLED", "true").lower() == "true"
@@ -83,11 +160,32 @@ class Config:
         "pool_pre_ping": True,
         "pool_recycle": 1800,
     }
+    # Per worker process: size each against Postgres max_connections / (workers * replicas)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+    DB_POOL_USE_LIFO = os.getenv("DB_POOL_USE_LIFO", "true").lower() == "true"  # lets idle extras time out
+    DB_POOL_PREWARM = int(os.getenv("DB_POOL_PREWARM", "2"))  # connections opened at worker start
+    # Comma-separated replica URLs; GET requests and @read_only services read from them
+    DATABASE_REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+    DB_REPLICA_RETRY_INTERVAL = int(os.getenv("DB_REPLICA_RETRY_INTERVAL", "10"))  # seconds a failed replica rests
+    DB_READ_YOUR_WRITES_WINDOW = int(os.getenv("DB_READ_YOUR_WRITES_WINDOW", "5"))  # seconds on primary after writes
+    # SQLite profile, applied to file databases only
+    SQLITE_PROFILE_ENABLED = os.getenv("SQLITE_PROFILE_ENABLED", "true").lower() == "true"
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))  # per connection
+    SQLITE_BEGIN_MODE = os.getenv("SQLITE_BEGIN_MODE", "IMMEDIATE")  # write lock at first write, or DEFERRED
+    SQLITE_CHECKPOINT_INTERVAL = int(os.getenv("SQLITE_CHECKPOINT_INTERVAL", "60"))  # seconds
+    SQLITE_OPTIMIZE_INTERVAL = int(os.getenv("SQLITE_OPTIMIZE_INTERVAL", "3600"))  # seconds
 
     @staticmethod
     def init_app(app) -> None:
         """Initialize application with this config."""
         _ensure_sqlite_path(app)
+        os.makedirs(app.config["INSTANCE_PATH"], exist_ok=True)
 
 
 class DevelopmentConfig(Config):
@@ -150,7 +248,7 @@ def _ensure_sqlite_path(app) -> None:
         return
 
     relative_path = uri.replace("sqlite:///", "", 1)
-    if relative_path.startswith(os.sep):
+    if relative_path.startswith(os.sep) or relative_path.startswith(":memory:"):
         return
 
     abs_path = os.path.abspath(os.path.join(PROJECT_ROOT, relative_path))
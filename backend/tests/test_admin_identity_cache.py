@@ -0,0 +1,31 @@
+from backend.api.models import AdminUser
+from backend.utils import db
+from backend.utils.security import get_identity_cache
+
+
+def test_repeated_requests_hit_identity_cache(app, client, admin_headers):
+    with app.app_context():
+        cache = get_identity_cache()
+        cache.clear()
+        before = cache.stats()
+
+    assert client.get("/api/sessions/", headers=admin_headers).status_code == 200
+    assert client.get("/api/sessions/", headers=admin_headers).status_code == 200
+
+    stats = cache.stats()
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["hits"] - before["hits"] == 1
+
+
+def test_deactivation_invalidates_cached_identity(app, client, admin_headers):
+    assert client.get("/api/sessions/", headers=admin_headers).status_code == 200
+
+    with app.app_context():
+        session = db.get_session()
+        admin = session.query(AdminUser).filter(AdminUser.username == "test_admin").one()
+        admin.is_active = False
+        session.commit()
+        assert get_identity_cache().stats()["size"] == 0
+
+    resp = client.get("/api/sessions/", headers=admin_headers)
+    assert resp.status_code == 401
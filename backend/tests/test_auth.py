@@ -16,3 +16,48 @@ def test_sessions_require_auth(client):
     resp = client.get("/api/sessions/")
     assert resp.status_code == 401
     assert resp.get_json()["error"] == "Authentication required."
+
+
+def test_repeated_failures_rejected_before_hashing(app, client, monkeypatch):
+    app.config["LOGIN_FAILURE_BLOCK_USER"] = 3
+    for _ in range(3):
+        resp = client.post("/api/auth/login", json={"username": "test_admin", "password": "wrong"})
+        assert resp.status_code == 401
+
+    calls = []
+    monkeypatch.setattr("backend.api.services.auth.verify_password", lambda *args: calls.append(args))
+    resp = client.post("/api/auth/login", json={"username": "test_admin", "password": "super-secret"})
+    assert resp.status_code == 429
+    assert calls == []
+
+
+def test_recent_failures_feed_login_risk(client, monkeypatch):
+    for _ in range(3):
+        client.post("/api/auth/login", json={"username": "test_admin", "password": "wrong"})
+
+    seen = []
+    monkeypatch.setattr(
+        "backend.api.services.auth.calculate_risk",
+        lambda remote_addr, failures=0: seen.append(failures) or 10,
+    )
+    resp = client.post("/api/auth/login", json={"username": "test_admin", "password": "super-secret"})
+    assert resp.status_code == 200
+    assert seen == [3]
+
+
+def test_login_route_limit_shared_storage(monkeypatch, tmp_path):
+    from backend.api import create_app
+    from backend.config.settings import TestConfig
+
+    monkeypatch.setattr(TestConfig, "RATELIMIT_ENABLED", True)
+    monkeypatch.setattr(TestConfig, "RATELIMIT_STORAGE_URL", f"mmap://{tmp_path}/ratelimit.bin")
+    monkeypatch.setattr(TestConfig, "RATELIMIT_LOGIN", "2 per minute")
+    app = create_app("testing")
+    client = app.test_client()
+
+    statuses = [
+        client.post("/api/auth/login", json={"username": "nobody", "password": "x"}).status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [401, 401, 429]
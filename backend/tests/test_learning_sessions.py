@@ -77,3 +77,241 @@ def test_list_sessions_order(client, admin_headers):
     assert len(data) >= 2
     assert data[0]["id"] == second.get_json()["data"]["id"]
     assert data[1]["id"] == first.get_json()["data"]["id"]
+
+
+def test_list_sessions_query_count_does_not_grow_with_rows(client, admin_headers):
+    from backend.utils.query_stats import assert_max_queries
+
+    for i in range(10):
+        client.post("/api/sessions/", json={"title": f"Session {i}"}, headers=admin_headers)
+
+    with assert_max_queries(3):
+        resp = client.get("/api/sessions/", headers=admin_headers)
+    assert resp.status_code == 200
+    assert len(resp.get_json()["data"]) == 10
+
+    server_timing = resp.headers["Server-Timing"]
+    assert server_timing.startswith("db;dur=")
+    assert server_timing.endswith('queries"')
+
+
+def test_list_sessions_cursor_pagination(client, admin_headers):
+    ids = [
+        client.post("/api/sessions/", json={"title": f"Page {i}"}, headers=admin_headers).get_json()["data"]["id"]
+        for i in range(5)
+    ]
+
+    first = client.get("/api/sessions/?limit=2", headers=admin_headers).get_json()
+    assert [s["id"] for s in first["data"]] == ids[:-3:-1]
+    assert first["next_cursor"]
+
+    seen = [s["id"] for s in first["data"]]
+    cursor = first["next_cursor"]
+    while cursor:
+        page = client.get(f"/api/sessions/?limit=2&cursor={cursor}", headers=admin_headers).get_json()
+        seen.extend(s["id"] for s in page["data"])
+        cursor = page["next_cursor"]
+    assert seen == ids[::-1]
+
+
+def test_list_sessions_filters_and_sort(client, admin_headers):
+    client.post("/api/sessions/", json={"title": "Intro to SQL", "difficulty": "easy"}, headers=admin_headers)
+    client.post("/api/sessions/", json={"title": "Advanced SQL", "difficulty": "hard", "status": "in_progress"},
+                headers=admin_headers)
+    client.post("/api/sessions/", json={"title": "100% Python", "difficulty": "easy"}, headers=admin_headers)
+
+    def titles(query):
+        resp = client.get(f"/api/sessions/?{query}", headers=admin_headers)
+        assert resp.status_code == 200
+        return [s["title"] for s in resp.get_json()["data"]]
+
+    assert titles("status=in_progress") == ["Advanced SQL"]
+    assert titles("difficulty=easy&sort=title") == ["100% Python", "Intro to SQL"]
+    assert titles("q=sql&sort=-title") == ["Intro to SQL", "Advanced SQL"]
+    assert titles("q=100%25") == ["100% Python"]
+
+
+def test_list_sessions_rejects_bad_parameters(client, admin_headers):
+    for query in ("status=done", "sort=id", "limit=0", "limit=abc", "cursor=garbage"):
+        resp = client.get(f"/api/sessions/?{query}", headers=admin_headers)
+        assert resp.status_code == 400, query
+
+    client.post("/api/sessions/", json={"title": "A"}, headers=admin_headers)
+    client.post("/api/sessions/", json={"title": "B"}, headers=admin_headers)
+    cursor = client.get("/api/sessions/?limit=1&sort=title", headers=admin_headers).get_json()["next_cursor"]
+    resp = client.get(f"/api/sessions/?limit=1&cursor={cursor}", headers=admin_headers)
+    assert resp.status_code == 400
+
+
+def test_list_sessions_rejects_cursor_values_of_the_wrong_type(client, admin_headers):
+    from datetime import datetime, timezone
+
+    from backend.utils.pagination import encode_cursor
+
+    now = datetime.now(timezone.utc)
+    for after in (["yesterday", 1], [now, "1"], [now, True], [now], [now, 1, 2]):
+        cursor = encode_cursor(after, "-created_at")
+        resp = client.get(f"/api/sessions/?cursor={cursor}", headers=admin_headers)
+        assert resp.status_code == 400, after
+
+    cursor = encode_cursor([now, 1], "-created_at")
+    assert client.get(f"/api/sessions/?cursor={cursor}", headers=admin_headers).status_code == 200
+
+
+def test_batch_create_is_one_insert(client, admin_headers):
+    from backend.utils.query_stats import collect_queries
+
+    items = [{"title": f"Chapter {i}", "difficulty": "easy"} for i in range(20)]
+    with collect_queries() as stats:
+        resp = client.post("/api/sessions/batch", json={"items": items}, headers=admin_headers)
+
+    assert resp.status_code == 201
+    body = resp.get_json()
+    assert body["succeeded"] == 20 and body["failed"] == 0
+    assert [r["data"]["title"] for r in body["results"]] == [item["title"] for item in items]
+    inserts = sum(1 for sql in stats.statements if sql.lstrip().startswith("INSERT INTO learning_sessions "))
+    assert inserts == 1
+    ids = [r["data"]["id"] for r in body["results"]]
+    assert ids == sorted(ids)
+
+
+def test_batch_create_atomic_rejects_everything(client, admin_headers):
+    items = [{"title": "Good"}, {"status": "planned"}, {"title": "Bad", "started_at": "yesterday"}]
+    resp = client.post("/api/sessions/batch", json={"items": items}, headers=admin_headers)
+
+    assert resp.status_code == 400
+    assert [r["index"] for r in resp.get_json()["results"]] == [1, 2]
+    assert client.get("/api/sessions/", headers=admin_headers).get_json()["data"] == []
+
+
+def test_batch_create_partial_applies_valid_items(client, admin_headers):
+    items = [{"title": "Good"}, {"status": "planned"}]
+    resp = client.post("/api/sessions/batch", json={"items": items, "atomic": False}, headers=admin_headers)
+
+    assert resp.status_code == 207
+    results = resp.get_json()["results"]
+    assert [r["status"] for r in results] == [201, 400]
+    assert [s["title"] for s in client.get("/api/sessions/", headers=admin_headers).get_json()["data"]] == ["Good"]
+
+
+def test_batch_update_and_delete(client, admin_headers):
+    created = client.post(
+        "/api/sessions/batch", json={"items": [{"title": f"S{i}"} for i in range(3)]}, headers=admin_headers
+    ).get_json()["results"]
+    ids = [r["data"]["id"] for r in created]
+
+    resp = client.patch("/api/sessions/batch", json={"items": [
+        {"id": ids[0], "status": "in_progress"},
+        {"id": ids[1], "status": "in_progress"},
+        {"id": 999999, "status": "completed"},
+    ]}, headers=admin_headers)
+    assert resp.status_code == 400
+    assert resp.get_json()["results"] == [{"index": 2, "status": 404, "error": "Session not found"}]
+    assert client.get(f"/api/sessions/{ids[0]}", headers=admin_headers).get_json()["data"]["status"] == "planned"
+
+    resp = client.patch("/api/sessions/batch", json={"atomic": False, "items": [
+        {"id": ids[0], "status": "in_progress"},
+        {"id": ids[1], "status": "in_progress"},
+        {"id": 999999, "status": "completed"},
+    ]}, headers=admin_headers)
+    assert resp.status_code == 207
+    assert [r["data"]["status"] for r in resp.get_json()["results"][:2]] == ["in_progress", "in_progress"]
+
+    resp = client.delete("/api/sessions/batch", json={"ids": ids[:2]}, headers=admin_headers)
+    assert resp.status_code == 200
+    remaining = client.get("/api/sessions/", headers=admin_headers).get_json()["data"]
+    assert [s["id"] for s in remaining] == [ids[2]]
+
+
+def test_batch_rejects_malformed_payload(client, admin_headers):
+    assert client.post("/api/sessions/batch", json={"items": []}, headers=admin_headers).status_code == 400
+    assert client.post("/api/sessions/batch", json={"items": {}}, headers=admin_headers).status_code == 400
+    resp = client.post("/api/sessions/batch", json={"items": [{"title": "x"}], "atomic": "no"}, headers=admin_headers)
+    assert resp.status_code == 400
+    assert client.post("/api/sessions/batch", json=[{"title": "x"}], headers=admin_headers).status_code == 400
+    resp = client.delete("/api/sessions/batch", json={"ids": "1,2"}, headers=admin_headers)
+    assert resp.status_code == 400
+    assert "'ids'" in resp.get_json()["error"]
+
+
+def test_batch_rejects_boolean_ids(client, admin_headers):
+    session_id = client.post("/api/sessions/", json={"title": "Keep"}, headers=admin_headers).get_json()["data"]["id"]
+    assert session_id == 1
+
+    resp = client.delete("/api/sessions/batch", json={"ids": [True]}, headers=admin_headers)
+    assert resp.status_code == 400
+    resp = client.patch("/api/sessions/batch", json={"items": [{"id": True, "title": "x"}]}, headers=admin_headers)
+    assert resp.status_code == 400
+    assert client.get("/api/sessions/1", headers=admin_headers).get_json()["data"]["title"] == "Keep"
+
+
+def test_session_stats_follow_status_transitions(client, admin_headers):
+    def stats():
+        resp = client.get("/api/sessions/stats?weeks=2", headers=admin_headers)
+        assert resp.status_code == 200
+        return resp.get_json()["data"]
+
+    assert stats()["total"] == 0
+
+    ids = [r["data"]["id"] for r in client.post("/api/sessions/batch", json={"items": [
+        {"title": "a", "difficulty": "easy"},
+        {"title": "b", "difficulty": "easy"},
+        {"title": "c"},
+    ]}, headers=admin_headers).get_json()["results"]]
+    client.patch(f"/api/sessions/{ids[0]}", json={
+        "status": "completed", "started_at": "2026-01-05T10:00:00+00:00", "completed_at": "2026-01-05T11:00:00+00:00",
+    }, headers=admin_headers)
+    client.patch("/api/sessions/batch", json={"items": [{"id": ids[1], "status": "in_progress"}]},
+                 headers=admin_headers)
+    client.delete(f"/api/sessions/{ids[2]}", headers=admin_headers)
+
+    data = stats()
+    assert data["total"] == 2
+    assert data["by_status"] == {"completed": 1, "in_progress": 1}
+    assert data["completion_rate"] == 0.5
+    assert data["time_to_complete"]["count"] == 1
+    assert data["time_to_complete"]["mean_seconds"] == 3600.0
+    assert abs(data["time_to_complete"]["median_seconds"] - 3600) / 3600 < 0.05
+    assert list(data["by_difficulty"]) == ["easy"]
+    assert len(data["weekly_throughput"]) == 2
+
+
+def test_session_stats_rebuild_matches_incremental(app, client, admin_headers):
+    client.post("/api/sessions/batch", json={"items": [
+        {"title": f"s{i}", "status": "completed", "difficulty": ("easy", "hard")[i % 2],
+         "started_at": "2026-03-02T08:00:00+00:00", "completed_at": f"2026-03-0{2 + i % 3}T09:30:00+00:00"}
+        for i in range(6)
+    ] + [{"title": "open"}]}, headers=admin_headers)
+    incremental = client.get("/api/sessions/stats", headers=admin_headers).get_json()["data"]
+
+    result = app.test_cli_runner().invoke(args=["rebuild-session-stats"])
+    assert "from 7 sessions" in result.output
+
+    from backend.utils.query_stats import collect_queries
+
+    with collect_queries() as queries:
+        rebuilt = client.get("/api/sessions/stats", headers=admin_headers).get_json()["data"]
+    assert rebuilt == incremental
+    assert sum("learning_session" in sql for sql in queries.statements) == 1
+    assert client.get("/api/sessions/stats?weeks=0", headers=admin_headers).status_code == 400
+
+
+def test_session_stats_return_to_zero_for_non_utc_offsets(app, client, admin_headers):
+    from backend.api.models import LearningSessionAggregate
+    from backend.utils import db
+
+    # Sunday evening at -05:00 is already Monday in UTC, so the week bucket depends on normalisation.
+    resp = client.post("/api/sessions/", json={
+        "title": "late", "status": "completed",
+        "started_at": "2026-03-01T20:00:00-05:00", "completed_at": "2026-03-01T22:30:00-05:00",
+    }, headers=admin_headers)
+    session_id = resp.get_json()["data"]["id"]
+    client.patch(f"/api/sessions/{session_id}", json={"difficulty": "hard"}, headers=admin_headers)
+    client.delete(f"/api/sessions/{session_id}", headers=admin_headers)
+
+    with app.app_context():
+        counters = db.get_session().query(LearningSessionAggregate).all()
+        assert counters
+        assert {(row.metric, row.count, row.total_seconds) for row in counters} <= {
+            ("status", 0, 0.0), ("week", 0, 0.0), ("duration", 0, 0.0),
+        }
@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from backend.api.models import AdminUser
+from backend.utils import db
+from backend.utils.passwords import KdfPool, PasswordHasherBusy
+
+
+def test_saturated_kdf_pool_rejects_immediately():
+    pool = KdfPool(size=1, queue_limit=0)
+    try:
+        running = pool.submit(time.sleep, 0.5)
+        started = time.perf_counter()
+        with pytest.raises(PasswordHasherBusy):
+            pool.submit(time.sleep, 0)
+        assert time.perf_counter() - started < 0.1
+        running.result()
+        pool.submit(time.sleep, 0).result()
+    finally:
+        pool.shutdown()
+
+
+def test_login_returns_503_when_hasher_busy(client, monkeypatch):
+    def busy(*args):
+        raise PasswordHasherBusy()
+
+    monkeypatch.setattr("backend.api.services.auth.verify_password", busy)
+    resp = client.post("/api/auth/login", json={"username": "test_admin", "password": "super-secret"})
+    assert resp.status_code == 503
+
+
+def test_outdated_hash_upgraded_on_login(app, client):
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+    resp = client.post("/api/auth/login", json={"username": "test_admin", "password": "super-secret"})
+    assert resp.status_code == 200
+
+    with app.app_context():
+        admin = db.get_session().query(AdminUser).filter(AdminUser.username == "test_admin").one()
+        assert admin.password_hash.startswith("pbkdf2:sha256:1000$")
+        assert admin.token_version == 1
+
+    resp = client.post("/api/auth/login", json={"username": "test_admin", "password": "super-secret"})
+    assert resp.status_code == 200
@@ -0,0 +1,46 @@
+from backend.api.models import PolicyDecision, PolicyDecisionRollup
+from backend.api.services.policy import get_decision_aggregator, get_policy_engine, persist_decision
+from backend.utils import db
+
+
+def test_aggregate_mode_counts_allow_and_keeps_non_allow(app):
+    app.config.update(POLICY_DECISION_RECORDING="aggregate", POLICY_ALLOW_SAMPLE_RATE=0.0)
+
+    with app.app_context():
+        for _ in range(3):
+            persist_decision("alice", "auth.login", "allow", [], {"risk_score": 10})
+        persist_decision("alice", "auth.login", "deny", ["high_risk_score"], {"risk_score": 90})
+
+        session = db.get_session()
+        rows = session.query(PolicyDecision).all()
+        assert [row.decision for row in rows] == ["deny"]
+
+        assert get_decision_aggregator().flush() == 3
+        persist_decision("alice", "auth.login", "allow", [], {"risk_score": 10})
+        assert get_decision_aggregator().flush() == 1
+
+        # Both flushes land in one per-minute row unless a minute boundary passed in between.
+        rollups = session.query(PolicyDecisionRollup).all()
+        assert len(rollups) in (1, 2)
+        assert {(r.rules_version, r.action, r.decision, r.rules) for r in rollups} == {
+            (get_policy_engine().version, "auth.login", "allow", "")
+        }
+        assert sum(r.count for r in rollups) == 4
+
+
+def test_rollups_are_kept_per_rules_version(app):
+    with app.app_context():
+        aggregator = get_decision_aggregator()
+        aggregator.record("auth.login", "allow", "", "v1")
+        aggregator.record("auth.login", "allow", "", "v2")
+        aggregator.record("auth.login", "allow", "", "v2")
+        assert aggregator.flush() == 3
+
+        rollups = db.get_session().query(PolicyDecisionRollup).all()
+        assert {r.rules_version: r.count for r in rollups} == {"v1": 1, "v2": 2}
+
+
+def test_full_mode_stores_every_decision(app):
+    with app.app_context():
+        persist_decision("alice", "auth.login", "allow", [], {"risk_score": 10})
+        assert db.get_session().query(PolicyDecision).count() == 1
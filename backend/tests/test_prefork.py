@@ -0,0 +1,63 @@
+import gc
+import os
+
+import pytest
+from sqlalchemy import text
+
+from backend.api import create_app
+from backend.utils import db
+from backend.utils.prefork import freeze_heap, reset_after_fork
+
+
+@pytest.fixture
+def file_app(monkeypatch, tmp_path):
+    """App on a SQLite file with a pre-warmed pool, as a preloading master has."""
+    from backend.config.settings import TestConfig
+
+    for name in ("_engine", "_replicas", "SessionLocal"):
+        monkeypatch.setattr(db, name, None)
+    monkeypatch.setattr(TestConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path}/prefork.db")
+    monkeypatch.setattr(TestConfig, "DB_POOL_PREWARM", 2)
+
+    app = create_app("testing")
+    yield app
+
+    db.SessionLocal.remove()
+    db.get_engine().dispose()
+
+
+def _pooled_records():
+    return list(db.get_engine().pool._pool.queue)
+
+
+def test_forked_worker_replaces_inherited_connections(file_app):
+    inherited = _pooled_records()
+    assert inherited
+    for record in inherited:
+        record.info["opened_by"] = os.getpid()
+
+    pid = os.fork()
+    if pid == 0:  # worker
+        status = 1
+        try:
+            reset_after_fork(file_app)
+            with db.get_engine().connect() as connection:
+                connection.execute(text("SELECT count(*) FROM admin_users")).scalar_one()
+            own = _pooled_records()
+            status = 0 if own and not any("opened_by" in record.info for record in own) else 2
+        finally:
+            os._exit(status)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    # The master's own connections were left open by the worker.
+    with db.get_engine().connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar_one() == 1
+
+
+def test_freeze_heap_moves_objects_to_permanent_generation():
+    try:
+        freeze_heap()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
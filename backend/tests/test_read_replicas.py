@@ -0,0 +1,100 @@
+import shutil
+
+import pytest
+
+from sqlalchemy import create_engine
+
+from backend.api import create_app
+from backend.utils import db
+
+
+@pytest.fixture
+def replica_app(monkeypatch, tmp_path):
+    """App with a primary and one replica, both SQLite files."""
+    from backend.config.settings import TestConfig
+
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    for name in ("_engine", "_replicas", "SessionLocal"):
+        monkeypatch.setattr(db, name, None)
+    monkeypatch.setattr(TestConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{primary}")
+    monkeypatch.setattr(TestConfig, "DATABASE_REPLICA_URLS", [f"sqlite:///{replica}"])
+    monkeypatch.setattr(TestConfig, "DB_READ_YOUR_WRITES_WINDOW", 0)
+    monkeypatch.setattr(TestConfig, "DB_POOL_PREWARM", 0)
+
+    app = create_app("testing")
+    # Snapshot the bootstrapped primary so the replica starts in sync.
+    db.get_engine().dispose()
+    shutil.copy(primary, replica)
+    yield app
+
+    db.SessionLocal.remove()
+    db.get_engine().dispose()
+    for engine in db._replicas.engines:
+        engine.dispose()
+
+
+def _login(client, app):
+    resp = client.post("/api/auth/login", json={
+        "username": app.config["DEFAULT_ADMIN_USERNAME"], "password": app.config["DEFAULT_ADMIN_PASSWORD"],
+    })
+    assert resp.status_code == 200
+    return {"Authorization": f"Bearer {resp.get_json()['token']}"}
+
+
+def _create(client, headers, title):
+    resp = client.post("/api/sessions/", json={"title": title, "status": "planned"}, headers=headers)
+    assert resp.status_code == 201, resp.get_json()
+
+
+def _titles(client, headers):
+    return [item["title"] for item in client.get("/api/sessions/", headers=headers).get_json()["data"]]
+
+
+def test_get_requests_read_from_replica(replica_app):
+    client = replica_app.test_client()
+    headers = _login(client, replica_app)
+
+    _create(client, headers, "written to primary")
+
+    # Replication never happens in this test, so the replica does not see the write.
+    assert _titles(client, headers) == []
+
+
+def test_client_reads_its_own_writes_within_window(replica_app):
+    replica_app.config["DB_READ_YOUR_WRITES_WINDOW"] = 30
+    client = replica_app.test_client()
+    headers = _login(client, replica_app)
+
+    _create(client, headers, "written to primary")
+
+    assert _titles(client, headers) == ["written to primary"]
+    assert replica_app.test_client().get("/api/sessions/", headers=headers).get_json()["data"] == []
+
+
+def test_failed_replica_falls_back_to_primary(replica_app, tmp_path):
+    client = replica_app.test_client()
+    headers = _login(client, replica_app)
+    _create(client, headers, "written to primary")
+
+    (tmp_path / "replica.db").unlink()
+    (tmp_path / "replica.db").mkdir()  # connecting to the replica now fails
+    replica = db._replicas.engines[0]
+    replica.dispose()
+    db._replicas.mark_down(replica)
+
+    assert _titles(client, headers) == ["written to primary"]
+
+
+def test_read_on_unreachable_replica_is_retried_on_primary(replica_app, tmp_path, monkeypatch):
+    client = replica_app.test_client()
+    headers = _login(client, replica_app)
+    _create(client, headers, "written to primary")
+
+    # Never marked down, so the first read is routed to it and fails to connect.
+    dead = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    monkeypatch.setattr(db, "_replicas", db.ReplicaSet([dead], retry_interval=60))
+
+    resp = client.get("/api/sessions/", headers=headers)
+    assert resp.status_code == 200
+    assert [item["title"] for item in resp.get_json()["data"]] == ["written to primary"]
+    assert db._replicas.choose() is None
@@ -88,3 +88,88 @@ def test_admin_can_reject_request(client, admin_headers, admin_keypair):
     # Rejected user should not exist
     login_resp = client.post("/api/auth/login", json={"username": "reject_me", "password": "secret123"})
     assert login_resp.status_code == 401
+
+
+def _sign(private_key, message: str) -> str:
+    return base64.b64encode(private_key.sign(message.encode(), padding.PKCS1v15(), hashes.SHA256())).decode()
+
+
+def test_batch_review_applies_all_decisions(client, admin_headers, admin_keypair):
+    ids = []
+    for username in ("batch_one", "batch_two"):
+        resp = client.post("/api/auth/register/request", json={"username": username, "password": "secret123"})
+        ids.append(resp.get_json()["request"]["id"])
+
+    signed_at = datetime.now(timezone.utc).isoformat()
+    decisions = [
+        {"request_id": ids[0], "action": "approve", "signed_at": signed_at,
+         "signature": _sign(admin_keypair, f"{ids[0]}:approve:{signed_at}")},
+        {"request_id": ids[1], "action": "reject", "signed_at": signed_at,
+         "signature": _sign(admin_keypair, f"{ids[1]}:reject:{signed_at}")},
+    ]
+    resp = client.post("/api/auth/register/requests/batch", headers=admin_headers, json={"decisions": decisions})
+    assert resp.status_code == 200
+    assert [r["status"] for r in resp.get_json()["requests"]] == ["approved", "rejected"]
+
+    login_resp = client.post("/api/auth/login", json={"username": "batch_one", "password": "secret123"})
+    assert login_resp.status_code == 200
+
+
+def test_batch_review_with_bad_signature_applies_nothing(client, admin_headers, admin_keypair):
+    ids = []
+    for username in ("batch_three", "batch_four"):
+        resp = client.post("/api/auth/register/request", json={"username": username, "password": "secret123"})
+        ids.append(resp.get_json()["request"]["id"])
+
+    signed_at = datetime.now(timezone.utc).isoformat()
+    decisions = [
+        {"request_id": ids[0], "action": "approve", "signed_at": signed_at,
+         "signature": _sign(admin_keypair, f"{ids[0]}:approve:{signed_at}")},
+        {"request_id": ids[1], "action": "approve", "signed_at": signed_at,
+         "signature": _sign(admin_keypair, f"{ids[1]}:reject:{signed_at}")},
+    ]
+    resp = client.post("/api/auth/register/requests/batch", headers=admin_headers, json={"decisions": decisions})
+    assert resp.status_code == 400
+    assert resp.get_json()["results"] == [{"request_id": ids[1], "error": "Signature verification failed."}]
+
+    session = db.get_session()
+    statuses = session.execute(
+        text("SELECT status FROM registration_requests WHERE id IN (:a, :b)"), {"a": ids[0], "b": ids[1]}
+    ).scalars().all()
+    assert statuses == ["pending", "pending"]
+
+
+@pytest.mark.parametrize(
+    "decision",
+    [
+        {"request_id": True, "action": "approve", "signature": "c2ln", "signed_at": "2026-01-01T00:00:00+00:00"},
+        {"request_id": 1, "action": "approve", "signature": 123, "signed_at": "2026-01-01T00:00:00+00:00"},
+        {"request_id": 1, "action": "approve", "signature": "c2ln", "signed_at": ["2026"]},
+    ],
+)
+def test_batch_review_rejects_malformed_decision(client, admin_headers, decision):
+    resp = client.post("/api/auth/register/requests/batch", headers=admin_headers, json={"decisions": [decision]})
+    assert resp.status_code == 400
+    assert "request_id" in resp.get_json()["error"]
+
+
+def test_public_key_parsed_once(client, admin_headers, admin_keypair, monkeypatch):
+    from backend.api.services import auth as auth_service
+
+    parsed = []
+    original = auth_service.load_pem_public_key
+    monkeypatch.setattr(auth_service, "load_pem_public_key", lambda pem: parsed.append(pem) or original(pem))
+
+    for username in ("cached_one", "cached_two"):
+        request_id = client.post(
+            "/api/auth/register/request", json={"username": username, "password": "secret123"}
+        ).get_json()["request"]["id"]
+        signed_at = datetime.now(timezone.utc).isoformat()
+        resp = client.post(
+            f"/api/auth/register/requests/{request_id}/reject",
+            headers=admin_headers,
+            json={"signature": _sign(admin_keypair, f"{request_id}:reject:{signed_at}"), "signed_at": signed_at},
+        )
+        assert resp.status_code == 200
+
+    assert len(parsed) == 1
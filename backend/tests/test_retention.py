@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.api.models import AuthChallenge, PolicyDecision, RegistrationRequest
+from backend.api.services.retention import (
+    RetentionLock,
+    purge_table,
+    run_retention_as_leader,
+    run_scheduled_retention,
+)
+from backend.utils import db
+
+
+def _days_ago(days):
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+def test_purge_deletes_only_expired_rows_in_chunks(app):
+    with app.app_context():
+        session = db.get_session()
+        for _ in range(5):
+            session.add(PolicyDecision(actor="a", action="x", decision="allow", rules="", created_at=_days_ago(100)))
+        session.add(PolicyDecision(actor="a", action="x", decision="allow", rules="", created_at=_days_ago(1)))
+        session.commit()
+
+        assert purge_table("policy_decisions", 90, chunk_size=2, chunk_sleep=0) == 5
+        assert session.query(PolicyDecision).count() == 1
+
+
+def test_max_chunks_bounds_a_run(app):
+    with app.app_context():
+        session = db.get_session()
+        for _ in range(5):
+            session.add(PolicyDecision(actor="a", action="x", decision="deny", rules="", created_at=_days_ago(100)))
+        session.commit()
+
+        assert purge_table("policy_decisions", 90, chunk_size=2, chunk_sleep=0, max_chunks=1) == 2
+        assert purge_table("policy_decisions", 90, chunk_size=2, chunk_sleep=0) == 3
+
+
+def test_scheduled_run_respects_pending_requests_and_challenge_expiry(app, tmp_path):
+    app.config.update(
+        RETENTION_POLICIES={"auth_challenges": 0, "registration_requests": 30, "unknown_table": 1},
+        RETENTION_CHUNK_SLEEP=0,
+        RETENTION_LOCK_FILE=str(tmp_path / "retention.lock"),
+    )
+    with app.app_context():
+        session = db.get_session()
+        session.add_all([
+            AuthChallenge(admin_username="a", method="totp", code_hash="x", expires_at=_days_ago(1)),
+            AuthChallenge(admin_username="a", method="totp", code_hash="y", expires_at=_days_ago(-1)),
+            RegistrationRequest(username="old-pending", password_hash="x", status="pending",
+                                created_at=_days_ago(60)),
+            RegistrationRequest(username="old-approved", password_hash="x", status="approved",
+                                reviewed_at=_days_ago(60)),
+        ])
+        session.commit()
+
+    assert run_scheduled_retention(app) == {"auth_challenges": 1, "registration_requests": 1}
+
+    with app.app_context():
+        session = db.get_session()
+        assert session.query(AuthChallenge).count() == 1
+        assert [r.username for r in session.query(RegistrationRequest).all()] == ["old-pending"]
+
+
+def test_leader_keeps_the_lease_between_runs(app, tmp_path):
+    app.config.update(RETENTION_POLICIES={"policy_decisions": 90}, RETENTION_CHUNK_SLEEP=0)
+    lock_file = str(tmp_path / "retention.lock")
+    leader, follower = RetentionLock(lock_file), RetentionLock(lock_file)
+
+    assert run_retention_as_leader(app, leader) == {"policy_decisions": 0}
+    assert run_retention_as_leader(app, follower) is None
+    assert run_retention_as_leader(app, leader) == {"policy_decisions": 0}
+
+    leader.release()
+    assert run_retention_as_leader(app, follower) == {"policy_decisions": 0}
+    follower.release()
+
+
+def test_malformed_retention_policies_name_the_entry():
+    from backend.config.settings import _parse_retention_policies
+
+    assert _parse_retention_policies("auth_challenges=1, deployment_logs=0.5,") == {
+        "auth_challenges": 1.0, "deployment_logs": 0.5,
+    }
+    for raw in ("foo=bar", "deployment_logs", "=3", "deployment_logs=-1"):
+        with pytest.raises(ValueError, match="RETENTION_POLICIES"):
+            _parse_retention_policies(raw)
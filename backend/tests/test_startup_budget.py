@@ -0,0 +1,40 @@
+"""Startup budget: create_app must stay fast and lean in a fresh interpreter."""
+from backend.benchmarks.startup import parse_importtime, profile_startup
+
+# Generous ceilings for slow CI machines; today's figures are roughly 0.6s and 100 MiB.
+STARTUP_SECONDS_BUDGET = 5.0
+STARTUP_RSS_MIB_BUDGET = 200
+LAZY_SUBSYSTEMS = ("flasgger", "flask_caching", "flask_limiter", "prometheus_flask_exporter", "sentry_sdk")
+
+
+def test_parse_importtime():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     _io",
+        "import time:       300 |        420 |   io",
+        "import time:      1000 |       1420 | backend.api",
+        "unrelated warning",
+    ])
+    records = parse_importtime(stderr)
+    assert [(r.module, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+        ("_io", 120, 120, 2),
+        ("io", 300, 420, 1),
+        ("backend.api", 1000, 1420, 0),
+    ]
+
+
+def test_create_app_within_startup_budget():
+    profile = profile_startup("testing")
+
+    assert profile.loaded(LAZY_SUBSYSTEMS) == []
+    assert profile.seconds < STARTUP_SECONDS_BUDGET, [(r.module, r.cumulative_us) for r in profile.slowest(10)]
+    assert profile.max_rss_kb / 1024 < STARTUP_RSS_MIB_BUDGET
+
+
+def test_swagger_built_on_first_request(app, client):
+    assert app.extensions["lazy_swagger"]["views"] is None
+
+    assert client.get("/api/docs/").status_code == 200
+    assert client.get("/apispec.json").get_json()["swagger"] == "2.0"
+    assert client.get("/flasgger_static/swagger-ui-bundle.js").status_code == 200
+    assert app.extensions["lazy_swagger"]["views"] is not None
@@ -0,0 +1,46 @@
+import pytest
+
+from backend.api.models import AdminUser
+from backend.utils import db
+from backend.utils.passwords import hash_password
+
+
+@pytest.fixture
+def stateless_headers(app, client):
+    app.config["AUTH_TOKEN_MODE"] = "stateless"
+    resp = client.post("/api/auth/login", json={"username": "test_admin", "password": "super-secret"})
+    assert resp.status_code == 200
+    token = resp.get_json()["token"]
+    assert token.startswith("v2.")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_stateless_token_authorises_request(client, stateless_headers):
+    resp = client.get("/api/sessions/", headers=stateless_headers)
+    assert resp.status_code == 200
+
+
+def test_tampered_stateless_token_rejected(client, stateless_headers):
+    token = stateless_headers["Authorization"].split(" ", 1)[1]
+    resp = client.get("/api/sessions/", headers={"Authorization": f"Bearer {token[:-2]}xx"})
+    assert resp.status_code == 401
+
+
+def test_non_ascii_stateless_token_rejected(client, stateless_headers):
+    token = stateless_headers["Authorization"].split(" ", 1)[1]
+    resp = client.get("/api/sessions/", headers={"Authorization": f"Bearer {token[:-1]}\u00e9"})
+    assert resp.status_code == 401
+
+
+def test_password_change_revokes_stateless_token(app, client, stateless_headers):
+    assert client.get("/api/sessions/", headers=stateless_headers).status_code == 200
+
+    with app.app_context():
+        session = db.get_session()
+        admin = session.query(AdminUser).filter(AdminUser.username == "test_admin").one()
+        admin.password_hash = hash_password("rotated-secret")
+        session.commit()
+        assert admin.token_version == 2
+
+    resp = client.get("/api/sessions/", headers=stateless_headers)
+    assert resp.status_code == 401
@@ -0,0 +1,68 @@
+from sqlalchemy import event, func, select
+
+from backend.api.models.learning_session import LearningSession
+from backend.api.models.pipeline import DeploymentLog, Pipeline
+from backend.api.services.learning_sessions import create_session
+from backend.utils import db
+
+
+def _count_commits():
+    commits = []
+
+    def record(session):
+        commits.append(session)
+
+    event.listen(db.RoutingSession, "after_commit", record)
+    return commits, lambda: event.remove(db.RoutingSession, "after_commit", record)
+
+
+def test_pipeline_create_commits_once(client, admin_headers):
+    commits, stop = _count_commits()
+    try:
+        resp = client.post("/api/pipelines", headers=admin_headers, json={"name": "build", "status": "success"})
+    finally:
+        stop()
+
+    assert resp.status_code == 201
+    assert len(commits) == 1
+    session = db.get_session()
+    assert session.scalar(select(func.count()).select_from(Pipeline)) == 1
+    assert session.scalar(select(func.count()).select_from(DeploymentLog)) == 1
+
+
+def test_server_error_rolls_back_flushed_writes(app, client):
+    @app.route("/_test/fail-after-write", methods=["POST"])
+    def fail_after_write():
+        create_session({"title": "never stored"})
+        raise RuntimeError("boom")
+
+    resp = client.post("/_test/fail-after-write")
+
+    assert resp.status_code == 500
+    session = db.get_session()
+    assert session.scalar(select(func.count()).select_from(LearningSession)) == 0
+
+
+def test_client_error_rolls_back_flushed_writes(app, client):
+    @app.route("/_test/write-then-reject", methods=["POST"])
+    def write_then_reject():
+        create_session({"title": "discarded"})
+        return {"error": "rejected"}, 400
+
+    resp = client.post("/_test/write-then-reject")
+
+    assert resp.status_code == 400
+    session = db.get_session()
+    assert session.scalar(select(func.count()).select_from(LearningSession)) == 0
+
+
+def test_rejected_update_leaves_session_unchanged(client, admin_headers):
+    created = client.post("/api/sessions/", json={"title": "Original"}, headers=admin_headers)
+    session_id = created.get_json()["data"]["id"]
+
+    resp = client.patch(
+        f"/api/sessions/{session_id}", json={"title": "Changed", "started_at": "not a date"}, headers=admin_headers
+    )
+
+    assert resp.status_code == 400
+    assert client.get(f"/api/sessions/{session_id}", headers=admin_headers).get_json()["data"]["title"] == "Original"
@@ -0,0 +1,92 @@
+"""Unit tests for the worker boot fast path."""
+import os
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, inspect, text
+
+from backend.api.models import LearningSession, LearningSessionAggregate
+from backend.utils import db
+from backend.utils.bootstrap import alembic_heads, bootstrap_database, bootstrap_lock, schema_is_current
+
+SCRIPT_LOCATION = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "migrations"))
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/boot.db")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def boot_app(tmp_path):
+    app = Flask(__name__)
+    app.config.update(
+        ALEMBIC_SCRIPT_LOCATION=SCRIPT_LOCATION,
+        BOOTSTRAP_LOCK_FILE=str(tmp_path / "boot.lock"),
+        ALLOW_DEFAULT_ADMIN_BOOTSTRAP=False,
+    )
+    return app
+
+
+def _stamp(engine, revisions):
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)"))
+        for revision in revisions:
+            connection.execute(text("INSERT INTO alembic_version VALUES (:r)"), {"r": revision})
+
+
+class TestSchemaIsCurrent:
+    """Test schema_is_current."""
+
+    def test_unmigrated_database_is_not_current(self, engine):
+        """A database without alembic_version needs create_all."""
+        assert not schema_is_current(engine, SCRIPT_LOCATION)
+
+    def test_database_at_head_is_current(self, engine):
+        """The stored revision matches the newest migration."""
+        _stamp(engine, alembic_heads(SCRIPT_LOCATION))
+        assert schema_is_current(engine, SCRIPT_LOCATION)
+
+    def test_older_revision_is_not_current(self, engine):
+        """A database behind the head still gets create_all."""
+        _stamp(engine, ["414cf7cbbed1"])
+        assert not schema_is_current(engine, SCRIPT_LOCATION)
+
+    def test_missing_script_location(self, engine):
+        """Without migration scripts the check always falls back."""
+        assert not schema_is_current(engine, None)
+
+
+class TestBootstrapDatabase:
+    """Test bootstrap_database."""
+
+    def test_creates_tables_when_behind(self, boot_app, engine):
+        """An unmigrated database gets every table."""
+        bootstrap_database(boot_app, engine)
+        assert "admin_users" in inspect(engine).get_table_names()
+
+    def test_skips_create_all_at_head(self, boot_app, engine):
+        """A database at the head is left untouched."""
+        _stamp(engine, alembic_heads(SCRIPT_LOCATION))
+        bootstrap_database(boot_app, engine)
+        assert inspect(engine).get_table_names() == ["alembic_version"]
+
+    def test_new_statistics_table_counts_existing_sessions(self, app, boot_app):
+        """Sessions stored before the aggregates table existed are counted when it is created."""
+        session = db.get_session()
+        session.add_all([LearningSession(title="a"), LearningSession(title="b")])
+        session.commit()
+        LearningSessionAggregate.__table__.drop(db.get_engine())
+
+        bootstrap_database(boot_app, db.get_engine())
+
+        counter = session.query(LearningSessionAggregate).filter_by(metric="status", status="planned").one()
+        assert counter.count == 2
+
+    def test_lock_released_after_block(self, boot_app, engine):
+        """The file lock is released when the block exits."""
+        for _ in range(2):
+            with bootstrap_lock(engine, boot_app.config["BOOTSTRAP_LOCK_FILE"]):
+                pass
@@ -0,0 +1,57 @@
+"""Unit tests for the instrumented connection pool."""
+import pytest
+from flask import Flask
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc
+
+from backend.utils.db import InstrumentedQueuePool, pool_options, prewarm_pool
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, {"pool": "primary", **labels}) or 0
+
+
+class TestInstrumentedQueuePool:
+    """Test InstrumentedQueuePool."""
+
+    def test_options_skip_in_memory_sqlite(self, tmp_path):
+        """In-memory SQLite keeps its singleton pool; file databases get the tuned pool."""
+        app = Flask(__name__)
+        app.config.update(DB_POOL_SIZE=3, DB_MAX_OVERFLOW=1, DB_POOL_TIMEOUT=2, DB_POOL_USE_LIFO=False)
+
+        assert pool_options(app, "sqlite:///:memory:") == {}
+        assert pool_options(app, f"sqlite:///{tmp_path}/db.sqlite") == {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": 3,
+            "max_overflow": 1,
+            "pool_timeout": 2,
+            "pool_use_lifo": False,
+        }
+
+    def test_metrics_overflow_and_timeout(self, tmp_path):
+        """Checkouts update gauges, and overflow and timeouts are counted."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path}/db.sqlite",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=1,
+            pool_timeout=0.05,
+        )
+        overflow_before = _sample("db_pool_overflow_connections_total")
+        timeouts_before = _sample("db_pool_checkout_timeouts_total")
+        checkouts_before = _sample("db_pool_checkout_seconds_count")
+
+        assert prewarm_pool(engine, 5) == 1
+        first, second = engine.connect(), engine.connect()
+        assert _sample("db_pool_connections", state="in_use") == 2
+        assert _sample("db_pool_overflow_connections_total") == overflow_before + 1
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        assert _sample("db_pool_checkout_timeouts_total") == timeouts_before + 1
+
+        first.close()
+        second.close()
+        assert _sample("db_pool_connections", state="in_use") == 0
+        assert _sample("db_pool_checkout_seconds_count") == checkouts_before + 3
+        engine.dispose()
@@ -0,0 +1,100 @@
+"""Unit tests for IP reputation prefix tries."""
+import os
+
+from backend.utils.ipreputation import (
+    BLOCKED,
+    TRUSTED,
+    UNKNOWN,
+    DEFAULT_TRUSTED_CIDRS,
+    IPClass,
+    IPReputation,
+    build_reputation,
+    get_ip_reputation,
+)
+from backend.api.services.risk import calculate_risk
+
+
+class TestIPReputation:
+    """Test IPReputation."""
+
+    def test_default_private_ranges_are_trusted(self):
+        """All RFC 1918, loopback and unique-local ranges are trusted."""
+        reputation = build_reputation(DEFAULT_TRUSTED_CIDRS, (), ())
+
+        for address in ("10.1.2.3", "172.20.0.5", "192.168.1.1", "127.0.0.1", "::1", "fd00::1", "::ffff:10.0.0.1"):
+            assert reputation.classify(address) == TRUSTED
+        for address in ("172.32.0.1", "8.8.8.8", "2001:db8::1", None, "not-an-ip"):
+            assert reputation.classify(address) == UNKNOWN
+
+    def test_longest_prefix_wins(self):
+        """A more specific range overrides the range that contains it."""
+        reputation = IPReputation([
+            ("203.0.113.0/24", BLOCKED),
+            ("203.0.113.128/25", IPClass("scored", 15)),
+            ("203.0.113.200/32", TRUSTED),
+            ("2001:db8::/32", BLOCKED),
+            ("2001:db8:1::/48", TRUSTED),
+        ])
+
+        assert reputation.classify("203.0.113.5") == BLOCKED
+        assert reputation.classify("203.0.113.130") == IPClass("scored", 15)
+        assert reputation.classify("203.0.113.200") == TRUSTED
+        assert reputation.classify("2001:db8:2::1") == BLOCKED
+        assert reputation.classify("2001:db8:1::1") == TRUSTED
+
+    def test_range_files_hot_reload(self, app, tmp_path):
+        """Range files are parsed and rebuilt when they change."""
+        ranges = tmp_path / "ranges.txt"
+        ranges.write_text("# office\n198.51.100.0/24 trusted\n192.0.2.0/24\n")
+        app.config.update(IP_REPUTATION_FILES=[str(ranges)], IP_REPUTATION_RELOAD_INTERVAL=0)
+
+        with app.app_context():
+            get_ip_reputation()
+            app.extensions["ip_reputation"]["reload_thread"].join(timeout=5)
+            reputation = get_ip_reputation()
+            assert reputation.classify("198.51.100.7") == TRUSTED
+            assert reputation.classify("192.0.2.7") == BLOCKED
+
+            ranges.write_text("192.0.2.0/24 25\n")
+            os.utime(ranges, (1, 1))
+            get_ip_reputation()
+            app.extensions["ip_reputation"]["reload_thread"].join(timeout=5)
+            assert get_ip_reputation().classify("192.0.2.7") == IPClass("scored", 25)
+
+    def test_calculate_risk_uses_reputation(self, app):
+        """Blocked ranges score maximum risk, trusted ranges lower it."""
+        app.config.update(IP_BLOCKED_CIDRS=["192.0.2.0/24"])
+
+        with app.app_context():
+            assert calculate_risk("192.0.2.10") == 100
+            assert calculate_risk("10.0.0.1") == calculate_risk("8.8.8.8") - 10
+
+    def test_range_files_load_in_background(self, app, tmp_path):
+        """File ranges are unknown until the first background build swaps them in."""
+        ranges = tmp_path / "ranges.txt"
+        ranges.write_text("192.0.2.0/24\n")
+        app.config.update(IP_REPUTATION_FILES=[str(ranges)], IP_BLOCKED_CIDRS=["203.0.113.0/24"])
+
+        with app.app_context():
+            first = get_ip_reputation()
+            assert first.classify("203.0.113.1") == BLOCKED
+            assert first.classify("192.0.2.7") == UNKNOWN
+
+            app.extensions["ip_reputation"]["reload_thread"].join(timeout=5)
+            assert get_ip_reputation().classify("192.0.2.7") == BLOCKED
+
+    def test_invalid_lines_are_skipped(self, app, tmp_path, caplog):
+        """Malformed CIDRs and labels are logged with their line, the rest still load."""
+        ranges = tmp_path / "ranges.txt"
+        ranges.write_text("198.51.100.0/24 trusted\nnot-a-cidr\n192.0.2.0/24 sometimes\n203.0.113.0/24 40\n")
+
+        reputation = build_reputation((), (), [str(ranges)], app.logger)
+
+        assert reputation.size == 2
+        assert reputation.classify("198.51.100.1") == TRUSTED
+        assert reputation.classify("192.0.2.1") == UNKNOWN
+        assert reputation.classify("203.0.113.1") == IPClass("scored", 40)
+        assert [record.getMessage().split(": ")[0] for record in caplog.records] == [
+            f"Skipping invalid IP range at {ranges}:2",
+            f"Skipping invalid IP range at {ranges}:3",
+        ]
@@ -0,0 +1,104 @@
+"""Unit tests for the compiled policy engine."""
+import json
+import os
+
+import pytest
+
+from backend.api.services.policy import DEFAULT_RULES, PolicyEngine, get_policy_engine
+
+
+class TestPolicyEngine:
+    """Test PolicyEngine."""
+
+    def test_default_rules(self):
+        """Default rules keep the original after-hours and risk thresholds."""
+        engine = PolicyEngine(DEFAULT_RULES)
+
+        assert engine.evaluate("alice", "auth.login", {"risk_score": 10, "hour": 12}) == (
+            "allow", [], {"risk_score": 10}
+        )
+        assert engine.evaluate("alice", "auth.login", {"risk_score": 50, "hour": 12})[:2] == (
+            "challenge", ["medium_risk_score"]
+        )
+        assert engine.evaluate("alice", "auth.login", {"risk_score": 80, "hour": 23}) == (
+            "deny", ["after_hours", "high_risk_score"], {"hour": 23, "risk_score": 80}
+        )
+
+    def test_action_role_and_ip_conditions(self):
+        """Rules only fire for matching actions, roles and IP ranges."""
+        engine = PolicyEngine([
+            {"id": "viewer_approvals", "decision": "deny", "when": {"actions": ["register.*"], "roles": ["viewer"]}},
+            {"id": "office", "decision": "challenge", "when": {"ip_ranges": ["203.0.113.0/24"]}},
+        ])
+
+        assert engine.evaluate("bob", "register.approve", {"role": "viewer"})[0] == "deny"
+        assert engine.evaluate("bob", "auth.login", {"role": "viewer"})[0] == "allow"
+        assert engine.evaluate("bob", "auth.login", {"remote_addr": "203.0.113.9"})[1] == ["office"]
+        assert engine.evaluate("bob", "auth.login", {"remote_addr": "198.51.100.1"})[1] == []
+
+    def test_decisions_memoised_per_risk_bucket(self):
+        """Scores that no threshold separates share one memo entry."""
+        engine = PolicyEngine(DEFAULT_RULES)
+        for score in (41, 50, 69):
+            engine.evaluate("alice", "auth.login", {"risk_score": score, "hour": 12})
+
+        assert len(engine._memo) == 1
+
+    def test_rules_file_hot_reload(self, app, tmp_path):
+        """Changing the rules file swaps the engine without a restart."""
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps([{"id": "deny_all", "decision": "deny"}]))
+        app.config.update(POLICY_RULES_FILE=str(rules_file), POLICY_RELOAD_INTERVAL=0)
+
+        with app.app_context():
+            assert get_policy_engine().evaluate("a", "auth.login", {})[0] == "deny"
+
+            rules_file.write_text(json.dumps({"rules": []}))
+            os.utime(rules_file, (0, 1))
+            assert get_policy_engine().evaluate("a", "auth.login", {})[0] == "allow"
+
+    def test_deleted_rules_file_keeps_loaded_rules(self, app, tmp_path):
+        """A rules file that disappears after loading leaves the cached engine in place."""
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps([{"id": "deny_all", "decision": "deny"}]))
+        app.config.update(POLICY_RULES_FILE=str(rules_file), POLICY_RELOAD_INTERVAL=0)
+
+        with app.app_context():
+            engine = get_policy_engine()
+            rules_file.unlink()
+
+            assert get_policy_engine() is engine
+            assert get_policy_engine().evaluate("a", "auth.login", {})[0] == "deny"
+
+    @pytest.mark.parametrize("when", [
+        {"hours": 5},
+        {"hours": ["5"]},
+        {"risk_min": "90"},
+        {"risk_max": True},
+        {"roles": "admin"},
+        {"ip_ranges": [10]},
+    ])
+    def test_malformed_condition_types_are_rejected(self, when):
+        """Conditions of the wrong type fail when compiled, not on every evaluation."""
+        with pytest.raises(ValueError, match="condition"):
+            PolicyEngine([{"id": "bad", "decision": "deny", "when": when}])
+
+    @pytest.mark.parametrize("rules", [
+        [{"id": "bad", "decision": "deny", "when": {"hours": 5}}],
+        [{"id": "bad", "decision": "deny", "when": {"risk_min": "90"}}],
+        ["not-a-rule"],
+        {"rules": 7},
+    ])
+    def test_malformed_reload_keeps_previous_rules(self, app, tmp_path, rules):
+        """A reload with badly typed rules keeps serving the previous engine."""
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps([{"id": "deny_all", "decision": "deny"}]))
+        app.config.update(POLICY_RULES_FILE=str(rules_file), POLICY_RELOAD_INTERVAL=0)
+
+        with app.app_context():
+            engine = get_policy_engine()
+            rules_file.write_text(json.dumps(rules))
+            os.utime(rules_file, (0, 1))
+
+            assert get_policy_engine() is engine
+            assert get_policy_engine().evaluate("a", "auth.login", {"risk_score": 95})[0] == "deny"
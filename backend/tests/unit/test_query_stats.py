@@ -0,0 +1,69 @@
+"""Unit tests for per-request SQL statistics."""
+import pytest
+from sqlalchemy import create_engine, text
+
+from backend.utils.query_stats import assert_max_queries, collect_queries, fingerprint
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+    yield engine
+    engine.dispose()
+
+
+class TestFingerprint:
+    """Test fingerprint."""
+
+    def test_parameters_and_literals_collapse(self):
+        """Statements differing only in values share a fingerprint."""
+        assert fingerprint("SELECT * FROM t WHERE id = :id_1") == fingerprint("SELECT *  FROM t\nWHERE id = 42")
+        assert fingerprint("SELECT * FROM t WHERE name = 'a''b'") == "SELECT * FROM t WHERE name = ?"
+
+    def test_expanded_in_lists_collapse(self):
+        """IN lists of any length map to one fingerprint."""
+        assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (?)"
+        assert fingerprint("SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == "SELECT * FROM t WHERE id IN (?)"
+
+    def test_identifiers_with_digits_are_kept(self):
+        """Digits inside names are not literals."""
+        assert fingerprint("SELECT t1.col_2 FROM t1") == "SELECT t1.col_2 FROM t1"
+
+
+class TestCollectQueries:
+    """Test collect_queries and assert_max_queries."""
+
+    def test_counts_repeats_and_time(self, engine):
+        """Each execution is counted and grouped under its fingerprint."""
+        with collect_queries() as stats, engine.connect() as connection:
+            for item_id in range(6):
+                connection.execute(text("SELECT name FROM items WHERE id = :id"), {"id": item_id})
+        assert stats.count == 6
+        assert stats.seconds > 0
+        assert stats.repeated(5) == [("SELECT name FROM items WHERE id = ?", 6)]
+        assert stats.server_timing().endswith('desc="6 queries"')
+
+    def test_nested_collectors_both_record(self, engine):
+        """An outer collector sees statements recorded by an inner one."""
+        with collect_queries() as outer, engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            with collect_queries() as inner:
+                connection.execute(text("SELECT 2"))
+        assert (outer.count, inner.count) == (2, 1)
+
+    def test_nothing_recorded_outside_a_collector(self, engine):
+        """Statements run outside every collector are ignored."""
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        with collect_queries() as stats:
+            pass
+        assert stats.count == 0
+
+    def test_assert_max_queries_reports_statements(self, engine):
+        """Exceeding the limit fails with the offending statements."""
+        with pytest.raises(AssertionError, match=r"at most 1 queries, got 2:\n  2x SELECT \?"):
+            with assert_max_queries(1), engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
@@ -0,0 +1,84 @@
+"""Unit tests for the memory-mapped rate limit storage."""
+import multiprocessing
+import time
+
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+from backend.utils.ratelimit_storage import MmapStorage
+
+
+def _hammer(uri, key, times):
+    storage = storage_from_string(uri)
+    for _ in range(times):
+        storage.incr(key, 60)
+
+
+class TestMmapStorage:
+    """Test MmapStorage."""
+
+    def test_counters_expire_and_clear(self, tmp_path):
+        """Counters increment, expire after their window and can be cleared."""
+        storage = MmapStorage(f"mmap://{tmp_path}/rl.bin?slots=256&stripes=4")
+
+        assert storage.incr("a", 60) == 1
+        assert storage.incr("a", 60, amount=2) == 3
+        assert storage.get("a") == 3
+        assert storage.get_expiry("a") > time.time()
+
+        storage.incr("short", 0.05)
+        time.sleep(0.1)
+        assert storage.get("short") == 0
+        assert storage.incr("short", 60) == 1
+
+        storage.clear("a")
+        assert storage.get("a") == 0
+        assert storage.get("short") == 1
+
+    def test_path_is_required(self):
+        """Without a file path there is no default location to fall back to."""
+        with pytest.raises(ValueError, match="file path"):
+            MmapStorage("mmap://")
+
+    def test_full_probe_chain_fails_closed(self, tmp_path):
+        """A key with no free slot is refused rather than evicting a live counter."""
+        storage = MmapStorage(f"mmap://{tmp_path}/rl.bin?slots=2&stripes=1")
+        item = parse("3/minute")
+        limiter = FixedWindowRateLimiter(storage)
+
+        assert storage.incr("a", 60, amount=2) == 2
+        storage.incr("short", 0.05)
+        assert storage.incr("b", 60) > item.amount
+        assert not limiter.hit(item, "b")
+        assert not SlidingWindowCounterRateLimiter(storage).hit(item, "b")
+        assert storage.get("a") == 2
+
+        time.sleep(0.1)
+        assert storage.incr("b", 60) == 1
+        assert storage.get("a") == 2
+
+    def test_strategies(self, tmp_path):
+        """Fixed and sliding window strategies enforce limits on the storage."""
+        storage = storage_from_string(f"mmap://{tmp_path}/rl.bin")
+        item = parse("3/minute")
+
+        for strategy in (FixedWindowRateLimiter, SlidingWindowCounterRateLimiter):
+            limiter = strategy(storage)
+            assert [limiter.hit(item, strategy.__name__) for _ in range(4)] == [True, True, True, False]
+            limiter.clear(item, strategy.__name__)
+            assert limiter.hit(item, strategy.__name__)
+
+    def test_counters_are_shared_between_processes(self, tmp_path):
+        """Increments from several worker processes are neither lost nor duplicated."""
+        uri = f"mmap://{tmp_path}/rl.bin?slots=256&stripes=4"
+        storage = MmapStorage(uri)
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_hammer, args=(uri, "shared", 200)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert storage.get("shared") == 800
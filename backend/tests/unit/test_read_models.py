@@ -0,0 +1,50 @@
+"""Unit tests for read-model list serialization."""
+from datetime import datetime, timedelta, timezone
+import json
+
+from backend.api.models import AuditEvent, LearningSession, Pipeline
+from backend.api.read_models import AUDIT_EVENT_LIST, PIPELINE_LIST, SESSION_LIST
+from backend.utils.db import get_session
+
+
+def _rows(read_model, model):
+    return get_session().execute(read_model.select().order_by(model.id)).all()
+
+
+class TestReadModel:
+    """Test ReadModel."""
+
+    def test_matches_to_dict(self, app):
+        """Rows serialize to the same objects as the ORM to_dict helpers."""
+        session = get_session()
+        started = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+        session.add_all([
+            LearningSession(title='Quotes "and" \\ backé', status="completed", difficulty=None,
+                            started_at=started, completed_at=started + timedelta(hours=2)),
+            LearningSession(title="Second", description="Line\nbreak"),
+            Pipeline(name="build", owner="ci", status="success", duration_minutes=2.5, run_number=7),
+            Pipeline(name="deploy", owner="ci"),
+        ])
+        session.flush()
+
+        for read_model, model in ((SESSION_LIST, LearningSession), (PIPELINE_LIST, Pipeline)):
+            expected = [record.to_dict() for record in session.query(model).order_by(model.id)]
+            assert json.loads(read_model.dumps(_rows(read_model, model))) == expected
+
+    def test_naive_datetimes_are_utc_only_when_asked(self, app):
+        """SQLite returns naive datetimes; sessions render them as UTC, others as stored."""
+        session = get_session()
+        session.add_all([LearningSession(title="t"), AuditEvent(event_type="e", payload="{}")])
+        session.flush()
+
+        created = json.loads(SESSION_LIST.dumps(_rows(SESSION_LIST, LearningSession)))[0]["created_at"]
+        event = json.loads(AUDIT_EVENT_LIST.dumps(_rows(AUDIT_EVENT_LIST, AuditEvent)))[0]
+        assert created.endswith("+00:00")
+        assert event["created_at"] == session.query(AuditEvent).one().created_at.isoformat()
+
+    def test_response_envelope(self, app):
+        """Extra fields join the row array in one JSON object."""
+        with app.test_request_context():
+            response = SESSION_LIST.response("data", [], next_cursor=None)
+        assert response.mimetype == "application/json"
+        assert json.loads(response.get_data()) == {"data": [], "next_cursor": None}
@@ -1,4 +1,6 @@
 """Unit tests for repository pattern."""
+from types import SimpleNamespace
+
 import pytest
 from backend.api.repositories import AdminRepository, PipelineRepository
 from backend.tests.factories import AdminUserFactory, PipelineFactory
@@ -76,3 +78,201 @@ class TestPipelineRepository:
         assert stats['successful'] == 2
         assert stats['failed'] == 1
         assert stats['success_rate'] > 0
+
+
+class TestBaseRepositoryBulk:
+    """Test bulk and upsert operations on BaseRepository."""
+
+    def test_bulk_create_and_update(self, app):
+        """Rows are inserted and updated in batches with defaults applied."""
+        from backend.api.models import Pipeline
+
+        repo = PipelineRepository()
+        created = repo.bulk_create(
+            [{"name": f"p{i}", "owner": "bulk", "run_id": f"run-{i}"} for i in range(50)], returning=True
+        )
+        assert len(created) == 50
+        assert all(p.status == "queued" and p.created_at is not None for p in created)
+
+        updated = repo.bulk_update([{"id": p.id, "status": "success"} for p in created[:20]])
+        assert updated == 20
+        assert repo.count(status="success") == 20
+        assert repo.session.query(Pipeline).filter(Pipeline.status == "queued").count() == 30
+
+    def test_upsert_updates_conflicting_rows(self, app):
+        """Rows colliding on the conflict key are updated, others inserted."""
+        repo = PipelineRepository()
+        repo.bulk_create([{"name": "old", "owner": "a", "run_id": "r1"}])
+
+        repo.upsert(
+            [{"name": "new", "owner": "b", "run_id": "r1"}, {"name": "fresh", "owner": "c", "run_id": "r2"}],
+            conflict_keys=["run_id"],
+            update_fields=["name"],
+        )
+
+        repo.session.expire_all()
+        first = repo.get_one(run_id="r1")
+        assert (first.name, first.owner) == ("new", "a")
+        assert repo.get_one(run_id="r2").name == "fresh"
+        assert repo.count(owner="c") == 1
+
+    def test_upsert_rejects_unsupported_dialect(self, app, monkeypatch):
+        """Databases without ON CONFLICT raise ValueError."""
+        repo = PipelineRepository()
+        monkeypatch.setattr(
+            repo.session, "get_bind", lambda **kwargs: SimpleNamespace(dialect=SimpleNamespace(name="mysql"))
+        )
+        with pytest.raises(ValueError, match="mysql"):
+            repo.upsert([{"name": "p", "owner": "a", "run_id": "r1"}], conflict_keys=["run_id"])
+
+    def test_delete_where_and_exists(self, app):
+        """delete_where removes matching rows in one statement; exists stops at one."""
+        repo = PipelineRepository()
+        repo.bulk_create([{"name": f"p{i}", "owner": "gc" if i % 2 else "keep"} for i in range(10)])
+
+        assert repo.exists(owner="gc") is True
+        assert repo.delete_where(owner="gc") == 5
+        assert repo.exists(owner="gc") is False
+        assert repo.count(owner="keep") == 5
+
+    def test_delete_where_requires_filter(self, app):
+        """An unfiltered delete is refused."""
+        with pytest.raises(ValueError):
+            PipelineRepository().delete_where()
+
+    def test_commit_option(self, app):
+        """commit=True makes the rows survive a rollback of the session."""
+        repo = PipelineRepository()
+        repo.bulk_create([{"name": "kept", "owner": "x"}], commit=True)
+        repo.create(name="dropped", owner="x")
+        repo.session.rollback()
+
+        assert repo.exists(name="kept") is True
+        assert repo.exists(name="dropped") is False
+
+
+class TestBaseRepositoryAggregation:
+    """Test streaming iteration and GROUP BY aggregation on BaseRepository."""
+
+    def test_iter_all_streams_in_batches(self, app):
+        """iter_all yields every matching entity in primary key order."""
+        repo = PipelineRepository()
+        repo.bulk_create([{"name": f"p{i}", "owner": "even" if i % 2 == 0 else "odd"} for i in range(25)])
+
+        streamed = list(repo.iter_all(batch_size=4, owner="even"))
+
+        assert len(streamed) == 13
+        assert [p.id for p in streamed] == sorted(p.id for p in streamed)
+
+    def test_aggregate_groups_in_one_query(self, app):
+        """Metrics are computed per group by a single statement."""
+        from sqlalchemy import func
+        from backend.api.models import Pipeline
+        from backend.utils.query_stats import assert_max_queries
+
+        repo = PipelineRepository()
+        repo.bulk_create([
+            {"name": "a", "owner": "x", "status": "success", "duration_minutes": 2.0},
+            {"name": "b", "owner": "x", "status": "success", "duration_minutes": 4.0},
+            {"name": "c", "owner": "y", "status": "failed", "duration_minutes": 9.0},
+        ])
+
+        with assert_max_queries(1):
+            rows = repo.aggregate(
+                group_by=["status"],
+                metrics={"n": func.count(), "avg_duration": func.avg(Pipeline.duration_minutes)},
+            )
+        by_status = {row["status"]: row for row in rows}
+        assert by_status["success"]["n"] == 2
+        assert by_status["success"]["avg_duration"] == pytest.approx(3.0)
+
+        assert repo.aggregate(metrics={"n": func.count()}, owner="x") == [{"n": 2}]
+
+    def test_get_statistics_is_one_round_trip(self, app):
+        """Statistics for every status come from a single query."""
+        from backend.utils.query_stats import assert_max_queries
+
+        repo = PipelineRepository()
+        repo.bulk_create([
+            {"name": "a", "owner": "x", "status": "success", "duration_minutes": 2.0},
+            {"name": "b", "owner": "x", "status": "failed", "duration_minutes": 4.0},
+            {"name": "c", "owner": "x", "status": "running"},
+        ])
+
+        with assert_max_queries(1):
+            stats = repo.get_statistics()
+
+        assert (stats["total"], stats["successful"], stats["failed"], stats["running"]) == (3, 1, 1, 1)
+        assert stats["avg_build_time"] == 3.0
+
+
+class TestBaseRepositoryQueryDSL:
+    """Test filter lookups, ordering and keyset pagination on BaseRepository."""
+
+    def test_lookups(self, app):
+        """Range, in, prefix and null lookups combine with AND."""
+        repo = PipelineRepository()
+        repo.bulk_create([
+            {"name": "build_1", "owner": "a", "duration_minutes": 1.0},
+            {"name": "build%2", "owner": "b", "duration_minutes": 5.0},
+            {"name": "deploy", "owner": "c", "duration_minutes": 9.0},
+            {"name": "buildX", "owner": "d"},
+        ])
+
+        assert {p.name for p in repo.find(duration_minutes__gte=5.0)} == {"build%2", "deploy"}
+        assert {p.owner for p in repo.find(owner__in=["a", "c", "z"])} == {"a", "c"}
+        assert [p.name for p in repo.find(name__startswith="build%")] == ["build%2"]
+        assert [p.name for p in repo.find(name__startswith="build_")] == ["build_1"]
+        assert [p.owner for p in repo.find(duration_minutes__is_null=True)] == ["d"]
+        assert repo.count(name__like="build%", duration_minutes__lt=5.0) == 1
+
+    def test_none_matches_null_like_count(self, app):
+        """field=None finds NULLs and field__ne=None the rest, as count() does."""
+        repo = PipelineRepository()
+        repo.bulk_create([{"name": "a", "owner": "x", "branch": "main"}, {"name": "b", "owner": "x"}])
+
+        assert [p.name for p in repo.find(branch=None)] == ["b"]
+        assert [p.name for p in repo.find(branch__ne=None)] == ["a"]
+        assert repo.count(branch=None) == len(repo.find(branch=None)) == 1
+
+    def test_unknown_field_or_lookup_is_rejected(self, app):
+        """Misspelt filters raise instead of being silently ignored."""
+        repo = PipelineRepository()
+        with pytest.raises(ValueError):
+            repo.find(stauts="success")
+        with pytest.raises(ValueError):
+            repo.find(status__around="success")
+        with pytest.raises(ValueError):
+            repo.find(order_by=["-nope"])
+
+    def test_keyset_pagination_walks_every_row_once(self, app):
+        """Pages follow a descending order with ties broken by primary key."""
+        repo = PipelineRepository()
+        repo.bulk_create([{"name": f"p{i}", "owner": "k", "duration_minutes": float(i % 3)} for i in range(11)])
+
+        seen, after = [], None
+        while True:
+            page = repo.paginate(limit=4, order_by=["-duration_minutes"], after=after, owner="k")
+            seen.extend(page.items)
+            after = page.after
+            if after is None:
+                break
+
+        assert len(seen) == 11 == len({p.id for p in seen})
+        assert [p.duration_minutes for p in seen] == sorted((p.duration_minutes for p in seen), reverse=True)
+
+    def test_repeated_shapes_reuse_compiled_statements(self, app):
+        """The same query shape with other values hits both statement caches."""
+        from backend.api.repositories.base import statement_cache_info
+        from backend.utils.query_stats import collect_queries
+
+        repo = PipelineRepository()
+        repo.find(order_by=["-created_at"], limit=5, owner="first", status__in=["queued"])
+        hits = statement_cache_info().hits
+
+        with collect_queries() as stats:
+            repo.find(order_by=["-created_at"], limit=10, owner="second", status__in=["success", "failed"])
+
+        assert statement_cache_info().hits == hits + 1
+        assert stats.cache["hit"] == 1
+        assert stats.cache_hit_rate == 1.0
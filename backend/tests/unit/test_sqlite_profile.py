@@ -0,0 +1,88 @@
+"""Unit tests for the SQLite production profile."""
+import threading
+
+from flask import Flask
+from sqlalchemy import text
+
+from backend.utils.db import _create_engine, run_sqlite_maintenance
+
+
+def _engine(tmp_path, **config):
+    app = Flask(__name__)
+    app.config.update({"SQLITE_BUSY_TIMEOUT_MS": 2000, **config})
+    return _create_engine(app, f"sqlite:///{tmp_path}/profile.db", "primary")
+
+
+class TestSqliteProfile:
+    """Test apply_sqlite_profile."""
+
+    def test_pragmas_applied_to_every_connection(self, tmp_path):
+        """Each pooled connection gets WAL, busy_timeout and the other pragmas."""
+        engine = _engine(tmp_path)
+        first, second = engine.raw_connection(), engine.raw_connection()
+        for connection in (first, second):
+            cursor = connection.cursor()
+            pragma = lambda name: cursor.execute(f"PRAGMA {name}").fetchone()[0]  # noqa: E731
+            assert pragma("journal_mode") == "wal"
+            assert pragma("busy_timeout") == 2000
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("temp_store") == 2  # MEMORY
+            assert pragma("cache_size") == -64 * 1024
+        first.close()
+        second.close()
+        engine.dispose()
+
+    def test_concurrent_writers_wait_instead_of_failing(self, tmp_path):
+        """Writers from several threads all commit; maintenance runs alongside."""
+        engine = _engine(tmp_path)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE hits (id INTEGER PRIMARY KEY, worker INTEGER)"))
+
+        errors = []
+
+        def write(worker):
+            try:
+                for _ in range(25):
+                    with engine.begin() as connection:
+                        connection.execute(text("INSERT INTO hits (worker) VALUES (:w)"), {"w": worker})
+                        connection.execute(text("SELECT count(*) FROM hits")).scalar()
+            except Exception as exc:  # pragma: no cover - reported by the assertion below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        run_sqlite_maintenance(engine, optimize=True)
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT count(*) FROM hits")).scalar() == 100
+        engine.dispose()
+
+    def test_reads_do_not_hold_the_write_lock(self, tmp_path):
+        """A transaction that has only read leaves the write lock to others."""
+        engine = _engine(tmp_path, SQLITE_BUSY_TIMEOUT_MS=100)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE hits (id INTEGER PRIMARY KEY, worker INTEGER)"))
+
+        with engine.begin() as reader:
+            reader.execute(text("SELECT count(*) FROM hits")).scalar()
+            with engine.begin() as writer:
+                writer.execute(text("INSERT INTO hits (worker) VALUES (1)"))
+        engine.dispose()
+
+    def test_write_after_read_survives_a_concurrent_commit(self, tmp_path):
+        """The first write takes the lock afresh instead of failing on a stale snapshot."""
+        engine = _engine(tmp_path)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE hits (id INTEGER PRIMARY KEY, worker INTEGER)"))
+
+        with engine.begin() as first:
+            assert first.execute(text("SELECT count(*) FROM hits")).scalar() == 0
+            with engine.begin() as second:
+                second.execute(text("INSERT INTO hits (worker) VALUES (2)"))
+            first.execute(text("INSERT INTO hits (worker) VALUES (1)"))
+            assert first.execute(text("SELECT count(*) FROM hits")).scalar() == 2
+        engine.dispose()
@@ -0,0 +1,119 @@
+"""Database bootstrap run by each worker at startup, and boot timing.
+
+When the database is already migrated to the Alembic head, ``create_all`` and
+its per-table reflection queries are skipped. Any remaining one-time work runs
+under a lock (a Postgres advisory lock, else a file lock), so workers booting
+together do it once instead of racing.
+"""
+from contextlib import contextmanager
+from functools import lru_cache
+import os
+import time
+from typing import Iterator, Optional, Tuple
+
+from flask import Flask
+from sqlalchemy import inspect, text
+
+from backend.utils.db import Base
+from backend.utils.metrics import WORKER_TIME_TO_FIRST_REQUEST
+from backend.utils.security import default_admin_needed, ensure_default_admin
+
+# Arbitrary constant identifying the bootstrap in pg_advisory_lock.
+BOOTSTRAP_LOCK_KEY = 0x424F4F54
+
+_process_started = time.monotonic()
+
+
+def _reset_process_start() -> None:
+    global _process_started
+    _process_started = time.monotonic()
+
+
+# A forked worker's boot starts at the fork, not when the master imported us.
+os.register_at_fork(after_in_child=_reset_process_start)
+
+
+@lru_cache(maxsize=None)
+def alembic_heads(script_location: str) -> Tuple[str, ...]:
+    """Return the head revisions of the migration scripts (read once per process)."""
+    from alembic.script import ScriptDirectory
+
+    return tuple(sorted(ScriptDirectory(script_location).get_heads()))
+
+
+def schema_is_current(engine, script_location: Optional[str]) -> bool:
+    """True when the database's alembic_version matches the migration heads."""
+    if not script_location or not os.path.isdir(script_location):
+        return False
+    with engine.connect() as connection:
+        # Checked first so unmigrated databases never pay for importing alembic.
+        if not inspect(connection).has_table("alembic_version"):
+            return False
+        from alembic.runtime.migration import MigrationContext
+
+        current = tuple(sorted(MigrationContext.configure(connection).get_current_heads()))
+    return bool(current) and current == alembic_heads(script_location)
+
+
+@contextmanager
+def bootstrap_lock(engine, lock_file: str) -> Iterator[None]:
+    """Block until this process holds the bootstrap lock."""
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+            try:
+                yield
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+        return
+
+    import fcntl
+
+    with open(lock_file, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        yield  # closing the file releases the flock
+
+
+def _count_existing_sessions() -> None:
+    """Fill a newly created statistics table from sessions stored before it existed."""
+    from backend.api.services.learning_session_stats import rebuild_session_stats
+    from backend.utils.db import get_session
+
+    if rebuild_session_stats():
+        get_session().commit()
+
+
+def bootstrap_database(app: Flask, engine) -> None:
+    """Create missing tables and the default admin, doing nothing when both exist."""
+    started = time.perf_counter()
+    schema_current = schema_is_current(engine, app.config.get("ALEMBIC_SCRIPT_LOCATION"))
+    with app.app_context():
+        if schema_current and not default_admin_needed():
+            app.logger.info("Database at migration head; bootstrap skipped (%.3fs)", time.perf_counter() - started)
+            return
+
+        with bootstrap_lock(engine, app.config["BOOTSTRAP_LOCK_FILE"]):
+            if not schema_current:
+                inspector = inspect(engine)
+                count_sessions = inspector.has_table("learning_sessions") and not inspector.has_table(
+                    "learning_session_aggregates"
+                )
+                Base.metadata.create_all(bind=engine)
+                if count_sessions:
+                    _count_existing_sessions()
+            ensure_default_admin()
+    app.logger.info("Database bootstrap finished in %.3fs", time.perf_counter() - started)
+
+
+def init_boot_timing(app: Flask) -> None:
+    """Report how long each worker took from process start to its first response."""
+    served = {"pid": None}
+
+    @app.after_request
+    def _record_first_request(response):
+        if served["pid"] != os.getpid():
+            served["pid"] = os.getpid()
+            elapsed = time.monotonic() - _process_started
+            WORKER_TIME_TO_FIRST_REQUEST.observe(elapsed)
+            app.logger.info("Worker %d served its first request %.2fs after start", os.getpid(), elapsed)
+        return response
@@ -0,0 +1,35 @@
+"""Flask-Caching instance created the first time something caches through it.
+
+Importing flask_caching and connecting its backend is skipped entirely in
+workers that never use the cache.
+"""
+import threading
+
+from flask import current_app
+
+_lock = threading.Lock()
+
+
+def cache_config(app) -> dict:
+    config = {
+        "CACHE_TYPE": app.config.get("CACHE_TYPE", "simple"),
+        "CACHE_DEFAULT_TIMEOUT": app.config.get("CACHE_DEFAULT_TIMEOUT", 300),
+    }
+    if app.config.get("CACHE_TYPE") == "redis":
+        config["CACHE_REDIS_URL"] = app.config.get("CACHE_REDIS_URL")
+    return config
+
+
+def get_cache():
+    """Return the app's ``flask_caching.Cache``, creating it on first use."""
+    app = current_app._get_current_object()
+    cache = app.extensions.get("cache_instance")
+    if cache is None:
+        with _lock:
+            cache = app.extensions.get("cache_instance")
+            if cache is None:
+                from flask_caching import Cache
+
+                cache = Cache(app, config=cache_config(app))
+                app.extensions["cache_instance"] = cache
+    return cache
@@ -1,32 +1,411 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker, declarative_base
+from functools import wraps
+import itertools
+import os
+import threading
+import time
+
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, scoped_session, sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
+
+from backend.utils.metrics import (
+    DB_COMMITS_PER_REQUEST,
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_CONNECTIONS,
+    DB_POOL_OVERFLOW_OPENED,
+)
 
 Base = declarative_base()
 
 _engine = None
+_replicas = None
 SessionLocal = None
 
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout latency, usage and overflow to Prometheus."""
+
+    label = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(pool=self.label).inc()
+            raise
+        DB_POOL_CHECKOUT_SECONDS.labels(pool=self.label).observe(time.perf_counter() - start)
+        self._report()
+        return record
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._report()
+
+    def _inc_overflow(self) -> bool:
+        opened = super()._inc_overflow()
+        if opened and self._overflow > 0:
+            DB_POOL_OVERFLOW_OPENED.labels(pool=self.label).inc()
+        return opened
+
+    def _report(self) -> None:
+        DB_POOL_CONNECTIONS.labels(pool=self.label, state="in_use").set(self.checkedout())
+        DB_POOL_CONNECTIONS.labels(pool=self.label, state="idle").set(self.checkedin())
+        DB_POOL_CONNECTIONS.labels(pool=self.label, state="overflow").set(max(self.overflow(), 0))
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.label = self.label
+        return pool
+
+
+def is_sqlite_file(db_url) -> bool:
+    url = make_url(db_url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def pool_options(app, db_url) -> dict:
+    """Return QueuePool settings from config, or none for in-memory SQLite."""
+    if make_url(db_url).get_backend_name() == "sqlite" and not is_sqlite_file(db_url):
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": app.config.get("DB_POOL_SIZE", 5),
+        "max_overflow": app.config.get("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": app.config.get("DB_POOL_TIMEOUT", 30),
+        "pool_use_lifo": app.config.get("DB_POOL_USE_LIFO", True),
+    }
+
+
+# Statements that write, or a savepoint that a later write would otherwise cut through.
+_SQLITE_WRITE_KEYWORDS = frozenset(
+    {"INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER", "SAVEPOINT"}
+)
+
+
+def apply_sqlite_profile(engine, settings) -> None:
+    """Tune every new connection of a file-backed SQLite engine for concurrent workers.
+
+    WAL lets readers run alongside the single writer, ``busy_timeout`` makes
+    writers queue instead of failing with "database is locked", and
+    ``synchronous=NORMAL`` only fsyncs at checkpoints.
+
+    Transactions start deferred, so reads (and slow work between them, such as
+    password hashing) never hold the write lock. With ``SQLITE_BEGIN_MODE``
+    IMMEDIATE, the first write statement of a transaction first ends the
+    read-only part and reopens it with ``BEGIN IMMEDIATE``, queueing on
+    ``busy_timeout`` for the write lock. A deferred transaction that reads and
+    then writes would instead fail at once if another writer committed in
+    between. Nothing has been written before that point, so ending the
+    transaction loses nothing. Reads before the first write see committed data
+    as of their own statement, as under PostgreSQL's READ COMMITTED.
+    """
+    pragmas = [
+        f"PRAGMA journal_mode={settings.get('SQLITE_JOURNAL_MODE', 'WAL')}",
+        f"PRAGMA busy_timeout={int(settings.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+        f"PRAGMA synchronous={settings.get('SQLITE_SYNCHRONOUS', 'NORMAL')}",
+        f"PRAGMA mmap_size={int(settings.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}",
+        f"PRAGMA cache_size=-{int(settings.get('SQLITE_CACHE_SIZE_KB', 64 * 1024))}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    upgrade_on_write = settings.get("SQLITE_BEGIN_MODE", "IMMEDIATE").upper() == "IMMEDIATE"
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself instead of the driver's implicit one.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _begin_sqlite_transaction(connection):
+        connection.exec_driver_sql("BEGIN DEFERRED")
+        connection.info["sqlite_write_lock"] = False
+
+    if not upgrade_on_write:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _take_write_lock(connection, cursor, statement, parameters, context, executemany):
+        if connection.info.get("sqlite_write_lock", True) or not connection.in_transaction():
+            return
+        if statement.lstrip().split(None, 1)[0].upper() not in _SQLITE_WRITE_KEYWORDS:
+            return
+        connection.info["sqlite_write_lock"] = True
+        cursor.execute("COMMIT")
+        cursor.execute("BEGIN IMMEDIATE")
+
+
+def run_sqlite_maintenance(engine, optimize: bool = False) -> None:
+    """Checkpoint the WAL without blocking readers, optionally refreshing planner stats."""
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        if optimize:
+            cursor.execute("PRAGMA optimize")
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def start_sqlite_maintenance(app) -> None:
+    """Start this process's checkpoint/optimize thread once; safe to call per request."""
+    pid, _ = app.extensions.get("sqlite_maintenance", (None, None))
+    if pid == os.getpid():
+        return
+
+    interval = app.config.get("SQLITE_CHECKPOINT_INTERVAL", 60)
+    optimize_every = max(1, app.config.get("SQLITE_OPTIMIZE_INTERVAL", 3600) // max(interval, 1))
+
+    def loop() -> None:
+        for run in itertools.count(1):
+            time.sleep(interval)
+            try:
+                run_sqlite_maintenance(get_engine(), optimize=run % optimize_every == 0)
+            except exc.DBAPIError as error:
+                app.logger.warning("SQLite maintenance failed: %s", error)
+
+    thread = threading.Thread(target=loop, name="sqlite-maintenance", daemon=True)
+    app.extensions["sqlite_maintenance"] = (os.getpid(), thread)
+    thread.start()
+
+
+def _create_engine(app, db_url, label: str):
+    options = {**pool_options(app, db_url), **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})}
+    engine = create_engine(db_url, **options)
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.label = label
+    if is_sqlite_file(db_url) and app.config.get("SQLITE_PROFILE_ENABLED", True):
+        apply_sqlite_profile(engine, app.config)
+    return engine
+
+
+class ReplicaSet:
+    """Round-robin over replica engines, skipping ones that failed a health check.
+
+    A replica that errors is taken out of rotation for ``retry_interval``
+    seconds; once that passes it must answer ``SELECT 1`` before it is used
+    again. With no healthy replica, reads fall back to the primary.
+    """
+
+    def __init__(self, engines, retry_interval: float = 10):
+        self.engines = list(engines)
+        self.retry_interval = retry_interval
+        self._down_until = {}
+        self._cycle = itertools.cycle(self.engines) if self.engines else None
+        self._lock = threading.Lock()
+        for engine in self.engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        if context.is_disconnect or isinstance(context.original_exception, exc.OperationalError):
+            engine = context.engine or (context.connection.engine if context.connection else None)
+            if engine is not None:
+                self.mark_down(engine)
+
+    def mark_down(self, engine) -> None:
+        self._down_until[engine] = time.monotonic() + self.retry_interval
+
+    def _healthy(self, engine) -> bool:
+        down_until = self._down_until.get(engine)
+        if down_until is None:
+            return True
+        if time.monotonic() < down_until:
+            return False
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except exc.DBAPIError:
+            self.mark_down(engine)
+            return False
+        self._down_until.pop(engine, None)
+        return True
+
+    def choose(self):
+        """Return a healthy replica engine, or None."""
+        if self._cycle is None:
+            return None
+        for _ in range(len(self.engines)):
+            with self._lock:
+                engine = next(self._cycle)
+            if self._healthy(engine):
+                return engine
+        return None
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica while ``info["read_only"]`` is set.
+
+    Flushes, DML statements and any read after this session has written go to
+    the primary, so a request always sees its own writes. ``info["pin_primary"]``
+    keeps every statement on the primary. A read that fails on a replica with a
+    connection-level error is run once more on the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            _replicas is not None
+            and self.info.get("read_only")
+            and not self.info.get("has_writes")
+            and not self.info.get("pin_primary")
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+        ):
+            replica = _replicas.choose()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _remember_writes(session, flush_context) -> None:
+    session.info["has_writes"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _count_commits(session) -> None:
+    session.info["commits"] = session.info.get("commits", 0) + 1
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _remember_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _retry_replica_reads_on_primary(orm_execute_state):
+    if _replicas is None or not orm_execute_state.is_select or "bind" in orm_execute_state.bind_arguments:
+        return None
+    session = orm_execute_state.session
+    bind = session.get_bind(mapper=orm_execute_state.bind_mapper, clause=orm_execute_state.statement)
+    if bind is _engine:
+        return None
+    try:
+        return orm_execute_state.invoke_statement(bind_arguments={"bind": bind})
+    except exc.DBAPIError as error:
+        if not (error.connection_invalidated or isinstance(error, exc.OperationalError)):
+            raise
+        _replicas.mark_down(bind)
+        return orm_execute_state.invoke_statement(bind_arguments={"bind": _engine})
+
+
+def read_only(fn):
+    """Run ``fn`` with the current session's reads routed to a replica."""
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        session = get_session()
+        previous = session.info.get("read_only", False)
+        session.info["read_only"] = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            session.info["read_only"] = previous
+
+    return wrapper
+
+
 def init_db(app):
-    global _engine, SessionLocal
+    global _engine, _replicas, SessionLocal
     if _engine is not None:
         return _engine
 
-    db_url = app.config["SQLALCHEMY_DATABASE_URI"]
-    engine_options = app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})
-
-    _engine = create_engine(db_url, **engine_options)
+    _engine = _create_engine(app, app.config["SQLALCHEMY_DATABASE_URI"], "primary")
+    replica_urls = app.config.get("DATABASE_REPLICA_URLS", [])
+    if replica_urls:
+        replica_engines = [_create_engine(app, url, f"replica-{i}") for i, url in enumerate(replica_urls)]
+        _replicas = ReplicaSet(replica_engines, app.config.get("DB_REPLICA_RETRY_INTERVAL", 10))
     SessionLocal = scoped_session(
-        sessionmaker(bind=_engine, autoflush=False, autocommit=False)
+        sessionmaker(class_=RoutingSession, bind=_engine, autoflush=False, autocommit=False)
     )
+    return _engine
+
+
+def init_unit_of_work(app) -> None:
+    """Commit each request's session once, after the view has returned.
+
+    Services and routes only flush. Successful and redirect responses (below
+    400) are committed; client errors, server errors and unhandled exceptions
+    are rolled back, so a view that rejects a request after changing entities
+    leaves the database untouched. Records that must outlive a rejected
+    request (policy denials, login challenges) are committed explicitly where
+    they are written. The session is removed when the app context ends.
+    """
+
+    @app.after_request
+    def commit_session(response):
+        if SessionLocal is None or not SessionLocal.registry.has():
+            return response
+        session = SessionLocal()
+        if response.status_code < 400 and session.is_active:
+            session.commit()
+        else:
+            session.rollback()
+        return response
+
+    @app.teardown_request
+    def finish_session(exception=None):
+        if SessionLocal is None or not SessionLocal.registry.has():
+            return
+        session = SessionLocal()
+        if exception is not None:
+            session.rollback()
+        DB_COMMITS_PER_REQUEST.observe(session.info.get("commits", 0))
 
     @app.teardown_appcontext
     def remove_session(exception=None):
-        SessionLocal.remove()
+        if SessionLocal is not None:
+            SessionLocal.remove()
+
+
+def prewarm_pool(engine, count: int) -> int:
+    """Open up to ``count`` pooled connections so early requests skip the connect.
+
+    Returns the number of connections opened.
+    """
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+    connections = []
+    try:
+        for _ in range(min(count, engine.pool.size())):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
 
-    return _engine
+
+def dispose_engines(close: bool = True) -> None:
+    """Drop every pooled connection of the primary and replica engines.
+
+    In a forked child pass ``close=False``: the inherited sockets belong to the
+    parent, so they are forgotten rather than closed underneath it.
+    """
+    if SessionLocal is not None:
+        SessionLocal.remove()
+    engines = [_engine] + (_replicas.engines if _replicas is not None else [])
+    for engine in engines:
+        if engine is not None:
+            engine.dispose(close=close)
 
 
 def get_session():
     if SessionLocal is None:
         raise RuntimeError("Database not initialized. Call init_db(app) first.")
     return SessionLocal()
+
+
+def replicas_enabled() -> bool:
+    return _replicas is not None
+
+
+def get_engine():
+    if _engine is None:
+        raise RuntimeError("Database not initialized. Call init_db(app) first.")
+    return _engine
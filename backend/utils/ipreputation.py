@@ -0,0 +1,263 @@
+"""IP reputation lookups backed by binary prefix tries.
+
+Trusted, blocked and scored CIDR ranges are compiled into one trie per address
+family. A lookup walks at most one node per prefix bit and returns the most
+specific matching range, so cost does not grow with the number of ranges.
+
+Range files hold one entry per line: ``<cidr> [trusted|blocked|<score>]``.
+A bare CIDR is treated as blocked so plain blocklist feeds can be used as-is;
+``#`` starts a comment, and invalid lines are logged and skipped. Files are
+read in a background thread, both at first use and whenever their
+modification time changes; until the first read finishes only the configured
+CIDR lists apply and other addresses classify as unknown.
+"""
+from array import array
+from dataclasses import dataclass
+import ipaddress
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from flask import current_app, has_app_context
+
+DEFAULT_TRUSTED_CIDRS = (
+    "10.0.0.0/8",
+    "172.16.0.0/12",
+    "192.168.0.0/16",
+    "127.0.0.0/8",
+    "::1/128",
+    "fc00::/7",
+)
+
+
+@dataclass(frozen=True)
+class IPClass:
+    """Classification of a client address and its risk score adjustment."""
+
+    label: str  # trusted, blocked, scored, unknown
+    score: int
+
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+UNKNOWN = IPClass("unknown", 0)
+TRUSTED = IPClass("trusted", -10)
+BLOCKED = IPClass("blocked", 100)
+
+
+class PrefixTrie:
+    """Binary trie over fixed-width integers, stored in flat arrays.
+
+    Node ``n`` has children at ``children[2n]`` and ``children[2n + 1]`` (0 means
+    none; the root is node 0 and never a child) and ``values[n]`` is an index
+    into the caller's label table, or -1.
+    """
+
+    def __init__(self, bits: int):
+        self.bits = bits
+        self._children = array("I", [0, 0])
+        self._values = array("i", [-1])
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._children) * self._children.itemsize + len(self._values) * self._values.itemsize
+
+    def insert(self, network: int, prefixlen: int, value: int) -> None:
+        children, values = self._children, self._values
+        node = 0
+        for shift in range(self.bits - 1, self.bits - 1 - prefixlen, -1):
+            slot = 2 * node + ((network >> shift) & 1)
+            child = children[slot]
+            if not child:
+                child = len(values)
+                children[slot] = child
+                children.extend((0, 0))
+                values.append(-1)
+            node = child
+        values[node] = value
+
+    def lookup(self, address: int) -> int:
+        """Return the value of the longest prefix containing ``address``, or -1."""
+        children, values = self._children, self._values
+        best = values[0]
+        node = 0
+        shift = self.bits - 1
+        while shift >= 0:
+            node = children[2 * node + ((address >> shift) & 1)]
+            if not node:
+                break
+            if values[node] >= 0:
+                best = values[node]
+            shift -= 1
+        return best
+
+
+class IPReputation:
+    """Longest-prefix classification of IPv4 and IPv6 addresses."""
+
+    def __init__(self, entries: Iterable[Tuple[str, IPClass]] = ()):
+        self._tries = {4: PrefixTrie(32), 6: PrefixTrie(128)}
+        self._labels: List[IPClass] = []
+        self._label_index: Dict[IPClass, int] = {}
+        self.size = 0
+        for cidr, ip_class in entries:
+            self.add(cidr, ip_class)
+
+    def add(self, cidr: Union[str, Network], ip_class: IPClass) -> None:
+        """Add a range; later entries for the same prefix override earlier ones."""
+        if isinstance(cidr, str):
+            network = ipaddress.ip_network(cidr.strip(), strict=False)
+        else:
+            network = cidr
+        index = self._label_index.get(ip_class)
+        if index is None:
+            index = self._label_index[ip_class] = len(self._labels)
+            self._labels.append(ip_class)
+        self._tries[network.version].insert(int(network.network_address), network.prefixlen, index)
+        self.size += 1
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the trie arrays."""
+        return sum(trie.nbytes for trie in self._tries.values())
+
+    def classify(self, address: Optional[str]) -> IPClass:
+        if not address:
+            return UNKNOWN
+        try:
+            # inet_pton is several times faster than ipaddress for the common IPv4 case.
+            index = self._tries[4].lookup(int.from_bytes(socket.inet_pton(socket.AF_INET, address), "big"))
+            return self._labels[index] if index >= 0 else UNKNOWN
+        except OSError:
+            pass
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return UNKNOWN
+        if ip.version == 6 and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        index = self._tries[ip.version].lookup(int(ip))
+        return self._labels[index] if index >= 0 else UNKNOWN
+
+
+def parse_label(label: Optional[str]) -> IPClass:
+    if not label or label == "blocked":
+        return BLOCKED
+    if label == "trusted":
+        return TRUSTED
+    return IPClass("scored", int(label))
+
+
+def read_ranges(path: str, logger: Optional[logging.Logger] = None) -> Iterable[Tuple[Network, IPClass]]:
+    """Yield (network, class) pairs from a range file, skipping invalid lines."""
+    with open(path, encoding="utf-8") as handle:
+        for number, line in enumerate(handle, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            cidr, _, label = line.partition(" ")
+            try:
+                entry = ipaddress.ip_network(cidr, strict=False), parse_label(label.strip())
+            except ValueError as exc:
+                if logger is not None:
+                    logger.warning("Skipping invalid IP range at %s:%d: %s", path, number, exc)
+                continue
+            yield entry
+
+
+def build_reputation(
+    trusted: Iterable[str],
+    blocked: Iterable[str],
+    files: Iterable[str],
+    logger: Optional[logging.Logger] = None,
+) -> IPReputation:
+    reputation = IPReputation()
+    for cidr in trusted:
+        reputation.add(cidr, TRUSTED)
+    for cidr in blocked:
+        reputation.add(cidr, BLOCKED)
+    for path in files:
+        for network, ip_class in read_ranges(path, logger):
+            reputation.add(network, ip_class)
+    return reputation
+
+
+def _file_mtimes(files: List[str]) -> Tuple[Optional[float], ...]:
+    return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in files)
+
+
+def _build_from_config(config, files: Iterable[str] = (), logger: Optional[logging.Logger] = None) -> IPReputation:
+    return build_reputation(
+        config.get("IP_TRUSTED_CIDRS", DEFAULT_TRUSTED_CIDRS),
+        config.get("IP_BLOCKED_CIDRS", ()),
+        files,
+        logger,
+    )
+
+
+def _reload_in_background(app, state: dict, mtimes: tuple) -> None:
+    def rebuild() -> None:
+        try:
+            reputation = _build_from_config(app.config, app.config.get("IP_REPUTATION_FILES", ()), app.logger)
+        except (OSError, ValueError) as exc:
+            app.logger.error("Keeping IP reputation ranges; reload failed: %s", exc)
+        else:
+            state["reputation"] = reputation
+            app.logger.info("Loaded %d IP reputation ranges", reputation.size)
+        finally:
+            state["mtimes"] = mtimes
+            state["reloading"] = False
+
+    state["reloading"] = True
+    state["reload_thread"] = threading.Thread(target=rebuild, name="ip-reputation-reload", daemon=True)
+    state["reload_thread"].start()
+
+
+def get_ip_reputation() -> IPReputation:
+    """Return the app's IP reputation table, loading range files in the background.
+
+    The configured CIDR lists are compiled on first use. Range files are
+    compiled in a background thread, first right away and then whenever they
+    change, and the finished table is swapped in, so large files never stall
+    a request.
+    """
+    if not has_app_context():
+        return _default_reputation()
+
+    state = current_app.extensions.get("ip_reputation")
+    files = list(current_app.config.get("IP_REPUTATION_FILES", ()))
+    now = time.monotonic()
+
+    if state is None:
+        state = {
+            "reputation": _build_from_config(current_app.config),
+            "mtimes": None,
+            "reloading": False,
+            "check_at": now + current_app.config.get("IP_REPUTATION_RELOAD_INTERVAL", 30),
+        }
+        current_app.extensions["ip_reputation"] = state
+        if files:
+            _reload_in_background(current_app._get_current_object(), state, _file_mtimes(files))
+    elif files and now >= state["check_at"] and not state["reloading"]:
+        state["check_at"] = now + current_app.config.get("IP_REPUTATION_RELOAD_INTERVAL", 30)
+        mtimes = _file_mtimes(files)
+        if mtimes != state["mtimes"]:
+            _reload_in_background(current_app._get_current_object(), state, mtimes)
+
+    return state["reputation"]
+
+
+_default: Optional[IPReputation] = None
+
+
+def _default_reputation() -> IPReputation:
+    global _default
+    if _default is None:
+        _default = build_reputation(DEFAULT_TRUSTED_CIDRS, (), ())
+    return _default
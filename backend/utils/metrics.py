@@ -0,0 +1,97 @@
+"""Process-wide Prometheus metrics shared by backend subsystems.
+
+Metrics live in the default ``prometheus_client`` registry so they are exported
+by the ``/metrics`` endpoint that ``PrometheusMetrics`` registers.
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+
+ADMIN_IDENTITY_CACHE_LOOKUPS = Counter(
+    "admin_identity_cache_lookups_total",
+    "Admin identity cache lookups performed by require_admin",
+    ["result"],
+)
+
+KDF_POOL_REJECTIONS = Counter(
+    "password_kdf_pool_rejections_total",
+    "Password hashing jobs rejected because the KDF pool was saturated",
+)
+
+LOGIN_FAILURE_REJECTIONS = Counter(
+    "login_failure_rejections_total",
+    "Login attempts rejected by the failure tracker before password verification",
+)
+
+RATELIMIT_STORAGE_OVERFLOWS = Counter(
+    "ratelimit_storage_overflows_total",
+    "Rate limit hits refused because the shared counter table had no free slot for the key",
+)
+
+POLICY_DECISIONS_RECORDED = Counter(
+    "policy_decisions_recorded_total",
+    "Policy decisions recorded, by whether a full row or only a counter was written",
+    ["mode"],
+)
+
+RETENTION_ROWS_PURGED = Counter(
+    "retention_rows_purged_total",
+    "Rows deleted by the retention engine",
+    ["table"],
+)
+
+RETENTION_LAG_SECONDS = Gauge(
+    "retention_lag_seconds",
+    "Age past its TTL of the oldest row still waiting to be purged",
+    ["table"],
+    multiprocess_mode="max",
+)
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Pooled connections by state (in_use, idle, overflow)",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_OVERFLOW_OPENED = Counter(
+    "db_pool_overflow_connections_total",
+    "Connections opened beyond the pool size",
+    ["pool"],
+)
+
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT seconds",
+    ["pool"],
+)
+
+DB_COMMITS_PER_REQUEST = Histogram(
+    "db_commits_per_request",
+    "Session commits issued while handling one request",
+    buckets=(0, 1, 2, 3, 5, 8),
+)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed while handling one request",
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55),
+)
+
+DB_COMPILED_CACHE = Counter(
+    "db_compiled_cache_total",
+    "Statement executions by SQLAlchemy compiled-statement cache outcome",
+    ["result"],
+)
+
+WORKER_TIME_TO_FIRST_REQUEST = Histogram(
+    "worker_time_to_first_request_seconds",
+    "Time from worker process start to its first response",
+    buckets=(0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60),
+)
@@ -0,0 +1,67 @@
+"""Opaque cursors for keyset-paginated list endpoints.
+
+A cursor carries the ordering values of the last item of a page (see
+``BaseRepository.paginate``) together with the sort it was produced for, as
+URL-safe base64 JSON. Datetimes are tagged so they decode back to datetimes,
+and decoded values are checked against the types of the ordering columns.
+"""
+import base64
+import binascii
+from datetime import datetime
+import json
+from typing import Any, Optional, Sequence, Tuple
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def _matches(value: Any, expected: type) -> bool:
+    if isinstance(value, bool):
+        return expected is bool
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def encode_cursor(after: Optional[Sequence[Any]], sort: str) -> Optional[str]:
+    """Encode ``Page.after`` for the given sort; None stays None (last page)."""
+    if after is None:
+        return None
+    payload = json.dumps({"s": sort, "v": [_encode_value(value) for value in after]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], sort: str, types: Sequence[type] = ()) -> Optional[Tuple[Any, ...]]:
+    """Decode a cursor produced by ``encode_cursor`` for the same sort.
+
+    Args:
+        cursor: Cursor from a previous page, or None/empty for the first page
+        sort: Sort the cursor must have been issued for
+        types: Expected type of each value, e.g. ``BaseRepository.keyset_types``;
+            not checked when empty
+
+    Raises:
+        ValueError: The cursor is malformed or was issued for another sort
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = tuple(_decode_value(value) for value in payload["v"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor.")
+    if payload.get("s") != sort:
+        raise ValueError("Cursor does not match the requested sort.")
+    if types and (len(values) != len(types) or not all(map(_matches, values, types))):
+        raise ValueError("Invalid cursor.")
+    return values
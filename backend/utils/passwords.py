@@ -1,19 +1,111 @@
-"""Password hashing helpers with optional pepper support."""
+"""Password hashing helpers with optional pepper support.
+
+KDF work can be moved off the request threads into a size-limited process pool
+(``PASSWORD_HASH_POOL_SIZE``). When the pool and its queue are full, callers get
+``PasswordHasherBusy`` (HTTP 503) immediately instead of waiting.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Optional
+
 from flask import current_app
-from werkzeug.security import check_password_hash, generate_password_hash
+from werkzeug.exceptions import ServiceUnavailable
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from backend.utils.metrics import KDF_POOL_REJECTIONS
+
+DEFAULT_HASH_METHOD = "scrypt:32768:8:1"
+
+
+class PasswordHasherBusy(ServiceUnavailable):
+    """Raised when the password hashing pool cannot accept more work."""
+
+    description = "Authentication service is busy. Please retry shortly."
+
+
+class KdfPool:
+    """Process pool that rejects work once ``size + queue_limit`` jobs are in flight."""
+
+    def __init__(self, size: int, queue_limit: int):
+        self._executor = ProcessPoolExecutor(max_workers=size, mp_context=multiprocessing.get_context("spawn"))
+        self._slots = threading.BoundedSemaphore(size + queue_limit)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            KDF_POOL_REJECTIONS.inc()
+            raise PasswordHasherBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 
 def _get_pepper() -> str:
     return current_app.config.get("PASSWORD_PEPPER", "") if current_app else ""
 
 
+def _get_method() -> str:
+    return current_app.config.get("PASSWORD_HASH_METHOD", DEFAULT_HASH_METHOD) if current_app else DEFAULT_HASH_METHOD
+
+
+def _get_pool() -> Optional[KdfPool]:
+    """Return this process's KDF pool, or None when hashing runs inline."""
+    if not current_app or current_app.config.get("PASSWORD_HASH_POOL_SIZE", 0) <= 0:
+        return None
+
+    # The pool is created lazily per process so forked workers never inherit one.
+    pid, pool = current_app.extensions.get("kdf_pool", (None, None))
+    if pid != os.getpid():
+        pool = KdfPool(
+            size=current_app.config["PASSWORD_HASH_POOL_SIZE"],
+            queue_limit=current_app.config.get("PASSWORD_HASH_QUEUE_LIMIT", 8),
+        )
+        current_app.extensions["kdf_pool"] = (os.getpid(), pool)
+    return pool
+
+
+def _run_kdf(fn: Callable, *args):
+    pool = _get_pool()
+    if pool is None:
+        return fn(*args)
+    future = pool.submit(fn, *args)
+    try:
+        return future.result(timeout=current_app.config.get("PASSWORD_HASH_TIMEOUT", 10))
+    except FutureTimeout:
+        raise PasswordHasherBusy() from None
+
+
+def normalize_hash_method(method: str) -> str:
+    """Expand a Werkzeug method string to the form stored in hashes."""
+    name, *args = method.split(":")
+    if name == "scrypt" and not args:
+        return DEFAULT_HASH_METHOD
+    if name == "pbkdf2" and len(args) < 2:
+        hash_name = args[0] if args else "sha256"
+        return f"pbkdf2:{hash_name}:{DEFAULT_PBKDF2_ITERATIONS}"
+    return method
+
+
 def hash_password(raw_password: str) -> str:
     """Hash password with optional pepper."""
     pepper = _get_pepper()
-    return generate_password_hash(raw_password + pepper)
+    return _run_kdf(generate_password_hash, raw_password + pepper, _get_method())
 
 
 def verify_password(raw_password: str, hashed: str) -> bool:
     """Verify password with optional pepper."""
     pepper = _get_pepper()
-    return check_password_hash(hashed, raw_password + pepper)
+    return _run_kdf(check_password_hash, hashed, raw_password + pepper)
+
+
+def needs_rehash(hashed: str) -> bool:
+    """Return True when a stored hash uses other parameters than configured."""
+    return hashed.split("$", 1)[0] != normalize_hash_method(_get_method())
@@ -0,0 +1,51 @@
+"""Helpers for servers that build the app once and fork workers from it.
+
+The master imports and configures everything, then freezes the garbage
+collector so objects created up to that point are never traversed again.
+Traversal writes to object headers and would otherwise copy the shared pages
+into every worker. After the fork each worker drops the connections it
+inherited, which still belong to the master.
+"""
+import gc
+import os
+
+from flask import Flask
+
+from backend.utils.db import dispose_engines, get_engine, prewarm_pool
+
+
+def freeze_heap() -> None:
+    """Move every object tracked so far into the permanent generation."""
+    gc.collect()
+    gc.freeze()
+
+
+def _redis_clients(app: Flask):
+    limiter = app.extensions.get("limiter")
+    if limiter is not None:
+        yield getattr(limiter.storage, "storage", None)
+    tracker = app.extensions.get("login_failures")
+    if tracker is not None:
+        yield getattr(tracker.store, "_client", None)
+    cache = app.extensions.get("cache_instance")
+    if cache is not None:
+        backend = cache.cache
+        yield getattr(backend, "_write_client", None)
+        yield getattr(backend, "_read_client", None)
+
+
+def reset_after_fork(app: Flask) -> None:
+    """Make a freshly forked worker safe to serve requests.
+
+    Inherited database and Redis connections are discarded without closing
+    them, the pool is pre-warmed with the worker's own connections, and garbage
+    collection is re-enabled if the master disabled it.
+    """
+    dispose_engines(close=False)
+    for client in _redis_clients(app):
+        pool = getattr(client, "connection_pool", None)
+        if pool is not None:
+            pool.reset()
+    prewarm_pool(get_engine(), app.config.get("DB_POOL_PREWARM", 0))
+    gc.enable()
+    app.logger.info("Worker %d reset inherited connections after fork", os.getpid())
@@ -0,0 +1,143 @@
+"""Per-request SQL statement counts, timings and repeated-statement detection.
+
+Engine events record every cursor execution into the collectors active in the
+current context. A request gets its own collector; tests can open another with
+``assert_max_queries`` to fail when a code path issues more statements than
+expected.
+
+Statements are grouped by fingerprint: whitespace collapsed, literals and
+expanded ``IN`` lists replaced with ``?``. The same fingerprint seen many times
+in one request is the usual signature of an N+1 query.
+
+Each execution of a compiled statement is also classed as a hit or a miss of
+SQLAlchemy's compiled-statement cache, per collector and in the
+``db_compiled_cache_total`` counter. A low hit rate means statements are being
+built with literals or shapes that differ on every call.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+import re
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+
+from backend.utils.metrics import DB_COMPILED_CACHE
+
+_CACHE_RESULTS = {CacheStats.CACHE_HIT: "hit", CacheStats.CACHE_MISS: "miss"}
+_CACHE_COUNTERS = {result: DB_COMPILED_CACHE.labels(result) for result in _CACHE_RESULTS.values()}
+
+_active: ContextVar[Tuple["QueryStats", ...]] = ContextVar("query_stats", default=())
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+_PARAMS = re.compile(r"%\(\w+\)s|:\w+|\$\d+|%s")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalise a SQL statement so executions with other parameters compare equal."""
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _PARAMS.sub("?", _LITERALS.sub("?", text))
+    return _IN_LIST.sub("IN (?)", text)
+
+
+class QueryStats:
+    """Statements executed while this collector was active."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: List[str] = []
+        self.fingerprints: Counter = Counter()
+        self.cache: Counter = Counter()
+
+    def record(self, statement: str, seconds: float, cache_result: Optional[str] = None) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements.append(statement)
+        self.fingerprints[fingerprint(statement)] += 1
+        if cache_result is not None:
+            self.cache[cache_result] += 1
+
+    @property
+    def cache_hit_rate(self) -> Optional[float]:
+        """Share of compiled executions served from the compiled-statement cache."""
+        total = self.cache["hit"] + self.cache["miss"]
+        return self.cache["hit"] / total if total else None
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Return fingerprints executed at least ``threshold`` times, most frequent first."""
+        return [(sql, n) for sql, n in self.fingerprints.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+def start_collecting() -> Tuple[QueryStats, Token]:
+    """Start recording statements executed in this context (thread or task).
+
+    Pass the returned token to ``stop_collecting`` to end the collection.
+    """
+    stats = QueryStats()
+    return stats, _active.set(_active.get() + (stats,))
+
+
+def stop_collecting(token: Token) -> None:
+    _active.reset(token)
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    """Record statements executed inside the block into a new collector."""
+    stats, token = start_collecting()
+    try:
+        yield stats
+    finally:
+        stop_collecting(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail with the executed statements when the block issues more than ``limit``."""
+    with collect_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        listing = "\n".join(f"  {n}x {sql}" for sql, n in stats.fingerprints.most_common())
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.count}:\n{listing}")
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Return the innermost active collector, if any."""
+    active = _active.get()
+    return active[-1] if active else None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _active.get():
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    cache_result = _CACHE_RESULTS.get(getattr(context, "cache_hit", None))
+    if cache_result is not None:
+        _CACHE_COUNTERS[cache_result].inc()
+    active = _active.get()
+    started = conn.info.get("query_started")
+    if not active or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    for stats in active:
+        stats.record(statement, elapsed, cache_result)
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_timer(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
@@ -0,0 +1,227 @@
+"""Rate limit storage shared by all workers on a host through a memory-mapped file.
+
+Importing this module registers the ``mmap://`` scheme with ``limits``, so it
+can be used as a Flask-Limiter ``storage_uri``::
+
+    mmap:///var/run/flask/ratelimit.bin?slots=65536&stripes=64
+
+The file is a fixed-size hash table of ``(key hash, count, expires at)`` slots
+split into stripes. A key only ever lives in its stripe, and each stripe is
+guarded by a thread lock plus an ``fcntl`` record lock, so increments are
+atomic across threads and processes without a network round trip.
+"""
+from contextlib import contextmanager
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from math import floor
+from typing import Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+from backend.utils.metrics import RATELIMIT_STORAGE_OVERFLOWS
+
+_MAGIC = b"RLMMAP01"
+_HEADER = struct.Struct("<8sII")  # magic, stripes, slots per stripe
+_SLOT = struct.Struct("<Qqd")  # key hash (0 = empty), count, expires at (epoch seconds)
+# fcntl record locks are taken on bytes past the table so they never overlap data.
+_LOCK_BASE = 1 << 40
+_MAX_PROBES = 32
+# Count reported for a key that found no free slot: above any limit, so the hit is refused.
+_OVERFLOW_COUNT = 1 << 62
+
+logger = logging.getLogger(__name__)
+
+
+def _key_hash(key: str) -> int:
+    # Python's hash() is randomised per process, so a stable digest is needed.
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+class MmapStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Fixed and sliding window counters in a shared memory-mapped hash table."""
+
+    STORAGE_SCHEME = ["mmap"]
+
+    def __init__(self, uri: Optional[str] = None, wrap_exceptions: bool = False, **options):
+        parsed = urlparse(uri or "")
+        if not parsed.path:
+            raise ValueError(f"mmap:// rate limit storage needs an absolute file path, got {uri!r}")
+        query = {name: values[-1] for name, values in parse_qs(parsed.query).items()}
+        self.path = parsed.path
+        self._requested = (int(query.get("stripes", 64)), int(query.get("slots", 65536)))
+        self._open()
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    def _open(self) -> None:
+        stripes, slots = self._requested
+        slots_per_stripe = max(1, slots // stripes)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, 0)
+        try:
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and header[:8] == _MAGIC:
+                # Another worker created the table first; adopt its geometry.
+                _, stripes, slots_per_stripe = _HEADER.unpack(header)
+            else:
+                os.ftruncate(self._fd, _HEADER.size + stripes * slots_per_stripe * _SLOT.size)
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, stripes, slots_per_stripe), 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, 0)
+
+        self.stripes = stripes
+        self.slots_per_stripe = slots_per_stripe
+        self._map = mmap.mmap(self._fd, _HEADER.size + stripes * slots_per_stripe * _SLOT.size)
+        self._thread_locks = [threading.Lock() for _ in range(stripes)]
+        self._pid = os.getpid()
+
+    @property
+    def base_exceptions(self):
+        return (OSError, ValueError)
+
+    @contextmanager
+    def _locked(self, stripe: int) -> Iterator[None]:
+        if self._pid != os.getpid():
+            # Thread locks held at fork time are meaningless in the child.
+            self._thread_locks = [threading.Lock() for _ in range(self.stripes)]
+            self._pid = os.getpid()
+        with self._thread_locks[stripe]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, _LOCK_BASE + stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, _LOCK_BASE + stripe)
+
+    def _stripe(self, key: str) -> int:
+        return _key_hash(key) % self.stripes
+
+    def _find(self, stripe: int, key_hash: int, now: float, create: bool) -> Tuple[Optional[int], int, float]:
+        """Return (offset, count, expires_at) of the key's live slot.
+
+        With ``create`` the offset of an empty or expired slot is returned when
+        the key is absent. Live slots are never reused, so the offset is None
+        when every slot in the probe chain belongs to a live key.
+        """
+        base = _HEADER.size + stripe * self.slots_per_stripe * _SLOT.size
+        start = key_hash % self.slots_per_stripe
+        free = None
+        for probe in range(min(_MAX_PROBES, self.slots_per_stripe)):
+            offset = base + ((start + probe) % self.slots_per_stripe) * _SLOT.size
+            slot_hash, count, expires_at = _SLOT.unpack_from(self._map, offset)
+            if slot_hash == key_hash:
+                if expires_at > now:
+                    return offset, count, expires_at
+                return (offset if create else None), 0, 0.0
+            if slot_hash == 0:
+                # Keys are never moved, so the first empty slot ends the probe chain.
+                return (free if free is not None else offset) if create else None, 0, 0.0
+            if free is None and expires_at <= now:
+                free = offset
+        return free if create else None, 0, 0.0
+
+    def _incr(self, stripe: int, key: str, expiry: float, amount: int) -> Optional[int]:
+        """Increment the key's counter, or return None when its probe chain is full."""
+        now = time.time()
+        key_hash = _key_hash(key)
+        offset, count, expires_at = self._find(stripe, key_hash, now, create=True)
+        if offset is None:
+            # Evicting a live slot would reset someone else's counter, so fail closed instead.
+            RATELIMIT_STORAGE_OVERFLOWS.inc()
+            logger.warning("Rate limit table %s has no free slot in stripe %d; refusing hit", self.path, stripe)
+            return None
+        if count == 0:
+            expires_at = now + expiry
+        count += amount
+        _SLOT.pack_into(self._map, offset, key_hash, count, expires_at)
+        return count
+
+    def _get(self, stripe: int, key: str) -> Tuple[int, float]:
+        _, count, expires_at = self._find(stripe, _key_hash(key), time.time(), create=False)
+        return count, expires_at
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        stripe = self._stripe(key)
+        with self._locked(stripe):
+            count = self._incr(stripe, key, expiry, amount)
+        return _OVERFLOW_COUNT if count is None else count
+
+    def get(self, key: str) -> int:
+        stripe = self._stripe(key)
+        with self._locked(stripe):
+            return self._get(stripe, key)[0]
+
+    def get_expiry(self, key: str) -> float:
+        stripe = self._stripe(key)
+        with self._locked(stripe):
+            count, expires_at = self._get(stripe, key)
+        return expires_at if count else time.time()
+
+    def clear(self, key: str) -> None:
+        self._clear(self._stripe(key), key)
+
+    def _clear(self, stripe: int, key: str) -> None:
+        with self._locked(stripe):
+            offset, count, _ = self._find(stripe, _key_hash(key), time.time(), create=False)
+            if offset is not None:
+                # Keep the hash so later keys in the probe chain stay reachable.
+                _SLOT.pack_into(self._map, offset, _key_hash(key), 0, 0.0)
+
+    def check(self) -> bool:
+        return not self._map.closed
+
+    def reset(self) -> Optional[int]:
+        now = time.time()
+        live = 0
+        for stripe in range(self.stripes):
+            with self._locked(stripe):
+                base = _HEADER.size + stripe * self.slots_per_stripe * _SLOT.size
+                for index in range(self.slots_per_stripe):
+                    if _SLOT.unpack_from(self._map, base + index * _SLOT.size)[2] > now:
+                        live += 1
+                self._map[base:base + self.slots_per_stripe * _SLOT.size] = bytes(self.slots_per_stripe * _SLOT.size)
+        return live
+
+    # Both window counters of a sliding-window key share the base key's stripe,
+    # so a weighted check and the increment happen under one lock.
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        stripe = self._stripe(key)
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._locked(stripe):
+            previous_count, previous_ttl, current_count, _ = self._sliding_window(
+                stripe, previous_key, current_key, expiry, now
+            )
+            if floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                return False
+            return self._incr(stripe, current_key, 2 * expiry, amount) is not None
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        stripe = self._stripe(key)
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._locked(stripe):
+            return self._sliding_window(stripe, previous_key, current_key, expiry, now)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        stripe = self._stripe(key)
+        for window_key in self.sliding_window_keys(key, expiry, time.time()):
+            self._clear(stripe, window_key)
+
+    def _sliding_window(
+        self, stripe: int, previous_key: str, current_key: str, expiry: int, now: float
+    ) -> Tuple[int, float, int, float]:
+        previous_count = self._get(stripe, previous_key)[0]
+        current_count = self._get(stripe, current_key)[0]
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
@@ -1,41 +1,313 @@
 """Security helpers for admin authentication."""
-from typing import Optional
+from dataclasses import dataclass
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Dict, Optional, Set, Tuple
 
-from flask import current_app
+from flask import current_app, has_app_context
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from backend.utils.metrics import ADMIN_IDENTITY_CACHE_LOOKUPS
 from backend.utils.passwords import hash_password
 
 from backend.api.models import AdminUser
 from backend.utils.db import get_session
 
+# Columns whose change makes a cached identity stale.
+_IDENTITY_FIELDS = ("username", "role", "is_active", "totp_secret", "password_hash")
+# Columns whose change revokes every stateless token issued to the admin.
+_TOKEN_VERSION_FIELDS = ("role", "is_active", "password_hash")
+
+
+@dataclass(frozen=True)
+class AdminIdentity:
+    """Detached snapshot of an admin used to authorise requests."""
+
+    id: int
+    username: str
+    role: str
+    is_active: bool
+    has_totp: bool
+
+    @classmethod
+    def from_admin(cls, admin: AdminUser) -> "AdminIdentity":
+        return cls(
+            id=admin.id,
+            username=admin.username,
+            role=admin.role,
+            is_active=bool(admin.is_active),
+            has_totp=bool(admin.totp_secret),
+        )
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> "AdminIdentity":
+        return cls(
+            id=claims["i"],
+            username=claims["u"],
+            role=claims["r"],
+            is_active=bool(claims["a"]),
+            has_totp=bool(claims.get("t")),
+        )
+
+
+class AdminIdentityCache:
+    """Per-worker TTL cache of active admin identities keyed by admin id."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[int, Tuple[float, AdminIdentity]] = {}
+
+    def get(self, admin_id: int) -> Optional[AdminIdentity]:
+        entry = self._entries.get(admin_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            ADMIN_IDENTITY_CACHE_LOOKUPS.labels(result="hit").inc()
+            return entry[1]
+
+        self.misses += 1
+        ADMIN_IDENTITY_CACHE_LOOKUPS.labels(result="miss").inc()
+        return None
+
+    def set(self, identity: AdminIdentity) -> None:
+        if self.ttl > 0:
+            self._entries[identity.id] = (time.monotonic() + self.ttl, identity)
+
+    def invalidate(self, admin_id: int) -> None:
+        self._entries.pop(admin_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class CompactTokenCodec:
+    """HMAC-SHA256 signed tokens that carry the admin's authorisation claims."""
+
+    PREFIX = "v2."
+
+    def __init__(self, secret_key: str):
+        # Derived once so signing and verifying is a single HMAC over the payload.
+        self._key = hmac.new(secret_key.encode(), b"admin-auth-compact", hashlib.sha256).digest()
+
+    def _sign(self, body: str) -> str:
+        digest = hmac.new(self._key, body.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def dumps(self, claims: dict) -> str:
+        raw = json.dumps(claims, separators=(",", ":")).encode()
+        body = base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+        return f"{self.PREFIX}{body}.{self._sign(body)}"
+
+    def loads(self, token: str, max_age: int) -> Optional[dict]:
+        """Return the claims of a valid, unexpired token or None."""
+        body, _, signature = token[len(self.PREFIX):].partition(".")
+        if not token.startswith(self.PREFIX) or not hmac.compare_digest(
+            signature.encode(), self._sign(body).encode()
+        ):
+            return None
+        try:
+            claims = json.loads(base64.urlsafe_b64decode(body + "=" * (-len(body) % 4)))
+        except ValueError:
+            return None
+        if claims.get("iat", 0) + max_age < time.time():
+            return None
+        return claims
+
+
+class TokenRevocationList:
+    """Current stateless token version per admin, synced from the database.
+
+    Tokens whose version claim differs from the admin's current
+    ``token_version`` are revoked. The full table is re-read at most once per
+    ``sync_interval``; an admin unknown to this worker costs one row lookup.
+    """
+
+    def __init__(self, sync_interval: float):
+        self.sync_interval = sync_interval
+        self._versions: Dict[int, int] = {}
+        self._inactive: Set[int] = set()
+        self._synced_at = float("-inf")
+
+    def sync(self) -> None:
+        rows = get_session().execute(select(AdminUser.id, AdminUser.token_version, AdminUser.is_active)).all()
+        self._versions = {admin_id: version for admin_id, version, active in rows if active}
+        self._inactive = {admin_id for admin_id, _, active in rows if not active}
+        self._synced_at = time.monotonic()
+
+    def forget(self, admin_id: int) -> None:
+        self._versions.pop(admin_id, None)
+        self._inactive.discard(admin_id)
+
+    def _load(self, admin_id: int) -> None:
+        row = get_session().execute(
+            select(AdminUser.token_version, AdminUser.is_active).where(AdminUser.id == admin_id)
+        ).first()
+        if row is None or not row.is_active:
+            self._versions.pop(admin_id, None)
+            self._inactive.add(admin_id)
+        else:
+            self._versions[admin_id] = row.token_version
+
+    def is_current(self, admin_id: int, version: int) -> bool:
+        if time.monotonic() - self._synced_at >= self.sync_interval:
+            self.sync()
+        if admin_id in self._inactive:
+            return False
+        known = self._versions.get(admin_id)
+        if known is None or version > known:
+            self._load(admin_id)
+            known = self._versions.get(admin_id)
+        return known == version
+
+
+def get_identity_cache() -> AdminIdentityCache:
+    """Return the identity cache bound to the current app."""
+    cache = current_app.extensions.get("admin_identity_cache")
+    if cache is None:
+        cache = AdminIdentityCache(ttl=current_app.config.get("ADMIN_IDENTITY_CACHE_TTL", 30))
+        current_app.extensions["admin_identity_cache"] = cache
+    return cache
+
+
+def get_revocation_list() -> TokenRevocationList:
+    """Return the stateless token revocation list bound to the current app."""
+    revocations = current_app.extensions.get("admin_token_revocations")
+    if revocations is None:
+        revocations = TokenRevocationList(current_app.config.get("AUTH_REVOCATION_SYNC_INTERVAL", 15))
+        current_app.extensions["admin_token_revocations"] = revocations
+    return revocations
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_token_versions(session, flush_context, instances) -> None:
+    """Revoke stateless tokens when an admin's role, status or password changes."""
+    for obj in session.dirty:
+        if not isinstance(obj, AdminUser):
+            continue
+        state = inspect(obj)
+        if any(state.attrs[f].history.has_changes() for f in _TOKEN_VERSION_FIELDS):
+            obj.token_version = (obj.token_version or 1) + 1
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_identity_changes(session, flush_context) -> None:
+    """Remember admins whose identity-relevant columns were flushed."""
+    for obj in list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, AdminUser) or obj.id is None:
+            continue
+        state = inspect(obj)
+        if obj in session.deleted or any(state.attrs[f].history.has_changes() for f in _IDENTITY_FIELDS):
+            session.info.setdefault("admin_identity_changes", set()).add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_identity_changes(session) -> None:
+    """Drop committed admin changes from this worker's identity cache."""
+    changed = session.info.pop("admin_identity_changes", None)
+    if not changed or not has_app_context():
+        return
+    cache = current_app.extensions.get("admin_identity_cache")
+    revocations = current_app.extensions.get("admin_token_revocations")
+    for admin_id in changed:
+        if cache is not None:
+            cache.invalidate(admin_id)
+        if revocations is not None:
+            revocations.forget(admin_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_identity_changes(session) -> None:
+    session.info.pop("admin_identity_changes", None)
+
 
 def _get_serializer() -> URLSafeTimedSerializer:
     secret = current_app.config["SECRET_KEY"]
-    return URLSafeTimedSerializer(secret_key=secret, salt="admin-auth")
+    cached = current_app.extensions.get("admin_token_serializer")
+    if cached is None or cached[0] != secret:
+        cached = (secret, URLSafeTimedSerializer(secret_key=secret, salt="admin-auth"))
+        current_app.extensions["admin_token_serializer"] = cached
+    return cached[1]
+
+
+def _get_compact_codec() -> CompactTokenCodec:
+    secret = current_app.config["SECRET_KEY"]
+    cached = current_app.extensions.get("admin_token_codec")
+    if cached is None or cached[0] != secret:
+        cached = (secret, CompactTokenCodec(secret))
+        current_app.extensions["admin_token_codec"] = cached
+    return cached[1]
 
 
 def generate_admin_token(admin: AdminUser) -> str:
     """Create a signed token for the admin user."""
+    if current_app.config.get("AUTH_TOKEN_MODE", "session") == "stateless":
+        return _get_compact_codec().dumps(
+            {
+                "i": admin.id,
+                "u": admin.username,
+                "r": admin.role,
+                "a": 1 if admin.is_active else 0,
+                "t": 1 if admin.totp_secret else 0,
+                "v": admin.token_version or 1,
+                "iat": int(time.time()),
+            }
+        )
+
     serializer = _get_serializer()
     return serializer.dumps({"admin_id": admin.id, "username": admin.username})
 
 
-def verify_admin_token(token: str) -> Optional[AdminUser]:
-    """Validate a token and return the admin user."""
-    serializer = _get_serializer()
+def _verify_compact_token(token: str, max_age: int) -> Optional[AdminIdentity]:
+    claims = _get_compact_codec().loads(token, max_age)
+    if not claims or not claims.get("a"):
+        return None
+    if not get_revocation_list().is_current(claims["i"], claims["v"]):
+        return None
+    return AdminIdentity.from_claims(claims)
+
+
+def verify_admin_token(token: str) -> Optional[AdminIdentity]:
+    """Validate a token and return the admin identity."""
     max_age = current_app.config.get("AUTH_TOKEN_MAX_AGE", 60 * 60 * 12)
+    if token.startswith(CompactTokenCodec.PREFIX):
+        return _verify_compact_token(token, max_age)
 
+    serializer = _get_serializer()
     try:
         payload = serializer.loads(token, max_age=max_age)
     except (BadSignature, SignatureExpired):
         return None
 
+    admin_id = payload.get("admin_id")
+    cache = get_identity_cache()
+    identity = cache.get(admin_id)
+    if identity is not None:
+        return identity
+
     session = get_session()
-    admin = session.query(AdminUser).filter(AdminUser.id == payload.get("admin_id")).first()
+    admin = session.query(AdminUser).filter(AdminUser.id == admin_id).first()
     if not admin or not admin.is_active:
         return None
 
-    return admin
+    identity = AdminIdentity.from_admin(admin)
+    cache.set(identity)
+    return identity
+
+
+def default_admin_needed() -> bool:
+    """True when bootstrap is allowed and the default admin does not exist yet."""
+    if not current_app.config.get("ALLOW_DEFAULT_ADMIN_BOOTSTRAP", False):
+        return False
+    username = current_app.config.get("DEFAULT_ADMIN_USERNAME", "admin")
+    return get_session().query(AdminUser.id).filter(AdminUser.username == username).first() is None
 
 
 def ensure_default_admin() -> None:
@@ -0,0 +1,53 @@
+"""Gunicorn settings for the API.
+
+With GUNICORN_PRELOAD=true (the default) the app is built once in the master
+and workers are forked from it, sharing its memory copy-on-write:
+
+- the garbage collector stays disabled in the master and the heap is frozen
+  before forking, so collections never dirty the shared pages;
+- the master closes its database connections before forking and each worker
+  discards inherited connections and opens its own (post_fork).
+
+Set GUNICORN_PRELOAD=false to fall back to every worker importing the app.
+"""
+import gc
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+threads = int(os.getenv("GUNICORN_THREADS", "2"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None  # empty disables
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+if preload_app:
+    # Objects created while importing the app are never collected in the master.
+    gc.disable()
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from backend.utils.db import dispose_engines
+    from backend.utils.prefork import freeze_heap
+
+    dispose_engines()
+    freeze_heap()
+    server.log.info("Preloaded app; heap frozen before forking %d workers", workers)
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    from backend.utils.prefork import reset_after_fork
+
+    reset_after_fork(server.app.wsgi())
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,31 @@
+"""add admin token version
+
+Revision ID: b81e4c2d7f05
+Revises: 6f3a4b0b9c21
+Create Date: 2026-10-19 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81e4c2d7f05'
+down_revision: Union[str, Sequence[str], None] = '6f3a4b0b9c21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the per-admin version claim used to revoke stateless tokens."""
+    op.add_column(
+        "admin_users",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default="1"),
+    )
+
+
+def downgrade() -> None:
+    """Drop token_version."""
+    op.drop_column("admin_users", "token_version")
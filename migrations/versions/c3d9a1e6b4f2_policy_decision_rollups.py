@@ -0,0 +1,37 @@
+"""add policy decision rollups
+
+Revision ID: c3d9a1e6b4f2
+Revises: b81e4c2d7f05
+Create Date: 2026-10-19 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9a1e6b4f2'
+down_revision: Union[str, Sequence[str], None] = 'b81e4c2d7f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create per-minute policy decision counters."""
+    op.create_table(
+        "policy_decision_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("action", sa.String(length=80), nullable=False),
+        sa.Column("decision", sa.String(length=32), nullable=False),
+        sa.Column("rules", sa.Text(), nullable=False, server_default=""),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.UniqueConstraint("bucket_start", "action", "decision", "rules", name="uq_policy_decision_rollups_bucket"),
+    )
+
+
+def downgrade() -> None:
+    """Drop policy_decision_rollups."""
+    op.drop_table("policy_decision_rollups")
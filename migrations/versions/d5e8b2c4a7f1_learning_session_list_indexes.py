@@ -0,0 +1,29 @@
+"""add learning session listing indexes
+
+Revision ID: d5e8b2c4a7f1
+Revises: c3d9a1e6b4f2
+Create Date: 2026-10-19 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e8b2c4a7f1'
+down_revision: Union[str, Sequence[str], None] = 'c3d9a1e6b4f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the status and difficulty filters of the session listing."""
+    op.create_index("ix_learning_sessions_status_created_at", "learning_sessions", ["status", "created_at"])
+    op.create_index("ix_learning_sessions_difficulty_created_at", "learning_sessions", ["difficulty", "created_at"])
+
+
+def downgrade() -> None:
+    """Drop the session listing indexes."""
+    op.drop_index("ix_learning_sessions_difficulty_created_at", table_name="learning_sessions")
+    op.drop_index("ix_learning_sessions_status_created_at", table_name="learning_sessions")
@@ -0,0 +1,94 @@
+"""add learning session aggregates
+
+Revision ID: e1f6c9a3d8b5
+Revises: d5e8b2c4a7f1
+Create Date: 2026-10-19 14:00:00
+
+"""
+from collections import Counter
+from datetime import timedelta, timezone
+import math
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f6c9a3d8b5'
+down_revision: Union[str, Sequence[str], None] = 'd5e8b2c4a7f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Bucketing as defined by backend.api.services.learning_session_stats at this
+# revision, frozen here so later changes to the service cannot alter the backfill.
+BUCKETS_PER_DOUBLING = 8
+SHORTEST_BUCKET_SECONDS = 60.0
+
+
+def _utc(value):
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _contributions(status, difficulty, started_at, completed_at):
+    difficulty = difficulty or ""
+    items = {("status", status, difficulty, 0): 0.0}
+    if status == "completed" and completed_at is not None:
+        day = _utc(completed_at).date()
+        items[("week", "", difficulty, (day - timedelta(days=day.weekday())).toordinal())] = 0.0
+        if started_at is not None:
+            seconds = (_utc(completed_at) - _utc(started_at)).total_seconds()
+            if seconds >= 0:
+                bucket = 0 if seconds < SHORTEST_BUCKET_SECONDS else 1 + math.floor(
+                    BUCKETS_PER_DOUBLING * math.log2(seconds / SHORTEST_BUCKET_SECONDS)
+                )
+                items[("duration", "", difficulty, bucket)] = seconds
+    return items
+
+
+def _backfill(aggregates) -> None:
+    """Count the sessions that exist before the write paths start maintaining the counters."""
+    sessions = sa.table(
+        "learning_sessions",
+        sa.column("status", sa.String),
+        sa.column("difficulty", sa.String),
+        sa.column("started_at", sa.DateTime),
+        sa.column("completed_at", sa.DateTime),
+    )
+    counts, seconds = Counter(), Counter()
+    rows = op.get_bind().execute(
+        sa.select(sessions.c.status, sessions.c.difficulty, sessions.c.started_at, sessions.c.completed_at)
+        .execution_options(yield_per=1000)
+    )
+    for row in rows:
+        for key, duration in _contributions(*row).items():
+            counts[key] += 1
+            seconds[key] += duration
+    if counts:
+        op.bulk_insert(aggregates, [
+            {"metric": key[0], "status": key[1], "difficulty": key[2], "bucket": key[3],
+             "count": count, "total_seconds": seconds[key]}
+            for key, count in counts.items()
+        ])
+
+
+def upgrade() -> None:
+    """Create the learning session statistics counters and count existing sessions."""
+    aggregates = op.create_table(
+        "learning_session_aggregates",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("metric", sa.String(length=16), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False, server_default=""),
+        sa.Column("difficulty", sa.String(length=50), nullable=False, server_default=""),
+        sa.Column("bucket", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_seconds", sa.Float(), nullable=False, server_default="0"),
+        sa.UniqueConstraint("metric", "status", "difficulty", "bucket", name="uq_learning_session_aggregates_key"),
+    )
+    _backfill(aggregates)
+
+
+def downgrade() -> None:
+    """Drop learning_session_aggregates."""
+    op.drop_table("learning_session_aggregates")
@@ -0,0 +1,60 @@
+"""add rules version to policy decision rollups
+
+Revision ID: f4b8d2e6a9c7
+Revises: e1f6c9a3d8b5
+Create Date: 2026-10-19 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d2e6a9c7'
+down_revision: Union[str, Sequence[str], None] = 'e1f6c9a3d8b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Key policy decision counters by the rule set version as well.
+
+    Existing rows get an empty version.
+    """
+    with op.batch_alter_table("policy_decision_rollups") as batch_op:
+        batch_op.add_column(sa.Column("rules_version", sa.String(length=16), nullable=False, server_default=""))
+        batch_op.drop_constraint("uq_policy_decision_rollups_bucket", type_="unique")
+        batch_op.create_unique_constraint(
+            "uq_policy_decision_rollups_bucket", ["bucket_start", "rules_version", "action", "decision", "rules"]
+        )
+
+
+def downgrade() -> None:
+    """Merge counters across versions, then drop rules_version."""
+    op.execute(
+        """
+        UPDATE policy_decision_rollups SET count = (
+            SELECT SUM(other.count) FROM policy_decision_rollups AS other
+            WHERE other.bucket_start = policy_decision_rollups.bucket_start
+              AND other.action = policy_decision_rollups.action
+              AND other.decision = policy_decision_rollups.decision
+              AND other.rules = policy_decision_rollups.rules
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM policy_decision_rollups
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM policy_decision_rollups GROUP BY bucket_start, action, decision, rules
+        )
+        """
+    )
+    with op.batch_alter_table("policy_decision_rollups") as batch_op:
+        batch_op.drop_constraint("uq_policy_decision_rollups_bucket", type_="unique")
+        batch_op.create_unique_constraint(
+            "uq_policy_decision_rollups_bucket", ["bucket_start", "action", "decision", "rules"]
+        )
+        batch_op.drop_column("rules_version")